@@ -0,0 +1,104 @@
+"""Add archive tables for ended bookings
+
+Revision ID: 3f8a62c0d915
+Revises: b7d3c1e94a20
+Create Date: 2026-10-19 12:31:44.902317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a62c0d915'
+down_revision: Union[str, None] = 'b7d3c1e94a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+booking_status = postgresql.ENUM('PENDING', 'CONFIRMED', 'CANCELLED', name='bookingstatus', create_type=False)
+payment_status = postgresql.ENUM('PENDING', 'SUCCESS', 'FAILED', name='paymentstatus', create_type=False)
+
+
+def upgrade() -> None:
+    op.create_table('archived_bookings',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('status', booking_status, nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('booking_price', sa.Float(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_bookings_property_id'), 'archived_bookings', ['property_id'], unique=False)
+    op.create_index(op.f('ix_archived_bookings_user_id'), 'archived_bookings', ['user_id'], unique=False)
+    op.create_table('archived_payments',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Float(), nullable=False),
+    sa.Column('status', payment_status, nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['booking_id'], ['archived_bookings.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_payments_booking_id'), 'archived_payments', ['booking_id'], unique=False)
+    op.create_table('archived_access_codes',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('booking_id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(), nullable=False),
+    sa.Column('valid_from', sa.DateTime(), nullable=False),
+    sa.Column('valid_until', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['booking_id'], ['archived_bookings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_archived_access_codes_booking_id'), 'archived_access_codes', ['booking_id'], unique=False)
+
+    # Access logs are an audit trail; archiving (or deleting) an access code
+    # must not cascade into them.
+    op.drop_constraint('access_logs_access_code_id_fkey', 'access_logs', type_='foreignkey')
+
+
+def downgrade() -> None:
+    # Move archived rows back so no history is lost.
+    op.execute(
+        "INSERT INTO bookings (id, user_id, property_id, start_date, end_date, status, created_at, booking_price) "
+        "SELECT id, user_id, property_id, start_date, end_date, status, created_at, booking_price FROM archived_bookings"
+    )
+    op.execute(
+        "INSERT INTO payments (id, booking_id, amount, status, created_at) "
+        "SELECT id, booking_id, amount, status, created_at FROM archived_payments"
+    )
+    op.execute(
+        "INSERT INTO access_codes (id, booking_id, code, valid_from, valid_until) "
+        "SELECT id, booking_id, code, valid_from, valid_until FROM archived_access_codes"
+    )
+    # Logs of codes deleted while the constraint was gone have nothing to point to.
+    op.execute(
+        "UPDATE access_logs SET access_code_id = NULL "
+        "WHERE access_code_id IS NOT NULL "
+        "AND access_code_id NOT IN (SELECT id FROM access_codes)"
+    )
+    op.create_foreign_key(
+        'access_logs_access_code_id_fkey',
+        'access_logs',
+        'access_codes',
+        ['access_code_id'],
+        ['id'],
+        ondelete='CASCADE',
+    )
+    op.drop_index(op.f('ix_archived_access_codes_booking_id'), table_name='archived_access_codes')
+    op.drop_table('archived_access_codes')
+    op.drop_index(op.f('ix_archived_payments_booking_id'), table_name='archived_payments')
+    op.drop_table('archived_payments')
+    op.drop_index(op.f('ix_archived_bookings_user_id'), table_name='archived_bookings')
+    op.drop_index(op.f('ix_archived_bookings_property_id'), table_name='archived_bookings')
+    op.drop_table('archived_bookings')
@@ -0,0 +1,93 @@
+"""Add property search
+
+Revision ID: 5d2e8a7c41b3
+Revises: 9c41e7d2b6f8
+Create Date: 2026-10-19 14:21:37.902615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a7c41b3'
+down_revision: Union[str, None] = '9c41e7d2b6f8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Names rank above locations, which rank above descriptions. The function is
+# shared by the trigger and the backfill so both produce the same vector.
+FUNCTIONS = [
+    """
+CREATE FUNCTION property_search_vector(name text, location text, description text)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('english', coalesce(name, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(location, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(description, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE
+    """,
+    """
+CREATE FUNCTION update_property_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := property_search_vector(NEW.name, NEW.location, NEW.description);
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+    """,
+    """
+CREATE TRIGGER properties_search_vector
+    BEFORE INSERT OR UPDATE OF name, location, description ON properties
+    FOR EACH ROW EXECUTE FUNCTION update_property_search_vector()
+    """,
+]
+
+INDEXES = [
+    ('ix_properties_search_vector', ['search_vector'], {}),
+    ('ix_properties_name_trgm', ['name'], {'name': 'gin_trgm_ops'}),
+    ('ix_properties_location_trgm', ['location'], {'location': 'gin_trgm_ops'}),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('properties', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    for statement in FUNCTIONS:
+        op.execute(statement)
+    op.execute(
+        "UPDATE properties SET search_vector = "
+        "property_search_vector(name, location, description)"
+    )
+
+    # CONCURRENTLY keeps the table writable while the indexes build, but it
+    # cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, columns, ops in INDEXES:
+            op.create_index(
+                name,
+                'properties',
+                columns,
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops=ops,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name='properties',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    op.execute("DROP TRIGGER properties_search_vector ON properties")
+    op.execute("DROP FUNCTION update_property_search_vector()")
+    op.execute("DROP FUNCTION property_search_vector(text, text, text)")
+    op.drop_column('properties', 'search_vector')
+    # pg_trgm is left installed; other objects may depend on it.
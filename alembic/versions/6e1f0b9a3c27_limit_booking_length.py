@@ -0,0 +1,52 @@
+"""Limit the length of stored bookings
+
+Revision ID: 6e1f0b9a3c27
+Revises: c81f5e2a9d47
+Create Date: 2026-10-19 18:41:27.905316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e1f0b9a3c27'
+down_revision: Union[str, None] = 'c81f5e2a9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# settings.MAX_BOOKING_NIGHTS at the time of this migration. Overlap checks
+# only look this far back (see app.crud.booking_pipeline.overlapping_stays),
+# so a longer stay would be invisible to them.
+MAX_BOOKING_NIGHTS = 90
+REPORTED_VIOLATIONS = 20
+
+
+def upgrade() -> None:
+    violations = op.get_bind().execute(
+        sa.text(
+            "SELECT id, start_date, end_date FROM bookings "
+            "WHERE end_date - start_date > :nights ORDER BY id"
+        ).bindparams(nights=MAX_BOOKING_NIGHTS)
+    ).all()
+    if violations:
+        listed = ", ".join(
+            f"{id} ({start_date} to {end_date})"
+            for id, start_date, end_date in violations[:REPORTED_VIOLATIONS]
+        )
+        raise RuntimeError(
+            f"{len(violations)} bookings are longer than {MAX_BOOKING_NIGHTS} nights "
+            f"and would be missed by availability checks; split or shorten them "
+            f"and run the migration again. Bookings: {listed}"
+        )
+    op.create_check_constraint(
+        'ck_bookings_max_nights',
+        'bookings',
+        f'end_date - start_date <= {MAX_BOOKING_NIGHTS}',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('ck_bookings_max_nights', 'bookings', type_='check')
@@ -0,0 +1,190 @@
+"""Partition bookings by stay month
+
+Revision ID: 9c41e7d2b6f8
+Revises: 3f8a62c0d915
+Create Date: 2026-10-19 13:05:12.553081
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c41e7d2b6f8'
+down_revision: Union[str, None] = '3f8a62c0d915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 24
+
+BOOKING_COLUMNS = "id, user_id, property_id, start_date, end_date, status, created_at, booking_price"
+
+# A partitioned table can only be referenced through its whole primary key
+# (id, start_date), so payments and access_codes keep plain booking_id
+# columns and these triggers stand in for the foreign keys. They are AFTER
+# triggers so they see bookings inserted by the same statement (see
+# app.crud.booking_pipeline).
+TRIGGERS = [
+    """
+CREATE FUNCTION check_booking_reference() RETURNS trigger AS $$
+BEGIN
+    PERFORM 1 FROM bookings WHERE id = NEW.booking_id FOR KEY SHARE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'insert or update on table "%" violates foreign key to bookings', TG_TABLE_NAME
+            USING ERRCODE = 'foreign_key_violation',
+                  DETAIL = format('Key (booking_id)=(%s) is not present in table "bookings".', NEW.booking_id);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+    """,
+    """
+CREATE FUNCTION delete_booking_references() RETURNS trigger AS $$
+BEGIN
+    -- An UPDATE moving a booking to another partition runs as a delete plus
+    -- an insert; the booking still exists then and nothing must happen.
+    IF EXISTS (SELECT 1 FROM bookings WHERE id = OLD.id) THEN
+        RETURN NULL;
+    END IF;
+    DELETE FROM access_codes WHERE booking_id = OLD.id;
+    IF EXISTS (SELECT 1 FROM payments WHERE booking_id = OLD.id) THEN
+        RAISE EXCEPTION 'update or delete on table "bookings" violates foreign key on table "payments"'
+            USING ERRCODE = 'foreign_key_violation',
+                  DETAIL = format('Key (id)=(%s) is still referenced from table "payments".', OLD.id);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+    """,
+    """
+CREATE TRIGGER payments_booking_id_fkey
+    AFTER INSERT OR UPDATE OF booking_id ON payments
+    FOR EACH ROW EXECUTE FUNCTION check_booking_reference()
+    """,
+    """
+CREATE TRIGGER access_codes_booking_id_fkey
+    AFTER INSERT OR UPDATE OF booking_id ON access_codes
+    FOR EACH ROW EXECUTE FUNCTION check_booking_reference()
+    """,
+    """
+CREATE TRIGGER bookings_delete_references
+    AFTER DELETE ON bookings
+    FOR EACH ROW EXECUTE FUNCTION delete_booking_references()
+    """,
+]
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.drop_constraint('payments_booking_id_fkey', 'payments', type_='foreignkey')
+    op.drop_constraint('access_codes_booking_id_fkey', 'access_codes', type_='foreignkey')
+
+    op.execute("ALTER TABLE bookings RENAME TO bookings_legacy")
+    op.execute("ALTER INDEX ix_bookings_id RENAME TO ix_bookings_legacy_id")
+    op.execute("ALTER INDEX ix_bookings_user_id RENAME TO ix_bookings_legacy_user_id")
+    op.execute(
+        "ALTER INDEX ix_bookings_property_id_start_date "
+        "RENAME TO ix_bookings_legacy_property_id_start_date"
+    )
+    for constraint in ("pkey", "user_id_fkey", "property_id_fkey"):
+        op.execute(
+            f"ALTER TABLE bookings_legacy RENAME CONSTRAINT bookings_{constraint} "
+            f"TO bookings_legacy_{constraint}"
+        )
+    # Keep the id sequence alive when the legacy table is dropped.
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY NONE")
+
+    op.create_table('bookings',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('bookings_id_seq')"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDING', 'CONFIRMED', 'CANCELLED', name='bookingstatus', create_type=False), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('booking_price', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id', 'start_date'),
+    postgresql_partition_by='RANGE (start_date)',
+    )
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+    op.create_index('ix_bookings_id', 'bookings', ['id'], unique=False)
+    op.create_index('ix_bookings_user_id', 'bookings', ['user_id'], unique=False)
+    op.create_index('ix_bookings_property_id_start_date', 'bookings', ['property_id', 'start_date'], unique=False)
+
+    # One partition per month from the earliest stay up to two years ahead,
+    # plus a default partition so inserts never fail on a missing month.
+    oldest, newest = op.get_bind().execute(
+        sa.text("SELECT min(start_date), max(start_date) FROM bookings_legacy")
+    ).one()
+    today = date.today()
+    month = _add_months(oldest or today, 0)
+    last = max(_add_months(today, PARTITIONS_AHEAD), _add_months(newest or today, 0))
+    while month <= last:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE bookings_y{month.year}m{month.month:02d} "
+            f"PARTITION OF bookings "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    op.execute("CREATE TABLE bookings_default PARTITION OF bookings DEFAULT")
+
+    op.execute(f"INSERT INTO bookings ({BOOKING_COLUMNS}) SELECT {BOOKING_COLUMNS} FROM bookings_legacy")
+    op.execute("DROP TABLE bookings_legacy")
+
+    for statement in TRIGGERS:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER bookings_delete_references ON bookings")
+    op.execute("DROP TRIGGER access_codes_booking_id_fkey ON access_codes")
+    op.execute("DROP TRIGGER payments_booking_id_fkey ON payments")
+    op.execute("DROP FUNCTION delete_booking_references()")
+    op.execute("DROP FUNCTION check_booking_reference()")
+
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE bookings RENAME TO bookings_partitioned")
+    op.execute("ALTER INDEX ix_bookings_id RENAME TO ix_bookings_partitioned_id")
+    op.execute("ALTER INDEX ix_bookings_user_id RENAME TO ix_bookings_partitioned_user_id")
+    op.execute(
+        "ALTER INDEX ix_bookings_property_id_start_date "
+        "RENAME TO ix_bookings_partitioned_property_id_start_date"
+    )
+    for constraint in ("pkey", "user_id_fkey", "property_id_fkey"):
+        op.execute(
+            f"ALTER TABLE bookings_partitioned RENAME CONSTRAINT bookings_{constraint} "
+            f"TO bookings_partitioned_{constraint}"
+        )
+    op.create_table('bookings',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('bookings_id_seq')"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('end_date', sa.Date(), nullable=False),
+    sa.Column('status', postgresql.ENUM('PENDING', 'CONFIRMED', 'CANCELLED', name='bookingstatus', create_type=False), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('booking_price', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(f"INSERT INTO bookings ({BOOKING_COLUMNS}) SELECT {BOOKING_COLUMNS} FROM bookings_partitioned")
+    op.execute("ALTER SEQUENCE bookings_id_seq OWNED BY bookings.id")
+    op.execute("DROP TABLE bookings_partitioned")
+    op.create_index('ix_bookings_id', 'bookings', ['id'], unique=False)
+    op.create_index('ix_bookings_user_id', 'bookings', ['user_id'], unique=False)
+    op.create_index('ix_bookings_property_id_start_date', 'bookings', ['property_id', 'start_date'], unique=False)
+
+    op.create_foreign_key('access_codes_booking_id_fkey', 'access_codes', 'bookings', ['booking_id'], ['id'], ondelete='CASCADE')
+    op.create_foreign_key('payments_booking_id_fkey', 'payments', 'bookings', ['booking_id'], ['id'])
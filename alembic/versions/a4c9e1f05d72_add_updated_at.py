@@ -0,0 +1,39 @@
+"""Add updated_at to properties and bookings
+
+Revision ID: a4c9e1f05d72
+Revises: 5d2e8a7c41b3
+Create Date: 2026-10-19 15:02:44.118930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c9e1f05d72'
+down_revision: Union[str, None] = '5d2e8a7c41b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UTC_NOW = sa.text("(now() at time zone 'utc')")
+
+
+def upgrade() -> None:
+    op.add_column('properties', sa.Column('updated_at', sa.DateTime(), server_default=UTC_NOW, nullable=False))
+    op.add_column('bookings', sa.Column('updated_at', sa.DateTime(), server_default=UTC_NOW, nullable=False))
+    # Archived bookings keep the value they had when they were moved.
+    op.add_column('archived_bookings', sa.Column('updated_at', sa.DateTime(), server_default=UTC_NOW, nullable=False))
+    op.alter_column('archived_bookings', 'updated_at', server_default=None)
+    # Plain CREATE INDEX: CONCURRENTLY is not supported on partitioned tables.
+    op.create_index('ix_properties_updated_at', 'properties', ['updated_at'], unique=False)
+    op.create_index('ix_bookings_updated_at', 'bookings', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bookings_updated_at', table_name='bookings')
+    op.drop_index('ix_properties_updated_at', table_name='properties')
+    op.drop_column('archived_bookings', 'updated_at')
+    op.drop_column('bookings', 'updated_at')
+    op.drop_column('properties', 'updated_at')
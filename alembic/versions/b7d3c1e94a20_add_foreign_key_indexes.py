@@ -0,0 +1,53 @@
+"""Add indexes for foreign key lookups
+
+Revision ID: b7d3c1e94a20
+Revises: e26750ff2405
+Create Date: 2026-10-19 11:52:06.384120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3c1e94a20'
+down_revision: Union[str, None] = 'e26750ff2405'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# users.email is already covered by the index behind its unique constraint.
+INDEXES = [
+    ('ix_bookings_property_id_start_date', 'bookings', ['property_id', 'start_date']),
+    ('ix_bookings_user_id', 'bookings', ['user_id']),
+    ('ix_properties_owner_id', 'properties', ['owner_id']),
+    ('ix_access_codes_booking_id', 'access_codes', ['booking_id']),
+    ('ix_payments_booking_id', 'payments', ['booking_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build, but it
+    # cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,85 @@
+"""Add pricing rules and price calendars
+
+Revision ID: c81f5e2a9d47
+Revises: a4c9e1f05d72
+Create Date: 2026-10-19 16:40:12.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f5e2a9d47'
+down_revision: Union[str, None] = 'a4c9e1f05d72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Prices a stay for the booking pipeline: the stay's slice of the price
+# calendar, the base price for nights outside it, times the multiplier of the
+# longest length of stay rule that applies. app.crud.pricing.get_quote does
+# the same in Python.
+STAY_PRICE = """
+CREATE FUNCTION stay_price(p_property_id integer, p_start date, p_end date)
+RETURNS double precision AS $$
+    SELECT round(
+        round((coalesce(sum(night.price), 0) + (p_end - p_start - count(night.price)) * p.price)::numeric, 2)
+        * coalesce((
+            SELECT r.multiplier FROM pricing_rules AS r
+            WHERE r.property_id = p.id
+              AND r.kind = 'LENGTH_OF_STAY'
+              AND r.min_nights <= p_end - p_start
+            ORDER BY r.min_nights DESC, r.id
+            LIMIT 1
+        ), 1)::numeric,
+        2
+    )::double precision
+    FROM properties AS p
+    LEFT JOIN price_calendars AS c ON c.property_id = p.id
+    LEFT JOIN LATERAL unnest(c.prices[p_start - c.start_date + 1 : p_end - c.start_date])
+        AS night(price) ON true
+    WHERE p.id = p_property_id
+    GROUP BY p.id, p.price
+$$ LANGUAGE sql STABLE
+"""
+
+
+def upgrade() -> None:
+    op.create_table('pricing_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.Enum('SEASON', 'WEEKDAY', 'LENGTH_OF_STAY', name='pricingrulekind'), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=True),
+    sa.Column('end_date', sa.Date(), nullable=True),
+    sa.Column('weekdays', postgresql.ARRAY(sa.Integer()), nullable=True),
+    sa.Column('min_nights', sa.Integer(), nullable=True),
+    sa.Column('multiplier', sa.Float(), nullable=True),
+    sa.Column('nightly_price', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pricing_rules_id'), 'pricing_rules', ['id'], unique=False)
+    op.create_index(op.f('ix_pricing_rules_property_id'), 'pricing_rules', ['property_id'], unique=False)
+    op.create_table('price_calendars',
+    sa.Column('property_id', sa.Integer(), nullable=False),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('prices', postgresql.ARRAY(sa.Float()), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['property_id'], ['properties.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('property_id')
+    )
+    op.execute(STAY_PRICE)
+
+
+def downgrade() -> None:
+    op.execute("DROP FUNCTION stay_price(integer, date, date)")
+    op.drop_table('price_calendars')
+    op.drop_index(op.f('ix_pricing_rules_property_id'), table_name='pricing_rules')
+    op.drop_index(op.f('ix_pricing_rules_id'), table_name='pricing_rules')
+    op.drop_table('pricing_rules')
+    op.execute("DROP TYPE pricingrulekind")
@@ -0,0 +1,118 @@
+"""Partition access_logs by month
+
+Revision ID: e26750ff2405
+Revises: 57e716fc508a
+Create Date: 2026-10-19 10:12:41.118204
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e26750ff2405'
+down_revision: Union[str, None] = '57e716fc508a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PARTITIONS_AHEAD = 3
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE access_logs RENAME TO access_logs_legacy")
+    op.execute("ALTER INDEX ix_access_logs_id RENAME TO ix_access_logs_legacy_id")
+    op.execute("ALTER TABLE access_logs_legacy RENAME CONSTRAINT access_logs_pkey TO access_logs_legacy_pkey")
+    op.execute(
+        "ALTER TABLE access_logs_legacy RENAME CONSTRAINT access_logs_access_code_id_fkey "
+        "TO access_logs_legacy_access_code_id_fkey"
+    )
+    # Keep the id sequence alive when the legacy table is dropped.
+    op.execute("ALTER SEQUENCE access_logs_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE access_logs (
+            id INTEGER NOT NULL DEFAULT nextval('access_logs_id_seq'),
+            access_code_id INTEGER,
+            command VARCHAR NOT NULL,
+            response_status VARCHAR NOT NULL,
+            response_message VARCHAR,
+            accessed_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT access_logs_pkey PRIMARY KEY (id, accessed_at),
+            CONSTRAINT access_logs_access_code_id_fkey FOREIGN KEY (access_code_id)
+                REFERENCES access_codes (id) ON DELETE CASCADE
+        ) PARTITION BY RANGE (accessed_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE access_logs_id_seq OWNED BY access_logs.id")
+    op.create_index(
+        'ix_access_logs_access_code_id_accessed_at',
+        'access_logs',
+        ['access_code_id', 'accessed_at'],
+        unique=False,
+    )
+
+    # One partition per month from the oldest log up to a few months ahead,
+    # plus a default partition so inserts never fail on a missing month.
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(accessed_at) FROM access_logs_legacy")
+    ).scalar()
+    today = date.today()
+    month = _add_months(oldest.date() if oldest else today, 0)
+    last = _add_months(today, PARTITIONS_AHEAD)
+    while month <= last:
+        next_month = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE access_logs_y{month.year}m{month.month:02d} "
+            f"PARTITION OF access_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month.isoformat()}')"
+        )
+        month = next_month
+    op.execute("CREATE TABLE access_logs_default PARTITION OF access_logs DEFAULT")
+
+    op.execute(
+        """
+        INSERT INTO access_logs (id, access_code_id, command, response_status, response_message, accessed_at)
+        SELECT id, access_code_id, command, response_status, response_message, coalesce(accessed_at, now())
+        FROM access_logs_legacy
+        """
+    )
+    op.execute("DROP TABLE access_logs_legacy")
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE access_logs_id_seq OWNED BY NONE")
+    op.execute("ALTER TABLE access_logs RENAME TO access_logs_partitioned")
+    op.execute(
+        "ALTER TABLE access_logs_partitioned RENAME CONSTRAINT access_logs_access_code_id_fkey "
+        "TO access_logs_partitioned_access_code_id_fkey"
+    )
+    op.execute("ALTER TABLE access_logs_partitioned RENAME CONSTRAINT access_logs_pkey TO access_logs_partitioned_pkey")
+    op.create_table('access_logs',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('access_logs_id_seq')"), nullable=False),
+    sa.Column('access_code_id', sa.Integer(), nullable=True),
+    sa.Column('command', sa.String(), nullable=False),
+    sa.Column('response_status', sa.String(), nullable=False),
+    sa.Column('response_message', sa.String(), nullable=True),
+    sa.Column('accessed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['access_code_id'], ['access_codes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_access_logs_id'), 'access_logs', ['id'], unique=False)
+    op.execute(
+        """
+        INSERT INTO access_logs (id, access_code_id, command, response_status, response_message, accessed_at)
+        SELECT id, access_code_id, command, response_status, response_message, accessed_at
+        FROM access_logs_partitioned
+        """
+    )
+    op.execute("ALTER SEQUENCE access_logs_id_seq OWNED BY access_logs.id")
+    op.execute("DROP TABLE access_logs_partitioned")
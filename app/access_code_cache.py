@@ -0,0 +1,188 @@
+import asyncio
+import hmac
+import json
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import redis_client
+
+
+def _as_datetime(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    return datetime.fromisoformat(value)
+
+
+@dataclass(frozen=True)
+class CachedAccessCode:
+    code: str
+    valid_from: datetime
+    valid_until: datetime
+
+    @classmethod
+    def from_model(cls, access_code) -> "CachedAccessCode":
+        return cls(
+            code=access_code.code,
+            valid_from=_as_datetime(access_code.valid_from),
+            valid_until=_as_datetime(access_code.valid_until),
+        )
+
+    def matches(self, code: str, now: datetime) -> bool:
+        """Check the code in constant time and that ``now`` is in the validity window."""
+        if not hmac.compare_digest(self.code.encode(), code.encode()):
+            return False
+        return self.valid_from <= now <= self.valid_until
+
+
+class AccessCodeCache:
+    """Cache of active access codes keyed by booking ID.
+
+    Entries live in Redis until ``valid_until`` so every worker shares them,
+    and in a small in-process map for a few seconds on top of that so
+    repeated checks for the same door skip the network entirely. Redis
+    errors are logged and treated as a cache miss.
+
+    Invalidations are broadcast on ``CHANNEL`` so every worker drops its
+    in-process entry at once. The in-process map is only used while this
+    process is subscribed (see ``start``); without the subscription a
+    revoked code could keep opening the door in other workers.
+    """
+
+    CHANNEL = "access_code:invalidate"
+
+    def __init__(
+        self, redis=redis_client, local_ttl: float = settings.ACCESS_CODE_LOCAL_CACHE_SECONDS
+    ):
+        self.redis = redis
+        self.local_ttl = local_ttl
+        self._local: Dict[int, Tuple[float, CachedAccessCode]] = {}
+        self._subscribed = False
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(booking_id: int) -> str:
+        return f"access_code:{booking_id}"
+
+    def _remember(self, booking_id: int, entry: CachedAccessCode):
+        if not self._subscribed:
+            return
+        remaining = (entry.valid_until - datetime.now()).total_seconds()
+        if remaining <= 0:
+            self._local.pop(booking_id, None)
+            return
+        self._local[booking_id] = (
+            time.monotonic() + min(self.local_ttl, remaining),
+            entry,
+        )
+
+    async def get(self, booking_id: int) -> Optional[CachedAccessCode]:
+        """Return the cached access code for a booking, if any."""
+        local = self._local.get(booking_id) if self._subscribed else None
+        if local is not None:
+            if local[0] > time.monotonic():
+                return local[1]
+            self._local.pop(booking_id, None)
+
+        try:
+            raw = await self.redis.get(self._key(booking_id))
+        except RedisError as e:
+            logger.warning(f"Access code cache read failed: {e}")
+            return None
+        if raw is None:
+            return None
+
+        data = json.loads(raw)
+        entry = CachedAccessCode(
+            code=data["code"],
+            valid_from=_as_datetime(data["valid_from"]),
+            valid_until=_as_datetime(data["valid_until"]),
+        )
+        self._remember(booking_id, entry)
+        return entry
+
+    async def put(self, booking_id: int, entry: CachedAccessCode):
+        """Cache an access code until it stops being valid."""
+        if entry.valid_until <= datetime.now():
+            return
+        self._remember(booking_id, entry)
+        payload = json.dumps(
+            {
+                "code": entry.code,
+                "valid_from": entry.valid_from.isoformat(),
+                "valid_until": entry.valid_until.isoformat(),
+            }
+        )
+        try:
+            await self.redis.set(
+                self._key(booking_id), payload, exat=int(entry.valid_until.timestamp()) + 1
+            )
+        except RedisError as e:
+            logger.warning(f"Access code cache write failed: {e}")
+
+    async def invalidate(self, booking_id: int):
+        """Drop the cached access code for a booking."""
+        self._local.pop(booking_id, None)
+        try:
+            await self.redis.delete(self._key(booking_id))
+            await self.redis.publish(self.CHANNEL, booking_id)
+        except RedisError as e:
+            logger.warning(f"Access code cache invalidation failed: {e}")
+
+    def _drop_local(self, booking_id):
+        try:
+            self._local.pop(int(booking_id), None)
+        except ValueError:
+            # Not a booking ID; drop everything rather than guess.
+            self._local.clear()
+
+    def _stop_local(self):
+        self._subscribed = False
+        self._local.clear()
+
+    async def _listen(self):
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.CHANNEL)
+                # Entries cached before the subscription may have missed invalidations.
+                self._local.clear()
+                self._subscribed = True
+                while True:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True, timeout=1.0
+                    )
+                    if message is not None:
+                        self._drop_local(message["data"])
+            except RedisError as e:
+                logger.warning(f"Access code invalidation subscription lost: {e}")
+                self._stop_local()
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+    def start(self):
+        """Subscribe to invalidations on the running event loop."""
+        if self._task is None and self.local_ttl > 0:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Unsubscribe and stop using the in-process map."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._stop_local()
+
+
+access_code_cache = AccessCodeCache()
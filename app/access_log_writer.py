@@ -0,0 +1,108 @@
+import asyncio
+from datetime import datetime
+from typing import List, Optional
+
+from loguru import logger
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.models.access_log import AccessLog
+
+
+class AccessLogWriter:
+    """Buffer access log records in memory and write them in batches.
+
+    Records are flushed with a single multi-row INSERT once the buffer
+    reaches ``max_batch`` records or ``flush_interval`` seconds have passed,
+    and once more when the writer is stopped.
+    """
+
+    def __init__(
+        self,
+        session_factory=async_session,
+        max_batch: int = settings.ACCESS_LOG_FLUSH_SIZE,
+        flush_interval: float = settings.ACCESS_LOG_FLUSH_INTERVAL,
+        max_buffer: int = settings.ACCESS_LOG_MAX_BUFFER,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: List[dict] = []
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add(
+        self,
+        command: str,
+        response_status: str,
+        response_message: str = None,
+        access_code_id: int = None,
+    ):
+        """Queue an access log record for the next flush."""
+        if len(self._buffer) >= self.max_buffer:
+            logger.warning("Access log buffer is full, dropping the oldest record")
+            self._buffer.pop(0)
+        self._buffer.append(
+            {
+                "access_code_id": access_code_id,
+                "command": command,
+                "response_status": response_status,
+                "response_message": response_message,
+                "accessed_at": datetime.utcnow(),
+            }
+        )
+        if len(self._buffer) >= self.max_batch:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write all buffered records and return how many were written."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            rows, self._buffer = self._buffer, []
+            try:
+                async with self.session_factory() as session:
+                    for start in range(0, len(rows), self.max_batch):
+                        batch = rows[start : start + self.max_batch]
+                        await session.execute(insert(AccessLog).values(batch))
+                    await session.commit()
+            except SQLAlchemyError:
+                # Put the records back so they are retried on the next flush.
+                self._buffer = (rows + self._buffer)[-self.max_buffer :]
+                raise
+            return len(rows)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except SQLAlchemyError as e:
+                logger.error(f"Failed to flush access logs: {e}")
+
+    def start(self):
+        """Start the background flush loop on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the background flush loop and write whatever is left."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+access_log_writer = AccessLogWriter()
@@ -1,6 +1,10 @@
 from celery import Celery
+from celery.signals import worker_init
 import os
+from loguru import logger
+from prometheus_client import start_http_server
 from app.core.config import settings
+from app.core.metrics import instrument_celery, metrics_registry
 from celery.schedules import crontab
 
 celery_app = Celery(
@@ -18,6 +22,37 @@ celery_app.conf.update(
     timezone="UTC",
 )
 
+instrument_celery(celery_app)
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    """Serve task metrics from the worker's main process."""
+    if not settings.CELERY_METRICS_PORT:
+        return
+    if not os.environ.get("PROMETHEUS_MULTIPROCESS_DIR"):
+        logger.warning("PROMETHEUS_MULTIPROCESS_DIR is not set; pool process metrics are not exported")
+    start_http_server(settings.CELERY_METRICS_PORT, registry=metrics_registry())
+
+celery_app.conf.beat_schedule = {
+    "maintain-access-log-partitions-daily": {
+        "task": "maintain_access_log_partitions_task",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "maintain-booking-partitions-daily": {
+        "task": "maintain_booking_partitions_task",
+        "schedule": crontab(hour=3, minute=15),
+    },
+    "archive-bookings-daily": {
+        "task": "archive_bookings_task",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "refresh-price-calendars-daily": {
+        "task": "refresh_price_calendars_task",
+        "schedule": crontab(hour=0, minute=5),
+    },
+}
+
 
 # # Add periodic task schedule
 # celery_app.conf.beat_schedule = {
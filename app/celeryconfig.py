@@ -1 +1 @@
-imports = {"app.email_utils", "app.iot_utils"}
\ No newline at end of file
+imports = {"app.email_utils", "app.iot_utils", "app.maintenance_tasks"}
\ No newline at end of file
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Tuple
+
+from app.core.config import settings
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit breaker {name} is open, retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker.
+
+    The breaker opens when, over the last ``window_seconds`` and at least
+    ``min_calls`` calls, the share of failed calls reaches
+    ``failure_threshold`` or the share of calls slower than
+    ``slow_call_seconds`` reaches ``slow_call_threshold``. While open every
+    call fails fast with ``CircuitOpenError``. After ``open_seconds`` a single
+    probe call is let through (half-open); its outcome closes or re-opens the
+    breaker. Thread-safe, since lock commands run in worker threads.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = settings.IOT_BREAKER_WINDOW_SECONDS,
+        min_calls: int = settings.IOT_BREAKER_MIN_CALLS,
+        failure_threshold: float = settings.IOT_BREAKER_FAILURE_THRESHOLD,
+        slow_call_seconds: float = settings.IOT_BREAKER_SLOW_CALL_SECONDS,
+        slow_call_threshold: float = settings.IOT_BREAKER_SLOW_CALL_THRESHOLD,
+        open_seconds: float = settings.IOT_BREAKER_OPEN_SECONDS,
+    ):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_threshold = slow_call_threshold
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._calls: Deque[Tuple[float, bool, float]] = deque()
+        self._lock = threading.Lock()
+
+    def _trim(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _open(self, now: float):
+        self.state = self.OPEN
+        self.opened_at = now
+        self._probe_in_flight = False
+
+    def before_call(self):
+        """Reserve a call or raise ``CircuitOpenError`` if the breaker is open."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN:
+                remaining = self.open_seconds - (now - self.opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(self.name, remaining)
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError(self.name, self.open_seconds)
+                self._probe_in_flight = True
+
+    def release(self):
+        """Give back a reservation for a call that was never made."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record(self, success: bool, duration: float):
+        """Record the outcome of a call reserved with ``before_call``."""
+        with self._lock:
+            now = time.monotonic()
+            slow = duration > self.slow_call_seconds
+            if self.state == self.HALF_OPEN:
+                if success and not slow:
+                    self.state = self.CLOSED
+                    self._probe_in_flight = False
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+            if self.state == self.OPEN:
+                return
+
+            self._calls.append((now, success, duration))
+            self._trim(now)
+            total = len(self._calls)
+            if total < self.min_calls:
+                return
+            failures = sum(1 for _, ok, _ in self._calls if not ok)
+            slow_calls = sum(1 for _, _, d in self._calls if d > self.slow_call_seconds)
+            if (
+                failures / total >= self.failure_threshold
+                or slow_calls / total >= self.slow_call_threshold
+            ):
+                self._open(now)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            now = time.monotonic()
+            self._trim(now)
+            total = len(self._calls)
+            durations = [d for _, _, d in self._calls]
+            return {
+                "name": self.name,
+                "state": self.state,
+                "calls": total,
+                "failures": sum(1 for _, ok, _ in self._calls if not ok),
+                "avg_latency_ms": round(sum(durations) / total * 1000, 2) if total else None,
+                "retry_after": (
+                    round(max(0.0, self.open_seconds - (now - self.opened_at)), 2)
+                    if self.state == self.OPEN
+                    else None
+                ),
+            }
+
+
+class CircuitBreakerRegistry:
+    """Named circuit breakers, created on first use."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(name)
+            return breaker
+
+    def snapshot(self):
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return [breaker.snapshot() for breaker in breakers]
+
+
+circuit_breakers = CircuitBreakerRegistry()
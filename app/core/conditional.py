@@ -0,0 +1,68 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+@dataclass(frozen=True)
+class VersionStamp:
+    """Validators for a response: an entity tag and a last modification time."""
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+
+def version_stamp(*parts, last_modified: Optional[datetime] = None) -> VersionStamp:
+    """Build a stamp whose ETag changes whenever any of ``parts`` does.
+
+    For collections pass the newest ``updated_at`` and the row count, so
+    deletions change the tag too. ``last_modified`` is a naive UTC datetime.
+    """
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+    return VersionStamp(etag=f'W/"{digest}"', last_modified=last_modified)
+
+
+def _http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def not_modified(request: Request, stamp: VersionStamp) -> Optional[Response]:
+    """Return a 304 response when the client's cached copy is still current.
+
+    ``If-None-Match`` takes precedence; ``If-Modified-Since`` is only used
+    without it (RFC 9110). It cannot see deletions, so clients that send
+    both get exact answers.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = {tag.strip() for tag in if_none_match.split(",")}
+        # Weak comparison: W/"x" matches "x".
+        fresh = "*" in tags or stamp.etag in tags or stamp.etag[2:] in tags
+    elif stamp.last_modified is not None and "if-modified-since" in request.headers:
+        try:
+            since = parsedate_to_datetime(request.headers["if-modified-since"])
+        except (TypeError, ValueError):
+            return None
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = stamp.last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        fresh = modified <= since
+    else:
+        return None
+
+    if not fresh:
+        return None
+    return with_version(Response(status_code=304), stamp)
+
+
+def with_version(response: Response, stamp: VersionStamp) -> Response:
+    """Set the validator headers of ``stamp`` on ``response``."""
+    response.headers["ETag"] = stamp.etag
+    if stamp.last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(stamp.last_modified)
+    # Cacheable, but clients must revalidate before reusing the copy.
+    response.headers["Cache-Control"] = "no-cache"
+    return response
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic_core import MultiHostUrl
 from pydantic import (
@@ -18,6 +19,8 @@ class Settings(BaseSettings):
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "postgres"
+    POSTGRES_REPLICA_SERVER: Optional[str] = None
+    POSTGRES_REPLICA_PORT: int = 5432
 
     @computed_field
     @property
@@ -30,6 +33,37 @@ class Settings(BaseSettings):
             port=self.POSTGRES_PORT,
             path=self.POSTGRES_DB
         )
+
+    @computed_field
+    @property
+    def SQLALCHEMY_REPLICA_DATABASE_URL(self) -> Optional[PostgresDsn]:
+        if not self.POSTGRES_REPLICA_SERVER:
+            return None
+        return MultiHostUrl.build(
+            scheme="postgresql+asyncpg",
+            username=self.POSTGRES_USER,
+            password=self.POSTGRES_PASSWORD,
+            host=self.POSTGRES_REPLICA_SERVER,
+            port=self.POSTGRES_REPLICA_PORT,
+            path=self.POSTGRES_DB
+        )
+
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 5
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PGBOUNCER: bool = False
+    # Per Celery worker process; a worker opens at most
+    # concurrency * (pool size + overflow) connections.
+    CELERY_DB_POOL_SIZE: int = 2
+    CELERY_DB_MAX_OVERFLOW: int = 3
     
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
@@ -46,13 +80,73 @@ class Settings(BaseSettings):
     MAIL_SERVER: str
 
     BROKER_URL: str
+    REDIS_URL: str = "redis://redis:6379/0"
+    REDIS_SOCKET_TIMEOUT: float = 0.5
+    # Writes invalidate cached responses; the TTL only bounds replica lag.
+    RESPONSE_CACHE_TTL: int = 300
+    RESPONSE_CACHE_LOCK_SECONDS: float = 10.0
+    RESPONSE_CACHE_WAIT_SECONDS: float = 2.0
+
+    # On SIGTERM a worker fails /readyz for this long before it stops
+    # accepting connections, so load balancers stop routing to it first.
+    DRAIN_SECONDS: float = 5.0
+    READINESS_TIMEOUT: float = 2.0
+    # Requests issuing more queries, or one statement this many times, are
+    # logged as possible N+1 patterns.
+    QUERY_COUNT_WARNING: int = 30
+    N_PLUS_ONE_THRESHOLD: int = 5
+    # Who may profile a request with ?profile= (see app.profiling):
+    # "off", "admin" or "all" (local development only).
+    PROFILING: str = "admin"
+    PROFILING_INTERVAL: float = 0.001
+    # Celery workers serve their task metrics on this port; 0 disables it.
+    CELERY_METRICS_PORT: int = 0
     RESULT_BACKEND: str
 
     IOTHUB_HOST: str
     REGISTRY_SHARED_ACCESS_KEY_NAME: str
     REGISTRY_SHARED_ACCESS_KEY: str
+    LOCK_TRANSPORT: str = "azure"
+    LOCK_SIMULATOR_LATENCY_MS: float = 20.0
+    LOCK_SIMULATOR_FAILURE_RATE: float = 0.0
+    LOCK_COMMAND_COALESCE_SECONDS: float = 2.0
+    IOT_COMMAND_TIMEOUT_SECONDS: float = 5.0
+    # Threads blocking on hub calls, per process.
+    IOT_EXECUTOR_THREADS: int = 32
+    IOT_BREAKER_WINDOW_SECONDS: float = 60.0
+    IOT_BREAKER_MIN_CALLS: int = 5
+    IOT_BREAKER_FAILURE_THRESHOLD: float = 0.5
+    IOT_BREAKER_SLOW_CALL_SECONDS: float = 2.0
+    IOT_BREAKER_SLOW_CALL_THRESHOLD: float = 0.8
+    IOT_BREAKER_OPEN_SECONDS: float = 30.0
     
     REACT_APP_API_URL: str
 
+    ACCESS_LOG_FLUSH_SIZE: int = 200
+    ACCESS_LOG_FLUSH_INTERVAL: float = 1.0
+    ACCESS_LOG_MAX_BUFFER: int = 10000
+    ACCESS_LOG_RETENTION_MONTHS: int = 12
+    ACCESS_LOG_PARTITIONS_AHEAD: int = 3
+    ACCESS_LOG_MAX_QUERY_DAYS: int = 93
+
+    ACCESS_CODE_LOCAL_CACHE_SECONDS: float = 30.0
+
+    ARCHIVE_AFTER_MONTHS: int = 12
+    ARCHIVE_BATCH_SIZE: int = 1000
+
+    # Bounds the overlap checks so they only touch a few booking partitions.
+    # The ck_bookings_max_nights constraint enforces it, so raising it needs a migration.
+    MAX_BOOKING_NIGHTS: int = 90
+    # Bookings can start at most this many months after the current one.
+    BOOKING_PARTITIONS_AHEAD: int = 24
+
+    # pg_trgm word similarity a name or location needs to match a search.
+    SEARCH_SIMILARITY_THRESHOLD: float = 0.4
+
+    # Nightly prices are materialized this far ahead; later nights cost the
+    # property's base price.
+    PRICE_CALENDAR_MONTHS: int = 12
+    PRICE_CALENDAR_MAX_DAYS: int = 366
+
 
 settings = Settings()
@@ -1,28 +1,148 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from uuid import uuid4
+from loguru import logger
 from app.core.config import settings
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from typing import AsyncGenerator
-from fastapi import HTTPException
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from fastapi import HTTPException, Request
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
+from app.core.read_routing import ReplicaLagMonitor, SAFE_METHODS, write_stickiness
+from app.core.query_stats import instrument_engine
+from app.core.metrics import DB_POOL_WAIT, instrument_pool
 
-engine = create_async_engine(
-    str(settings.SQLALCHEMY_DATABASE_URL),
-    pool_size=10,
-    max_overflow=20,
-    future=True,
-)
+
+def connect_args() -> dict:
+    """asyncpg connection arguments, adjusted for pgbouncer if it is in use."""
+    if settings.DB_PGBOUNCER:
+        # In transaction pooling mode consecutive statements may land on
+        # different server connections, so named prepared statements must
+        # neither be cached nor reuse names.
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        # SQLAlchemy's prepared statement cache and asyncpg's own one.
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+def make_engine(
+    url: str,
+    name: str,
+    pool_size: int = settings.DB_POOL_SIZE,
+    max_overflow: int = settings.DB_MAX_OVERFLOW,
+) -> AsyncEngine:
+    """Create an engine with the pool settings from ``settings``."""
+    engine = create_async_engine(
+        url,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=connect_args(),
+        future=True,
+    )
+    instrument_engine(engine)
+    instrument_pool(engine, name)
+    return engine
+
+
+engine = make_engine(str(settings.SQLALCHEMY_DATABASE_URL), "primary")
 
 async_session = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# Optional read replica for heavy read-only traffic, see get_read_db.
+replica_engine = None
+replica_session = None
+replica_monitor = None
+if settings.SQLALCHEMY_REPLICA_DATABASE_URL:
+    replica_engine = make_engine(
+        str(settings.SQLALCHEMY_REPLICA_DATABASE_URL), "replica"
+    )
+    replica_session = sessionmaker(
+        replica_engine, expire_on_commit=False, class_=AsyncSession
+    )
+    replica_monitor = ReplicaLagMonitor(replica_engine)
+
 Base = declarative_base()
 
+READ_ONLY = {"postgresql_readonly": True}
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int = settings.DB_POOL_WARMUP):
+    """Open ``connections`` pooled connections so first requests skip connecting."""
+    count = min(connections, engine.pool.size())
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    opened = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.warning(f"Database pool warm-up failed: {result}")
+            continue
+        await result.close()
+        opened += 1
+    logger.info(f"Warmed up {opened}/{count} database connections")
+
+
+async def checkout_connection(session: AsyncSession, pool: str, **execution_options):
+    """Check out the session's connection, recording the pool wait time."""
+    start = time.perf_counter()
+    await session.connection(execution_options=execution_options or None)
+    DB_POOL_WAIT.labels(pool).observe(time.perf_counter() - start)
+
+
+@asynccontextmanager
+async def primary_read_session() -> AsyncIterator[AsyncSession]:
+    """Read-only session on the primary, for reads that must not lag behind writes."""
+    async with async_session() as session:
+        await checkout_connection(session, "primary", **READ_ONLY)
+        yield session
+
+
+def run_after_commit(session: AsyncSession, callback: Callable[[], Awaitable]):
+    """Run ``callback`` once the session's unit of work has been committed.
+
+    Use it for side effects such as cache updates that must not happen if the
+    transaction is rolled back.
+    """
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+async def commit(session: AsyncSession):
+    """Commit the unit of work and run the callbacks registered for it."""
+    await session.commit()
+    callbacks = session.info.pop("after_commit", [])
+    for callback in callbacks:
+        await callback()
+
+
+async def get_db(request: Request) -> AsyncGenerator:
+    """Session holding the unit of work for one request.
 
-async def get_db() -> AsyncGenerator:
+    CRUD functions only flush; this dependency commits once at the end.
+    Safe methods (GET, HEAD, OPTIONS) run in a read-only transaction and are
+    never committed.
+    """
     async with async_session() as session:
         try:
+            if request.method in SAFE_METHODS:
+                await checkout_connection(session, "primary", **READ_ONLY)
+                yield session
+                return
+            await checkout_connection(session, "primary")
             yield session
-            await session.commit()
+            await commit(session)
+            if replica_engine is not None:
+                await write_stickiness.mark(request)
         except SQLAlchemyError as sql_ex:
             await session.rollback()
             raise sql_ex
@@ -30,4 +150,25 @@ async def get_db() -> AsyncGenerator:
             await session.rollback()
             raise http_ex
         finally:
-            await session.close()
\ No newline at end of file
+            await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator:
+    """Read-only session for read-only routes.
+
+    Uses the replica when one is configured, its lag is within bounds and the
+    client has not written recently; otherwise falls back to the primary.
+    """
+    session_factory, pool = async_session, "primary"
+    if (
+        replica_session is not None
+        and await replica_monitor.is_healthy()
+        and not await write_stickiness.is_sticky(request)
+    ):
+        session_factory, pool = replica_session, "replica"
+    async with session_factory() as session:
+        try:
+            await checkout_connection(session, pool, **READ_ONLY)
+            yield session
+        finally:
+            await session.close()
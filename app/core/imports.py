@@ -0,0 +1,25 @@
+import asyncio
+import importlib
+from typing import Set
+
+_imported: Set[str] = set()
+
+
+def _import_all(names):
+    for name in names:
+        importlib.import_module(name)
+
+
+async def import_off_loop(*names: str):
+    """Import the modules ``names`` in a worker thread unless already imported.
+
+    Heavy libraries are imported on first use rather than at startup (see
+    ``benchmarks.startup``). Importing them takes seconds, so doing it on
+    the event loop would stall every other request of the worker. Await this
+    before the local ``import`` statements; those then find the modules
+    loaded. Concurrent first callers all wait in threads on the import lock.
+    """
+    missing = [name for name in names if name not in _imported]
+    if missing:
+        await asyncio.to_thread(_import_all, missing)
+        _imported.update(missing)
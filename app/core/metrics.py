@@ -0,0 +1,241 @@
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from fastapi import Response
+from loguru import logger
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.query_stats import QueryStats, track_queries
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Persistent connections the pool keeps open.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond the pool size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds",
+    "Time to get a connection from the pool, including connecting and pre-ping.",
+    ["pool"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, by method, route template and status.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries issued per request, by route template.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+HTTP_REQUEST_DB_SECONDS = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing database queries per request, by route template.",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_REQUEST_QUERY_WARNINGS = Counter(
+    "http_request_query_warnings_total",
+    "Requests over the query budget (kind=count) or repeating a statement (kind=repeated).",
+    ["route", "kind"],
+)
+
+CELERY_TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Task run time, by task name and final state.",
+    ["task", "state"],
+    buckets=LATENCY_BUCKETS + (60, 120, 300, 600),
+)
+CELERY_TASK_QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time from publishing a task (or its ETA) until a worker starts it.",
+    ["task"],
+    buckets=LATENCY_BUCKETS + (60, 120, 300, 600),
+)
+
+CODE_SECTION_DURATION = Histogram(
+    "code_section_duration_seconds",
+    "Time spent in instrumented hot spots, see ``timed``.",
+    ["section"],
+    buckets=LATENCY_BUCKETS,
+)
+
+RESPONSE_CACHE_REQUESTS = Counter(
+    "response_cache_requests_total",
+    "Response cache lookups by route and result (hit, miss, wait or error).",
+    ["route", "result"],
+)
+
+
+def instrument_pool(engine, name: str):
+    """Export the size, checked-out and overflow gauges of an engine's pool."""
+    pool = getattr(engine, "sync_engine", engine).pool
+    # Set on the first connection rather than here, so only processes that use
+    # the pool report it. With a preloaded app this runs in the Gunicorn master
+    # too, which never exits and would add a pool to the workers' live sum.
+    event.listen(pool, "first_connect", lambda *args: DB_POOL_SIZE.labels(name).set(pool.size()))
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    overflow = DB_POOL_OVERFLOW.labels(name)
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        checked_out.inc()
+        overflow.set(max(0, pool.overflow()))
+
+    def on_checkin(dbapi_connection, connection_record):
+        checked_out.dec()
+        current = pool.overflow()
+        if pool.checkedin() >= pool.size():
+            # The pool is full, so the returned connection is about to be closed.
+            current -= 1
+        overflow.set(max(0, current))
+
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+
+
+@contextmanager
+def timed(section: str):
+    """Record the time spent in a block (or decorated function) under ``section``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        CODE_SECTION_DURATION.labels(section).observe(time.perf_counter() - start)
+
+
+def check_query_patterns(method: str, route: str, stats: QueryStats):
+    """Warn about requests over ``QUERY_COUNT_WARNING`` queries or with N+1 patterns."""
+    if stats.queries > settings.QUERY_COUNT_WARNING:
+        HTTP_REQUEST_QUERY_WARNINGS.labels(route, "count").inc()
+        logger.warning(
+            f"{method} {route} issued {stats.queries} queries "
+            f"(budget {settings.QUERY_COUNT_WARNING})"
+        )
+    repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+    if repeated:
+        HTTP_REQUEST_QUERY_WARNINGS.labels(route, "repeated").inc()
+        for statement, count in repeated:
+            logger.warning(
+                f"Possible N+1 in {method} {route}: statement ran {count} times: {statement[:200]}"
+            )
+
+
+class RequestMetricsMiddleware:
+    """Record the latency and database round trips of every HTTP request.
+
+    Requests with many queries or repeated statements are logged, see
+    ``check_query_patterns``.
+
+    Requests are labelled with their route template (``/properties/{property_id}``),
+    so the label set stays bounded; requests no route matched share ``unmatched``.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_status)
+            finally:
+                route = getattr(scope.get("route"), "path", "unmatched")
+                HTTP_REQUEST_DURATION.labels(scope["method"], route, status).observe(
+                    time.perf_counter() - start
+                )
+                HTTP_REQUEST_DB_QUERIES.labels(route).observe(stats.queries)
+                HTTP_REQUEST_DB_SECONDS.labels(route).observe(stats.seconds)
+                check_query_patterns(scope["method"], route, stats)
+
+
+def instrument_celery(celery_app):
+    """Record the run time and queue wait of the tasks of ``celery_app``."""
+    from celery import signals
+
+    @signals.before_task_publish.connect(weak=False)
+    def stamp_published_at(headers=None, **kwargs):
+        if headers is not None:
+            headers.setdefault("published_at", time.time())
+
+    @signals.task_prerun.connect(weak=False)
+    def start_task_timer(task=None, **kwargs):
+        request = task.request
+        published_at = getattr(request, "published_at", None)
+        if published_at is not None:
+            if request.eta:
+                eta = datetime.fromisoformat(request.eta)
+                if eta.tzinfo is None:
+                    eta = eta.replace(tzinfo=timezone.utc)
+                published_at = max(published_at, eta.timestamp())
+            CELERY_TASK_QUEUE_WAIT.labels(task.name).observe(max(0.0, time.time() - published_at))
+        request.metrics_started = time.perf_counter()
+
+    @signals.task_postrun.connect(weak=False)
+    def stop_task_timer(task=None, state=None, **kwargs):
+        started = getattr(task.request, "metrics_started", None)
+        if started is not None:
+            CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(
+                time.perf_counter() - started
+            )
+
+    @signals.worker_process_shutdown.connect(weak=False)
+    def mark_worker_process_dead(**kwargs):
+        if os.environ.get("PROMETHEUS_MULTIPROCESS_DIR"):
+            multiprocess.mark_process_dead(os.getpid())
+
+
+def metrics_registry():
+    """The registry of this process, or one collecting all processes in multiprocess mode."""
+    if os.environ.get("PROMETHEUS_MULTIPROCESS_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return registry
+    return REGISTRY
+
+
+def metrics_response() -> Response:
+    """Render the metrics of this process, or of all workers in multiprocess mode."""
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,91 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+
+@dataclass
+class QueryStats:
+    """Database round trips made while a ``track_queries`` block was active."""
+
+    queries: int = 0
+    commits: int = 0
+    # Time spent executing statements, from send to result.
+    seconds: float = 0.0
+    statements: List[str] = field(default_factory=list)
+
+    def repeated(self, min_count: int) -> List[Tuple[str, int]]:
+        """Statements issued at least ``min_count`` times, most repeated first.
+
+        The same statement with different parameters over and over is the
+        signature of an N+1 pattern: a lazy load or query inside a loop.
+        """
+        counts = Counter(normalize_statement(statement) for statement in self.statements)
+        return [(statement, count) for statement, count in counts.most_common() if count >= min_count]
+
+
+_PLACEHOLDER = r"\$\d+(?:::\w+)?"
+_PLACEHOLDER_LIST = re.compile(rf"{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*(?=[\s,)]|$)")
+
+
+def normalize_statement(statement: str) -> str:
+    """Collapse whitespace and bound parameter lists, so ``IN ($1, $2)`` equals ``IN ($1)``."""
+    return _PLACEHOLDER_LIST.sub("?", " ".join(statement.split()))
+
+
+# Blocks can nest (a benchmark around a request the metrics middleware also
+# tracks); every active block counts the round trips.
+_active_stats: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+@contextmanager
+def track_queries():
+    """Count the queries and commits issued in this context."""
+    stats = QueryStats()
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    active = _active_stats.get()
+    return active[-1] if active else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    active = _active_stats.get()
+    if active:
+        if context is not None:
+            context._query_started = time.perf_counter()
+        for stats in active:
+            stats.queries += 1
+            stats.statements.append(statement)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    active = _active_stats.get()
+    started = getattr(context, "_query_started", None)
+    if active and started is not None:
+        elapsed = time.perf_counter() - started
+        for stats in active:
+            stats.seconds += elapsed
+
+
+def _commit(conn):
+    for stats in _active_stats.get():
+        stats.commits += 1
+
+
+def instrument_engine(engine):
+    """Attach the query and commit counters to an (async) engine."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "commit", _commit)
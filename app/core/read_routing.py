@@ -0,0 +1,136 @@
+import time
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.redis import redis_client
+from app.core.security import decode_access_token
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaLagMonitor:
+    """Track whether the read replica is reachable and close enough to the primary.
+
+    The lag is measured at most once every ``check_interval`` seconds; the
+    replica counts as unhealthy if the check fails or the lag exceeds
+    ``max_lag`` seconds.
+    """
+
+    def __init__(
+        self,
+        engine,
+        max_lag: float = settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = settings.REPLICA_LAG_CHECK_INTERVAL,
+    ):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: Optional[float] = None
+        self.healthy = False
+        self._checked_at = float("-inf")
+
+    async def is_healthy(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self.healthy
+        self._checked_at = now
+        try:
+            async with self.engine.connect() as connection:
+                self.lag = float((await connection.execute(REPLICA_LAG_QUERY)).scalar())
+            self.healthy = self.lag <= self.max_lag
+            if not self.healthy:
+                logger.warning(f"Replica lag {self.lag:.1f}s, reading from the primary")
+        except (SQLAlchemyError, OSError) as e:
+            logger.warning(f"Replica lag check failed, reading from the primary: {e}")
+            self.lag = None
+            self.healthy = False
+        return self.healthy
+
+
+class WriteStickiness:
+    """Route a client's reads to the primary for a short window after it writes.
+
+    Clients are identified by the user ID in their access token, so
+    anonymous requests are never sticky. The marker is kept in Redis so it
+    holds whichever worker serves the next request. A worker that has seen a
+    user's marker remembers it until it expires and stops asking Redis, and
+    each request asks at most once.
+    """
+
+    def __init__(self, redis=redis_client, window: float = settings.READ_YOUR_WRITES_SECONDS):
+        self.redis = redis
+        self.window = window
+        self._sticky_until: Dict[str, float] = {}
+
+    @staticmethod
+    def _user_id(request: Request) -> Optional[str]:
+        if not hasattr(request.state, "ryw_user_id"):
+            scheme, _, token = request.headers.get("authorization", "").partition(" ")
+            user_id = None
+            if scheme.lower() == "bearer" and token:
+                try:
+                    user_id = str(decode_access_token(token).get("sub") or "") or None
+                except HTTPException:
+                    pass
+            request.state.ryw_user_id = user_id
+        return request.state.ryw_user_id
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"ryw:{user_id}"
+
+    def _remember(self, user_id: str, seconds: float):
+        now = time.monotonic()
+        for expired in [u for u, until in self._sticky_until.items() if until <= now]:
+            del self._sticky_until[expired]
+        self._sticky_until[user_id] = now + seconds
+
+    async def mark(self, request: Request):
+        user_id = self._user_id(request)
+        if user_id is None:
+            return
+        self._remember(user_id, self.window)
+        request.state.ryw_sticky = True
+        try:
+            await self.redis.set(self._key(user_id), 1, px=int(self.window * 1000))
+        except RedisError as e:
+            logger.warning(f"Failed to record read-your-writes marker: {e}")
+
+    async def is_sticky(self, request: Request) -> bool:
+        user_id = self._user_id(request)
+        if user_id is None:
+            return False
+        if self._sticky_until.get(user_id, 0.0) > time.monotonic():
+            return True
+        sticky = getattr(request.state, "ryw_sticky", None)
+        if sticky is not None:
+            return sticky
+        try:
+            remaining_ms = await self.redis.pttl(self._key(user_id))
+        except RedisError:
+            # Without the marker we cannot tell, so stay on the safe side.
+            return True
+        sticky = remaining_ms > 0
+        if sticky:
+            self._remember(user_id, remaining_ms / 1000)
+        request.state.ryw_sticky = sticky
+        return sticky
+
+
+write_stickiness = WriteStickiness()
@@ -0,0 +1,9 @@
+from redis import asyncio as aioredis
+from app.core.config import settings
+
+redis_client = aioredis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+)
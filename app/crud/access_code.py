@@ -5,9 +5,15 @@ from app.models.booking import Booking
 from datetime import datetime
 from fastapi import HTTPException
 import secrets
-from app.iot import SmartLock
+from app.iot import SmartLock, LockTransportError
+from app.circuit_breaker import CircuitOpenError
+import asyncio
+from app.core.config import settings
+from app.core.database import run_after_commit
 import json
 from app.crud import access_logs as access_logs_crud
+from app.access_code_cache import access_code_cache, CachedAccessCode
+from app.lock_command_queue import lock_command_queue
 
 
 def generate_access_code():
@@ -23,8 +29,9 @@ async def create_access_code(
         booking_id=booking_id, code=code, valid_from=valid_from, valid_until=valid_until
     )
     db.add(access_code)
-    await db.commit()
-    await db.refresh(access_code)
+    await db.flush()
+    cached = CachedAccessCode.from_model(access_code)
+    run_after_commit(db, lambda: access_code_cache.put(booking_id, cached))
     return access_code
 
 
@@ -49,64 +56,86 @@ async def delete_access_code(db: AsyncSession, booking_id: int):
     )
     result = await db.execute(delete_query)
     deleted_access_code = result.scalar_one()
-    await db.commit()
+    # Invalidate now and again after commit, in case a concurrent check
+    # re-cached the code before the delete became visible.
+    await access_code_cache.invalidate(booking_id)
+    run_after_commit(db, lambda: access_code_cache.invalidate(booking_id))
     return deleted_access_code
 
 
 async def is_access_code_valid(db: AsyncSession, booking_id: int, code: str):
-    """Check if an access code is valid."""
-    access_code = await get_access_code(db, booking_id)
-    if not access_code:
-        return False
-    if access_code.code != code:
-        return False
-    now = datetime.now()
-    if access_code.valid_from > now or access_code.valid_until < now:
-        return False
-    return True
+    """Check if an access code is valid.
+
+    Active codes are served from the access code cache, so the database is
+    only queried on a cache miss.
+    """
+    cached = await access_code_cache.get(booking_id)
+    if cached is None:
+        access_code = await get_access_code(db, booking_id)
+        if not access_code:
+            return False
+        cached = CachedAccessCode.from_model(access_code)
+        await access_code_cache.put(booking_id, cached)
+    return cached.matches(code, datetime.now())
+
+
+async def _submit_lock_command(smart_lock: SmartLock, command: str, access_code_id=None):
+    """Queue a lock command and map hub failures to HTTP errors.
+
+    The command latency budget only starts once the command leaves the
+    device's queue. A caller that runs out of it gets a 504, but the command
+    still completes, and every command that gets a response is written to
+    the access log, whether or not its caller is still waiting.
+    """
+
+    def log(response):
+        access_logs_crud.queue_access_log(
+            access_code_id=access_code_id,
+            command=command,
+            response_status=str(response.status),
+            response_message=json.dumps(response.payload),
+        )
+
+    try:
+        return await lock_command_queue.submit(
+            smart_lock.device_id,
+            command,
+            lambda: smart_lock.asend_command(command),
+            timeout=settings.IOT_COMMAND_TIMEOUT_SECONDS + 1,
+            on_result=log,
+        )
+    except CircuitOpenError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Smart lock is temporarily unavailable.",
+            headers={"Retry-After": str(int(e.retry_after) + 1)},
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Smart lock did not respond in time.")
+    except LockTransportError:
+        raise HTTPException(status_code=502, detail="Failed to reach the smart lock.")
 
 
 async def send_smart_lock_command(db: AsyncSession, booking_id: int, command: str):
     """Send a command to the smart lock using booking ID."""
-    booking = await db.get(Booking, booking_id)
+    # Bookings have a composite (id, start_date) key, so no db.get().
+    result = await db.execute(select(Booking).where(Booking.id == booking_id))
+    booking = result.scalar_one_or_none()
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     
     access_code = await get_access_code(db, booking_id)
     if not access_code:
         raise HTTPException(status_code=404, detail="Access code not found")
-    
-    device_id = booking.property.smart_lock_id.split(":")[0]
-    encryption_key = booking.property.smart_lock_id.split(":")[1].encode()
-
-    smart_lock = SmartLock(device_id, encryption_key)
-    response = await smart_lock.send_command(command)
-
-    await access_logs_crud.create_access_log(
-        db=db,
-        access_code_id=access_code.id,
-        command=command,
-        response_status=str(response.status),
-        response_message=json.dumps(response.payload),
-    )
 
-    return response
+    if not booking.property.lock_id:
+        raise HTTPException(status_code=400, detail="Property has no smart lock")
+
+    smart_lock = SmartLock.from_lock_id(booking.property.lock_id)
+    return await _submit_lock_command(smart_lock, command, access_code.id)
 
 
 async def send_smart_lock_command_admin(db: AsyncSession, lock_id: str, command: str):
     """Send a command to the smart lock without booking."""
-    device_id = lock_id.split(":")[0]
-    encryption_key = lock_id.split(":")[1].encode()
-
-    smart_lock = SmartLock(device_id, encryption_key)
-    response = await smart_lock.send_command(command)
-
-    await access_logs_crud.create_access_log(
-        db=db,
-        access_code_id=None,
-        command=command,
-        response_status=str(response.status),
-        response_message=json.dumps(response.payload),
-    )
-
-    return response
+    smart_lock = SmartLock.from_lock_id(lock_id)
+    return await _submit_lock_command(smart_lock, command)
@@ -1,9 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, tuple_
 from app.models.access_code import AccessCode
 from app.models.access_log import AccessLog
 from datetime import datetime
 from fastapi import HTTPException
+from app.access_log_writer import access_log_writer
 
 
 async def create_access_log(
@@ -21,12 +22,50 @@ async def create_access_log(
         response_message=response_message,
     )
     db.add(access_log)
-    await db.commit()
+    await db.flush()
     return access_log
 
 
-async def get_access_logs(db: AsyncSession, access_code_id: int):
-    """Get access logs for an access code."""
-    stmt = select(AccessLog).where(AccessLog.access_code_id == access_code_id)
+def queue_access_log(
+    command: str,
+    response_status: str,
+    response_message: str = None,
+    access_code_id: int = None,
+):
+    """Queue an access log to be written by the buffered log writer."""
+    access_log_writer.add(
+        access_code_id=access_code_id,
+        command=command,
+        response_status=response_status,
+        response_message=response_message,
+    )
+
+
+async def get_access_logs(
+    db: AsyncSession,
+    access_code_id: int,
+    since: datetime,
+    until: datetime,
+    limit: int = 100,
+    before: datetime = None,
+    before_id: int = None,
+):
+    """Get a page of access logs for an access code, newest first.
+
+    The time bounds keep the query on the partitions covering the window,
+    and ``before``/``before_id`` continue from the last row of the previous page.
+    """
+    stmt = (
+        select(AccessLog)
+        .where(AccessLog.access_code_id == access_code_id)
+        .where(AccessLog.accessed_at >= since)
+        .where(AccessLog.accessed_at < until)
+        .order_by(AccessLog.accessed_at.desc(), AccessLog.id.desc())
+        .limit(limit)
+    )
+    if before is not None and before_id is not None:
+        stmt = stmt.where(
+            tuple_(AccessLog.accessed_at, AccessLog.id) < tuple_(before, before_id)
+        )
     result = await db.execute(stmt)
     return result.scalars().all()
\ No newline at end of file
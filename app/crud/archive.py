@@ -0,0 +1,116 @@
+from datetime import date
+from typing import List
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models.access_code import AccessCode
+from app.models.archive import ArchivedAccessCode, ArchivedBooking, ArchivedPayment
+from app.models.booking import Booking
+from app.models.payment import Payment
+from app.models.property import Property
+
+
+def _move(source, target, where):
+    """Build a DELETE ... RETURNING CTE on ``source`` and its INSERT into ``target``."""
+    columns = [c.name for c in source.__table__.columns]
+    moved = (
+        delete(source)
+        .where(where)
+        .returning(*source.__table__.columns)
+        .cte(f"moved_{source.__tablename__}")
+    )
+    copied = (
+        insert(target)
+        .from_select(columns, select(*[moved.c[name] for name in columns]))
+        .returning(target.id)
+        .cte(f"copied_{source.__tablename__}")
+    )
+    return moved, copied
+
+
+def build_archive_batch(cutoff: date, batch_size: int):
+    """Build the statement moving one batch of bookings ended before ``cutoff``.
+
+    The batch of bookings, their payments and their access codes are deleted
+    from the hot tables and inserted into the archive tables by a single
+    statement, so a batch is moved entirely or not at all. Rows locked by
+    other transactions are skipped and picked up by a later batch. The
+    statement returns the number of bookings moved.
+    """
+    batch = (
+        select(Booking.id)
+        # start_date <= end_date; the extra bound prunes newer partitions.
+        .where(Booking.start_date < cutoff)
+        .where(Booking.end_date < cutoff)
+        .order_by(Booking.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("batch")
+    )
+    in_batch = select(batch.c.id)
+    _, payments = _move(Payment, ArchivedPayment, Payment.booking_id.in_(in_batch))
+    _, codes = _move(AccessCode, ArchivedAccessCode, AccessCode.booking_id.in_(in_batch))
+    _, bookings = _move(Booking, ArchivedBooking, Booking.id.in_(in_batch))
+    return select(
+        select(func.count()).select_from(bookings).scalar_subquery(),
+        select(func.count()).select_from(payments).scalar_subquery(),
+        select(func.count()).select_from(codes).scalar_subquery(),
+    )
+
+
+async def archive_bookings(db: AsyncSession, cutoff: date, batch_size: int):
+    """Move one batch of bookings ended before ``cutoff`` to the archive.
+
+    Returns the numbers of bookings, payments and access codes moved.
+    """
+    result = await db.execute(build_archive_batch(cutoff, batch_size))
+    return tuple(result.one())
+
+
+async def get_archived_booking(db: AsyncSession, booking_id: int):
+    """Get an archived booking by ID."""
+    query = (
+        select(ArchivedBooking)
+        .where(ArchivedBooking.id == booking_id)
+        .options(selectinload(ArchivedBooking.payment))
+    )
+    result = await db.execute(query)
+    return result.scalar_one_or_none()
+
+
+async def get_archived_bookings(db: AsyncSession, user_id: int) -> List[ArchivedBooking]:
+    """Get the archived bookings of a user."""
+    query = (
+        select(ArchivedBooking)
+        .where(ArchivedBooking.user_id == user_id)
+        .options(selectinload(ArchivedBooking.payment))
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def get_archived_owner_bookings(
+    db: AsyncSession, owner_id: int
+) -> List[ArchivedBooking]:
+    """Get the archived bookings for properties owned by the owner."""
+    query = (
+        select(ArchivedBooking)
+        .join(ArchivedBooking.property)
+        .where(Property.owner_id == owner_id)
+        .options(selectinload(ArchivedBooking.payment))
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def get_archived_payments(db: AsyncSession, user_id: int) -> List[ArchivedPayment]:
+    """Get the archived payments of a user."""
+    query = (
+        select(ArchivedPayment)
+        .join(ArchivedPayment.booking)
+        .where(ArchivedBooking.user_id == user_id)
+    )
+    result = await db.execute(query)
+    return result.scalars().all()
@@ -1,21 +1,54 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, union_all
+from app.models.archive import ArchivedBooking, ArchivedPayment
 from app.models.booking import Booking
+from app.models.payment import Payment
 from app.models.property import Property
-from app.models.user import User
+from app.models.user import User as UserModel
 from app.schemas.user import User
 from app.enums.user_role import Role
 from app.schemas.booking import BookingCreate, BookingUpdate, PersonalizedOffer
 from sqlalchemy.orm import selectinload, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from fastapi import HTTPException
 from datetime import date
-from sklearn.cluster import KMeans
-import numpy as np
 from app.models.access_code import AccessCode
+from app.core.imports import import_off_loop
+from app.core.metrics import timed
 from datetime import datetime, timedelta
 import random
 import string
 from typing import List
+from app.access_code_cache import access_code_cache, CachedAccessCode
+from app.core.database import run_after_commit
+from app.response_cache import AVAILABILITY, response_cache
+from app.crud.booking_pipeline import adopt, build_booking_pipeline, overlapping_stays, stay_price
+from app.core.config import settings
+from app.partitions import add_months
+from app.crud import archive as archive_crud
+from app.enums.booking_status import BookingStatus
+
+
+def validate_stay(start_date: date, end_date: date):
+    """Reject stays that are empty, longer than ``MAX_BOOKING_NIGHTS`` or too far ahead.
+
+    Stays may start up to the end of the last booking partition kept ahead by
+    ``maintain_booking_partitions_task``, so none land in the default partition.
+    """
+    if start_date >= end_date:
+        raise HTTPException(
+            status_code=400, detail="Start date must be before the end date."
+        )
+    if (end_date - start_date).days > settings.MAX_BOOKING_NIGHTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Bookings can be at most {settings.MAX_BOOKING_NIGHTS} nights long.",
+        )
+    if start_date >= add_months(date.today(), settings.BOOKING_PARTITIONS_AHEAD + 1):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Bookings can start at most {settings.BOOKING_PARTITIONS_AHEAD} months ahead.",
+        )
 
 
 async def check_availability(
@@ -26,16 +59,12 @@ async def check_availability(
     booking_id: int = None,
 ) -> bool:
     """Check if a property is available for booking in the given date range."""
-    if start_date >= end_date:
-        raise HTTPException(
-            status_code=400, detail="Start date must be before the end date."
-        )
+    validate_stay(start_date, end_date)
 
     result = await db.execute(
         select(Booking)
         .filter(Booking.property_id == property_id)
-        .filter(Booking.start_date < end_date)
-        .filter(Booking.end_date > start_date)
+        .filter(overlapping_stays(start_date, end_date))
         .filter(Booking.id != booking_id)
     )
     overlapping_bookings = result.scalars().all()
@@ -44,41 +73,49 @@ async def check_availability(
 
 
 async def create_booking(db: AsyncSession, booking: BookingCreate, user: User):
-    """Create a new booking."""
-    if not await check_availability(
-        db, booking.property_id, booking.start_date, booking.end_date
-    ):
+    """Create a new booking.
+
+    Availability check, pricing, the booking insert and its access code are
+    a single statement (see ``booking_pipeline``), so the booking returned
+    here already carries its property, owner and user without further queries.
+    """
+    validate_stay(booking.start_date, booking.end_date)
+
+    now = datetime.utcnow()
+    statement = build_booking_pipeline(
+        property_id=booking.property_id,
+        user_id=user.id,
+        start_date=booking.start_date,
+        end_date=booking.end_date,
+        status=booking.status or BookingStatus.PENDING,
+        created_at=now,
+        code="".join(random.choices(string.ascii_uppercase + string.digits, k=8)),
+        code_valid_from=now,
+        code_valid_until=now + timedelta(days=1),
+    )
+    row = (await db.execute(statement)).mappings().one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Property not found.")
+    if row["b_id"] is None:
         raise HTTPException(
             status_code=400, detail="Property is not available for booking."
         )
 
-    new_booking = Booking(**booking.model_dump(), user_id=user.id)
-    # get the property with the owner
-    query = (
-        select(Property)
-        .where(Property.id == booking.property_id)
-        .options(selectinload(Property.owner))
+    owner = adopt(db, UserModel, row, "o_")
+    property = adopt(db, Property, row, "p_")
+    new_booking = adopt(db, Booking, row, "b_")
+    set_committed_value(property, "owner", owner)
+    set_committed_value(new_booking, "property", property)
+    set_committed_value(new_booking, "user", user)
+    set_committed_value(new_booking, "payment", None)
+
+    cached = CachedAccessCode(
+        code=row["c_code"],
+        valid_from=row["c_valid_from"],
+        valid_until=row["c_valid_until"],
     )
-    result = await db.execute(query)
-    property = result.scalar_one()
-    nights = (booking.end_date - booking.start_date).days
-    total_price = property.price * nights
-    new_booking.booking_price = total_price
-    new_booking.property = property
-    db.add(new_booking)
-    await db.commit()
-    await db.refresh(new_booking)
-
-    # Generate access codes for the booking
-    access_code = AccessCode(
-        booking_id=new_booking.id,
-        code="".join(random.choices(string.ascii_uppercase + string.digits, k=8)),
-        valid_from=datetime.utcnow(),
-        valid_until=datetime.utcnow() + timedelta(days=1),
-    )
-    db.add(access_code)
-    await db.commit()
-    await db.refresh(access_code)
+    run_after_commit(db, lambda: access_code_cache.put(new_booking.id, cached))
+    run_after_commit(db, lambda: response_cache.invalidate(AVAILABILITY))
 
     # Send access code to the user (e.g., via email or SMS)
     # You can implement the logic to send the access code here
@@ -103,6 +140,7 @@ async def update_booking(
     if booking.start_date or booking.end_date:
         start_date = booking.start_date or db_booking.start_date
         end_date = booking.end_date or db_booking.end_date
+        validate_stay(start_date, end_date)
 
         if not await check_availability(
             db, db_booking.property_id, start_date, end_date, booking_id
@@ -111,11 +149,16 @@ async def update_booking(
                 status_code=400, detail="Property is not available for booking."
             )
 
-    for key, value in booking.model_dump().items():
+        # New dates, new price.
+        db_booking.booking_price = await db.scalar(
+            select(stay_price(db_booking.property_id, start_date, end_date))
+        )
+
+    for key, value in booking.model_dump(exclude_none=True).items():
         setattr(db_booking, key, value)
 
-    await db.commit()
-    await db.refresh(db_booking)
+    await db.flush()
+    run_after_commit(db, lambda: response_cache.invalidate(AVAILABILITY))
     return db_booking
 
 
@@ -128,15 +171,27 @@ async def delete_booking(db: AsyncSession, booking_id: int, user: User):
         raise HTTPException(
             status_code=403, detail="You are not allowed to delete this booking."
         )
-    delete_query = delete(Booking).where(Booking.id == booking_id).returning(Booking)
+    delete_query = (
+        delete(Booking)
+        .where(Booking.id == booking_id)
+        .where(Booking.start_date == db_booking.start_date)
+        .returning(Booking)
+    )
     result = await db.execute(delete_query)
     deleted_booking = result.scalar_one()
-    await db.commit()
+    # The access code goes with the booking by cascade.
+    run_after_commit(db, lambda: access_code_cache.invalidate(booking_id))
+    run_after_commit(db, lambda: response_cache.invalidate(AVAILABILITY))
     return deleted_booking
 
 
-async def get_booking(db: AsyncSession, booking_id: int, user: User):
-    """Retrieve a booking by ID."""
+async def get_booking(
+    db: AsyncSession, booking_id: int, user: User, include_archived: bool = False
+):
+    """Retrieve a booking by ID.
+
+    With ``include_archived`` the archive is searched too, for read-only use.
+    """
     query = (
         select(Booking)
         .where(Booking.id == booking_id)
@@ -144,6 +199,8 @@ async def get_booking(db: AsyncSession, booking_id: int, user: User):
     )
     result = await db.execute(query)
     booking = result.scalar_one_or_none()
+    if not booking and include_archived:
+        booking = await archive_crud.get_archived_booking(db, booking_id)
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
     if user.role == Role.USER and booking.user_id != user.id:
@@ -158,7 +215,7 @@ async def get_booking(db: AsyncSession, booking_id: int, user: User):
 
 
 async def get_bookings(db: AsyncSession, user: User):
-    """Retrieve all bookings for a user."""
+    """Retrieve all bookings for a user, archived ones included."""
     query = (
         select(Booking)
         .where(Booking.user_id == user.id)
@@ -166,7 +223,7 @@ async def get_bookings(db: AsyncSession, user: User):
     )
     result = await db.execute(query)
     bookings = result.scalars().all()
-    return bookings
+    return [*bookings, *await archive_crud.get_archived_bookings(db, user.id)]
 
 
 async def get_personalized_offers(db: AsyncSession, user: User):
@@ -187,6 +244,12 @@ async def get_personalized_offers(db: AsyncSession, user: User):
     if not bookings:
         return []
 
+    # numpy and scikit-learn take seconds and tens of MB to import, so they
+    # are loaded on the first request for offers rather than at startup.
+    await import_off_loop("numpy", "sklearn.cluster")
+    import numpy as np
+    from sklearn.cluster import KMeans
+
     # Підготувати дані для кластеризації: property_id та тривалість перебування (у днях)
     data = np.array(
         [[b.property_id, (b.end_date - b.start_date).days] for b in bookings]
@@ -196,7 +259,8 @@ async def get_personalized_offers(db: AsyncSession, user: User):
     n_clusters = min(3, len(data))
 
     # Застосувати кластеризацію KMeans для групування бронювань у кластери
-    kmeans = KMeans(n_clusters=n_clusters).fit(data)
+    with timed("kmeans_fit"):
+        kmeans = KMeans(n_clusters=n_clusters).fit(data)
     clusters = kmeans.predict(data)
 
     # Отримати всі властивості
@@ -233,7 +297,7 @@ async def get_personalized_offers(db: AsyncSession, user: User):
 
 
 async def get_owner_bookings(db: AsyncSession, owner_id: int):
-    """Retrieve all bookings for properties owned by the owner."""
+    """Retrieve all bookings for properties owned by the owner, archived ones included."""
     query = (
         select(Booking)
         .join(Booking.property)
@@ -242,7 +306,96 @@ async def get_owner_bookings(db: AsyncSession, owner_id: int):
     )
     result = await db.execute(query)
     bookings = result.scalars().all()
-    return bookings
+    return [*bookings, *await archive_crud.get_archived_owner_bookings(db, owner_id)]
+
+
+BOOKING_LIST_FIELDS = (
+    "id",
+    "property_id",
+    "user_id",
+    "start_date",
+    "end_date",
+    "status",
+    "booking_price",
+    "created_at",
+)
+BOOKING_LIST_EXPANSIONS = ("property", "payment")
+PROPERTY_SUMMARY_FIELDS = ("id", "name", "location", "description", "price")
+PAYMENT_SUMMARY_FIELDS = ("id", "amount", "status")
+
+
+def _booking_list_select(
+    booking_model,
+    payment_model,
+    fields=BOOKING_LIST_FIELDS,
+    expand=BOOKING_LIST_EXPANSIONS,
+    join_property: bool = False,
+):
+    """Select the requested ``BookingListItem`` columns of live or archived bookings.
+
+    Expanded relationships are joined and selected as ``<relation>__<field>``
+    columns; the others are not joined at all.
+    """
+    query = select(*(getattr(booking_model, field) for field in fields))
+    if "property" in expand or join_property:
+        query = query.join(Property, Property.id == booking_model.property_id)
+    if "property" in expand:
+        query = query.add_columns(
+            *(getattr(Property, f).label(f"property__{f}") for f in PROPERTY_SUMMARY_FIELDS)
+        )
+    if "payment" in expand:
+        query = query.outerjoin(
+            payment_model, payment_model.booking_id == booking_model.id
+        ).add_columns(
+            *(getattr(payment_model, f).label(f"payment__{f}") for f in PAYMENT_SUMMARY_FIELDS)
+        )
+    return query
+
+
+def _booking_list_item(
+    row, fields=BOOKING_LIST_FIELDS, expand=BOOKING_LIST_EXPANSIONS
+) -> dict:
+    values = row._mapping
+    item = {field: values[field] for field in fields}
+    if "property" in expand:
+        item["property"] = {f: values[f"property__{f}"] for f in PROPERTY_SUMMARY_FIELDS}
+    if "payment" in expand:
+        item["payment"] = (
+            None
+            if values["payment__id"] is None
+            else {f: values[f"payment__{f}"] for f in PAYMENT_SUMMARY_FIELDS}
+        )
+    return item
+
+
+async def get_booking_list(
+    db: AsyncSession,
+    user_id: int = None,
+    owner_id: int = None,
+    fields=BOOKING_LIST_FIELDS,
+    expand=BOOKING_LIST_EXPANSIONS,
+) -> List[dict]:
+    """List bookings of a user or of an owner's properties, archived ones included.
+
+    Only the requested ``fields`` and ``expand``-ed relationships are
+    selected. Rows are returned as ``BookingListItem`` shaped dicts, ready
+    to encode without loading or validating ORM objects.
+    """
+    selects = []
+    for booking_model, payment_model in (
+        (Booking, Payment),
+        (ArchivedBooking, ArchivedPayment),
+    ):
+        query = _booking_list_select(
+            booking_model, payment_model, fields, expand, join_property=owner_id is not None
+        )
+        if user_id is not None:
+            query = query.where(booking_model.user_id == user_id)
+        if owner_id is not None:
+            query = query.where(Property.owner_id == owner_id)
+        selects.append(query)
+    result = await db.execute(union_all(*selects))
+    return [_booking_list_item(row, fields, expand) for row in result]
 
 
 async def get_all_bookings(db: AsyncSession) -> List[Booking]:
@@ -0,0 +1,144 @@
+from datetime import date, datetime, timedelta
+from typing import Dict
+
+from sqlalchemy import Date, DateTime, and_, exists, func, insert, inspect, literal, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.config import settings
+from app.enums.booking_status import BookingStatus
+from app.models.access_code import AccessCode
+from app.models.booking import Booking
+from app.models.property import Property
+from app.models.user import User
+
+
+def loaded_columns(model):
+    """Return the table columns of ``model`` that are loaded by default."""
+    return [attr.columns[0] for attr in inspect(model).column_attrs if not attr.deferred]
+
+
+def overlapping_stays(start_date: date, end_date: date):
+    """Criteria for bookings overlapping the stay from ``start_date`` to ``end_date``.
+
+    Stays are at most ``MAX_BOOKING_NIGHTS`` long, so an overlapping booking
+    starts less than that many days before ``start_date``. Bounding
+    ``start_date`` on both sides lets the planner prune booking partitions.
+    """
+    return and_(
+        Booking.start_date < end_date,
+        Booking.start_date > start_date - timedelta(days=settings.MAX_BOOKING_NIGHTS),
+        Booking.end_date > start_date,
+    )
+
+
+def stay_price(property_id, start_date: date, end_date: date):
+    """SQL expression pricing a stay with the ``stay_price`` function.
+
+    It sums the stay's slice of the property's price calendar, charges the
+    base price for nights outside it and applies the length of stay
+    multiplier; ``app.crud.pricing.get_quote`` is the same in Python.
+    """
+    return func.stay_price(property_id, literal(start_date, Date), literal(end_date, Date))
+
+
+def build_booking_pipeline(
+    property_id: int,
+    user_id: int,
+    start_date: date,
+    end_date: date,
+    status: BookingStatus,
+    created_at: datetime,
+    code: str,
+    code_valid_from: datetime,
+    code_valid_until: datetime,
+):
+    """Build the single statement that creates a booking and its access code.
+
+    The statement reads the property and its owner, checks for overlapping
+    bookings, inserts the booking priced by ``stay_price`` and inserts the
+    access code, all as data-modifying CTEs. It always returns one row per
+    existing property: the property and owner columns (``p_*`` and ``o_*``),
+    plus the new booking (``b_*``) and access code (``c_*``) columns, which
+    are NULL when the dates were not available. No row means the property
+    does not exist.
+    """
+    prop = (
+        select(
+            *[c.label(f"p_{c.key}") for c in loaded_columns(Property)],
+            # Every loaded column, so no attribute of the adopted owner is
+            # left expired for a lazy load the async session cannot do.
+            *[c.label(f"o_{c.key}") for c in loaded_columns(User)],
+        )
+        .join_from(Property, User, Property.owner_id == User.id)
+        .where(Property.id == property_id)
+        .cte("prop")
+    )
+
+    overlapping = (
+        select(Booking.id)
+        .where(Booking.property_id == property_id)
+        .where(overlapping_stays(start_date, end_date))
+        .limit(1)
+    )
+
+    new_booking = (
+        insert(Booking)
+        .from_select(
+            ["user_id", "property_id", "start_date", "end_date", "status", "created_at", "booking_price"],
+            select(
+                literal(user_id),
+                prop.c.p_id,
+                literal(start_date, Date),
+                literal(end_date, Date),
+                literal(status, Booking.__table__.c.status.type),
+                literal(created_at, DateTime),
+                stay_price(prop.c.p_id, start_date, end_date),
+            ).where(~exists(overlapping)),
+        )
+        .returning(*[c.label(f"b_{c.key}") for c in loaded_columns(Booking)])
+        .cte("new_booking")
+    )
+
+    new_code = (
+        insert(AccessCode)
+        .from_select(
+            ["booking_id", "code", "valid_from", "valid_until"],
+            select(
+                new_booking.c.b_id,
+                literal(code),
+                literal(code_valid_from, DateTime),
+                literal(code_valid_until, DateTime),
+            ),
+        )
+        .returning(*[c.label(f"c_{c.key}") for c in loaded_columns(AccessCode)])
+        .cte("new_code")
+    )
+
+    return select(prop, new_booking, new_code).select_from(
+        prop.outerjoin(new_booking, true()).outerjoin(new_code, true())
+    )
+
+
+def adopt(db: AsyncSession, model, row: Dict, prefix: str):
+    """Register the ``prefix``-ed columns of ``row`` as a persistent instance.
+
+    Lets RETURNING data stand in for a follow-up SELECT. ``row`` must hold
+    every column ``model`` loads by default; a missing one would be left
+    expired and lazy loaded on access, which fails under asyncio. If the
+    session already holds the same identity, that instance is returned
+    unchanged.
+    """
+    values = {c.key: row[f"{prefix}{c.key}"] for c in loaded_columns(model)}
+    mapper = inspect(model)
+    key = mapper.identity_key_from_primary_key(
+        [values[c.key] for c in mapper.primary_key]
+    )
+    existing = db.sync_session.identity_map.get(key)
+    if existing is not None:
+        return existing
+
+    instance = model(**values)
+    make_transient_to_detached(instance)
+    db.sync_session.add(instance)
+    return instance
@@ -5,6 +5,7 @@ from app.schemas.user import User
 from sqlalchemy import select, delete
 from fastapi import HTTPException
 from app.crud.booking import get_booking
+from app.crud import archive as archive_crud
 from app.models.booking import Booking
 
 
@@ -30,8 +31,7 @@ async def create_payment(db: AsyncSession, payment_data: PaymentCreate, user: Us
 
     new_payment = Payment(**payment_data.model_dump())
     db.add(new_payment)
-    await db.commit()
-    await db.refresh(new_payment)
+    await db.flush()
 
     return new_payment
 
@@ -70,8 +70,7 @@ async def update_payment(
     for key, value in payment_data.model_dump(exclude_none=True).items():
         setattr(payment, key, value)
 
-    await db.commit()
-    await db.refresh(payment)
+    await db.flush()
 
     return payment
 
@@ -82,13 +81,17 @@ async def delete_payment(db: AsyncSession, payment_id: int, user: User):
     payment = await check_user_payment(db, payment_id, user)
 
     await db.execute(delete(Payment).filter(Payment.id == payment_id))
-    await db.commit()
 
     return payment
 
 
 async def get_user_payments(db: AsyncSession, user: User):
-    """Get all payments for the current user."""
-    query = select(Payment).join(Booking).where(Booking.user_id == user.id)
+    """Get all payments for the current user, archived ones included."""
+    query = (
+        select(Payment)
+        .join(Booking, Booking.id == Payment.booking_id)
+        .where(Booking.user_id == user.id)
+    )
     result = await db.execute(query)
-    return result.scalars().all()
\ No newline at end of file
+    payments = result.scalars().all()
+    return [*payments, *await archive_crud.get_archived_payments(db, user.id)]
\ No newline at end of file
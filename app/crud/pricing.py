@@ -0,0 +1,197 @@
+from datetime import date, datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.imports import import_off_loop
+from app.enums.pricing import PricingRuleKind
+from app.crud.booking_pipeline import overlapping_stays
+from app.models.booking import Booking
+from app.models.pricing import PriceCalendar, PricingRule
+from app.models.property import Property
+from app.partitions import add_months
+from app.pricing import DAY_LEVEL_KINDS, length_of_stay_multiplier, materialize_prices, stay_prices
+from app.schemas.pricing import PricingRuleCreate
+from app.schemas.user import User
+
+
+async def get_owned_property(db: AsyncSession, property_id: int, user: User) -> Property:
+    """Read and lock a property the user owns, for changing its pricing."""
+    # Locked, so concurrent rule changes recompute the calendar one at a time
+    # and the last one to commit sees every rule.
+    property = await db.scalar(
+        select(Property).where(Property.id == property_id).with_for_update()
+    )
+    if not property:
+        raise HTTPException(status_code=404, detail="Property not found.")
+    if property.owner_id != user.id:
+        raise HTTPException(
+            status_code=403, detail="You are not allowed to change this property's pricing."
+        )
+    return property
+
+
+async def get_pricing_rules(db: AsyncSession, property_id: int):
+    """Read the pricing rules of a property in the order they apply."""
+    result = await db.execute(
+        select(PricingRule)
+        .where(PricingRule.property_id == property_id)
+        .order_by(PricingRule.priority, PricingRule.id)
+    )
+    return result.scalars().all()
+
+
+async def create_pricing_rule(
+    db: AsyncSession, property_id: int, rule_data: PricingRuleCreate, user: User
+):
+    """Add a pricing rule to a property and recompute its price calendar."""
+    property = await get_owned_property(db, property_id, user)
+    rule = PricingRule(**rule_data.model_dump(), property_id=property_id)
+    db.add(rule)
+    await db.flush()
+    await refresh_price_calendar(db, property_id, property.price)
+    return rule
+
+
+async def delete_pricing_rule(db: AsyncSession, property_id: int, rule_id: int, user: User):
+    """Remove a pricing rule from a property and recompute its price calendar."""
+    property = await get_owned_property(db, property_id, user)
+    rule = await db.scalar(
+        select(PricingRule)
+        .where(PricingRule.id == rule_id)
+        .where(PricingRule.property_id == property_id)
+    )
+    if not rule:
+        raise HTTPException(status_code=404, detail="Pricing rule not found.")
+    await db.delete(rule)
+    await db.flush()
+    await refresh_price_calendar(db, property_id, property.price)
+    return rule
+
+
+async def refresh_price_calendar(
+    db: AsyncSession, property_id: int, base_price: float, today: date = None
+):
+    """Materialize a property's nightly prices from today for ``PRICE_CALENDAR_MONTHS``.
+
+    Properties without day-level rules get no calendar; their nights cost
+    the base price.
+    """
+    today = today or date.today()
+    rules = await get_pricing_rules(db, property_id)
+    if not any(rule.kind in DAY_LEVEL_KINDS for rule in rules):
+        await db.execute(delete(PriceCalendar).where(PriceCalendar.property_id == property_id))
+        return
+
+    days = (add_months(today, settings.PRICE_CALENDAR_MONTHS) - today).days
+    await import_off_loop("numpy")
+    prices = materialize_prices(base_price, rules, today, days).tolist()
+    values = {"start_date": today, "prices": prices, "computed_at": datetime.utcnow()}
+    await db.execute(
+        insert(PriceCalendar)
+        .values(property_id=property_id, **values)
+        .on_conflict_do_update(index_elements=[PriceCalendar.property_id], set_=values)
+    )
+
+
+async def refresh_price_calendars(db: AsyncSession, today: date) -> int:
+    """Move every calendar starting before ``today`` forward to ``today``."""
+    result = await db.execute(
+        select(PriceCalendar.property_id, Property.price)
+        .join(Property, Property.id == PriceCalendar.property_id)
+        .where(PriceCalendar.start_date < today)
+    )
+    stale = result.all()
+    for property_id, base_price in stale:
+        await refresh_price_calendar(db, property_id, base_price, today)
+    return len(stale)
+
+
+def _round_cents(value) -> Decimal:
+    """Round to cents like ``round(value::numeric, 2)`` in ``stay_price``.
+
+    The float goes through its 15 significant digits, as Postgres casts
+    ``double precision`` to ``numeric``, and halves round away from zero.
+    """
+    if not isinstance(value, Decimal):
+        value = Decimal(f"{value:.15g}")
+    return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+async def _property_prices(db: AsyncSession, property_id: int):
+    # Every caller goes on to price with NumPy.
+    await import_off_loop("numpy")
+    row = (
+        await db.execute(
+            select(Property.price, PriceCalendar.start_date, PriceCalendar.prices)
+            .outerjoin(PriceCalendar, PriceCalendar.property_id == Property.id)
+            .where(Property.id == property_id)
+        )
+    ).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Property not found.")
+    return row
+
+
+async def get_quote(db: AsyncSession, property_id: int, start_date: date, end_date: date):
+    """Price a stay the way ``create_booking`` will, without booking it."""
+    base_price, calendar_start, calendar_prices = await _property_prices(db, property_id)
+    nights = (end_date - start_date).days
+    prices = stay_prices(base_price, calendar_start, calendar_prices, start_date, end_date)
+    subtotal = _round_cents(float(prices.sum()))
+    rules = (
+        await db.execute(
+            select(PricingRule.kind, PricingRule.min_nights, PricingRule.multiplier)
+            .where(PricingRule.property_id == property_id)
+            .where(PricingRule.kind == PricingRuleKind.LENGTH_OF_STAY)
+            .where(PricingRule.min_nights <= nights)
+            .order_by(PricingRule.id)
+        )
+    ).all()
+    multiplier = length_of_stay_multiplier(rules, nights)
+    return {
+        "property_id": property_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        "nights": nights,
+        "nightly_prices": prices.tolist(),
+        "subtotal": float(subtotal),
+        "length_of_stay_multiplier": multiplier,
+        "total": float(_round_cents(subtotal * Decimal(f"{multiplier:.15g}"))),
+    }
+
+
+async def get_price_calendar(db: AsyncSession, property_id: int, start_date: date, days: int):
+    """Price and availability of each night from ``start_date``."""
+    # After _property_prices, which loads NumPy off the event loop.
+    base_price, calendar_start, calendar_prices = await _property_prices(db, property_id)
+    import numpy as np
+
+    end_date = start_date + timedelta(days=days)
+    prices = stay_prices(base_price, calendar_start, calendar_prices, start_date, end_date)
+
+    booked = np.zeros(days, dtype=bool)
+    # Longer ranges than MAX_BOOKING_NIGHTS are checked in chunks so each
+    # overlap query stays within a few booking partitions.
+    step = settings.MAX_BOOKING_NIGHTS
+    for offset in range(0, days, step):
+        chunk_start = start_date + timedelta(days=offset)
+        chunk_end = min(end_date, chunk_start + timedelta(days=step))
+        stays = await db.execute(
+            select(Booking.start_date, Booking.end_date)
+            .where(Booking.property_id == property_id)
+            .where(overlapping_stays(chunk_start, chunk_end))
+        )
+        for stay_start, stay_end in stays:
+            first = max(0, (stay_start - start_date).days)
+            last = min(days, (stay_end - start_date).days)
+            booked[first:last] = True
+
+    return [
+        {"date": start_date + timedelta(days=i), "price": price, "available": not taken}
+        for i, (price, taken) in enumerate(zip(prices.tolist(), booked.tolist()))
+    ]
@@ -1,9 +1,14 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.property import Property
+from app.models.booking import Booking
+from app.core.config import settings
+from app.core.database import run_after_commit
+from app.crud.pricing import refresh_price_calendar
+from app.response_cache import AVAILABILITY, CATALOG, property_tag, response_cache
 from app.models.user import User, Role
 from app.schemas.property import PropertyCreate, PropertyUpdate, PropertyWithAvailabilityPeriods, AvailabilityPeriod
 from app.schemas.user import User
-from sqlalchemy import select, delete
+from sqlalchemy import String, delete, func, literal, or_, select
 from fastapi import HTTPException
 from sqlalchemy.orm import selectinload
 from app.enums.booking_status import BookingStatus
@@ -11,14 +16,22 @@ from datetime import date
 from datetime import timedelta
 
 
+def invalidate_cached_property(db: AsyncSession, property_id: int):
+    """Drop the cached catalog responses showing a property once ``db`` commits."""
+    run_after_commit(
+        db,
+        lambda: response_cache.invalidate(CATALOG, AVAILABILITY, property_tag(property_id)),
+    )
+
+
 async def create_property(
     db: AsyncSession, property_data: PropertyCreate, user: User
 ):
     """Create a new property."""
     new_property = Property(**property_data.model_dump(), owner_id=user.id)
     db.add(new_property)
-    await db.commit()
-    await db.refresh(new_property)
+    await db.flush()
+    invalidate_cached_property(db, new_property.id)
 
     return new_property
 
@@ -38,11 +51,14 @@ async def update_property(
             status_code=403, detail="You are not allowed to update this property."
         )
 
+    price_changed = property_data.price is not None and property_data.price != property.price
     for key, value in property_data.model_dump(exclude_none=True).items():
         setattr(property, key, value)
 
-    await db.commit()
-    await db.refresh(property)
+    await db.flush()
+    if price_changed:
+        await refresh_price_calendar(db, property_id, property.price)
+    invalidate_cached_property(db, property_id)
 
     return property
 
@@ -61,7 +77,7 @@ async def delete_property(db: AsyncSession, property_id: int, user: User):
         )
 
     await db.execute(delete(Property).filter(Property.id == property_id))
-    await db.commit()
+    invalidate_cached_property(db, property_id)
 
     return property
 
@@ -86,13 +102,89 @@ async def get_properties(db: AsyncSession):
     return properties
 
 
+PROPERTY_LIST_FIELDS = (
+    "id",
+    "owner_id",
+    "name",
+    "description",
+    "rooms",
+    "price",
+    "location",
+)
+# lock_id holds the lock's encryption key, so only owners listing their own
+# properties get it.
+OWNER_PROPERTY_LIST_FIELDS = PROPERTY_LIST_FIELDS + ("lock_id",)
+
+
+async def get_property_list(
+    db: AsyncSession, owner_id: int = None, fields=PROPERTY_LIST_FIELDS
+):
+    """List properties as dicts of the requested ``fields``, projected in SQL."""
+    query = select(*(getattr(Property, field) for field in fields))
+    if owner_id is not None:
+        query = query.where(Property.owner_id == owner_id)
+    result = await db.execute(query)
+    return [dict(row) for row in result.mappings()]
+
+
+def _current_bookings(today: date):
+    """Criteria for bookings that have not ended by ``today``.
+
+    Bounding start_date too keeps past booking partitions out of the scan.
+    """
+    return (
+        Booking.end_date >= today,
+        Booking.start_date >= today - timedelta(days=settings.MAX_BOOKING_NIGHTS),
+    )
+
+
+async def get_property_version(db: AsyncSession, property_id: int):
+    """Return the ``updated_at`` of a property."""
+    result = await db.execute(
+        select(Property.updated_at).where(Property.id == property_id)
+    )
+    updated_at = result.scalar_one_or_none()
+
+    if updated_at is None:
+        raise HTTPException(status_code=404, detail="Property not found.")
+
+    return updated_at
+
+
+async def get_properties_version(db: AsyncSession, owner_id: int = None):
+    """Return the newest ``updated_at`` and the number of properties."""
+    query = select(func.max(Property.updated_at), func.count()).select_from(Property)
+    if owner_id is not None:
+        query = query.where(Property.owner_id == owner_id)
+    result = await db.execute(query)
+    return tuple(result.one())
+
+
+async def get_availability_version(db: AsyncSession, today: date):
+    """Return the newest ``updated_at`` and the count of properties and of current bookings.
+
+    Together with ``today`` these determine ``get_available_properties``.
+    """
+    current = _current_bookings(today)
+    result = await db.execute(
+        select(
+            select(func.max(Property.updated_at)).scalar_subquery(),
+            select(func.count()).select_from(Property).scalar_subquery(),
+            select(func.max(Booking.updated_at)).where(*current).scalar_subquery(),
+            select(func.count()).select_from(Booking).where(*current).scalar_subquery(),
+        )
+    )
+    return tuple(result.one())
+
+
 async def get_available_properties(db: AsyncSession):
     """Get all available properties along with their free time windows."""
-    # Load all properties along with their bookings
-    result = await db.execute(select(Property).options(selectinload(Property.bookings)))
+    today = date.today()
+    # Load all properties along with the bookings that have not ended yet
+    current_bookings = Property.bookings.and_(*_current_bookings(today))
+    result = await db.execute(select(Property).options(selectinload(current_bookings)))
     properties = result.scalars().all()
 
-    today = date.today()
     max_date = today + timedelta(days=365)  # Assume we are looking for availability up to a year ahead
     available_properties = []
 
@@ -142,4 +234,56 @@ async def get_properties_by_owner(db: AsyncSession, owner_id: int):
     query = select(Property).filter(Property.owner_id == owner_id)
     result = await db.execute(query)
     properties = result.scalars().all()
-    return properties
\ No newline at end of file
+    return properties
+
+
+async def get_properties_with_locks(db: AsyncSession):
+    """Get all properties that have a smart lock, with their owners."""
+    query = select(Property).where(Property.lock_id.is_not(None))
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+async def search_properties(db: AsyncSession, query: str, limit: int = 20, offset: int = 0):
+    """Search properties by keywords, best matches first.
+
+    Full-text matches on the trigger-maintained ``search_vector`` are
+    combined with trigram word similarity on the name and location, which
+    tolerates typos. Both are served by GIN indexes. Returns
+    ``(property, rank)`` rows.
+    """
+    # Applies to the <% operator for the rest of this transaction only.
+    await db.execute(
+        select(
+            func.set_config(
+                "pg_trgm.word_similarity_threshold",
+                str(settings.SEARCH_SIMILARITY_THRESHOLD),
+                True,
+            )
+        )
+    )
+
+    ts_query = func.websearch_to_tsquery("english", query)
+    text = literal(query, String)
+    similarity = func.greatest(
+        func.word_similarity(text, Property.name),
+        func.word_similarity(text, Property.location),
+    )
+    # ts_rank_cd normalization 32 scales the rank into [0, 1) like the similarity.
+    rank = (func.ts_rank_cd(Property.search_vector, ts_query, 32) + similarity).label("rank")
+
+    stmt = (
+        select(Property, rank)
+        .where(
+            or_(
+                Property.search_vector.bool_op("@@")(ts_query),
+                text.bool_op("<%")(Property.name),
+                text.bool_op("<%")(Property.location),
+            )
+        )
+        .order_by(rank.desc(), Property.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await db.execute(stmt)
+    return result.all()
@@ -22,7 +22,7 @@ async def create_user(db: AsyncSession, user: UserCreate):
     user.password = get_password_hash(user.password)
     new_user = UserModel(**user.model_dump())
     db.add(new_user)
-    await db.commit()
+    await db.flush()
     return new_user
 
 
@@ -58,7 +58,7 @@ async def update_user(
         user.password = get_password_hash(user.password)
     for key, value in user.model_dump(exclude_none=True).items():
         setattr(db_user, key, value)
-    await db.commit()
+    await db.flush()
     return db_user
 
 
@@ -160,7 +160,7 @@ async def block_user(db: AsyncSession, user_id: int):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     user.is_blocked = True
-    await db.commit()
+    await db.flush()
     return user
 
 
@@ -185,5 +185,5 @@ async def unblock_user(db: AsyncSession, user_id: int):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     user.is_blocked = False
-    await db.commit()
+    await db.flush()
     return user
@@ -1,37 +1,112 @@
+import asyncio
+import inspect
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
 from celery import Task
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
+from celery.signals import worker_process_init, worker_process_shutdown
+from loguru import logger
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.access_log_writer import access_log_writer
 from app.core.config import settings
+from app.core.database import commit, make_engine
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_engine: Optional[AsyncEngine] = None
+_session_factory = None
+
+
+def worker_loop() -> asyncio.AbstractEventLoop:
+    """Return this worker process's event loop, creating it on first use."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def worker_session_factory():
+    """Return the session factory bound to this worker process's engine.
+
+    The engine is created lazily in the worker process, after the fork, so
+    its asyncpg connections belong to the worker's event loop. It is sized
+    per process with ``CELERY_DB_POOL_SIZE`` and ``CELERY_DB_MAX_OVERFLOW``.
+    """
+    global _engine, _session_factory
+    if _engine is None:
+        _engine = make_engine(
+            str(settings.SQLALCHEMY_DATABASE_URL),
+            "celery",
+            pool_size=settings.CELERY_DB_POOL_SIZE,
+            max_overflow=settings.CELERY_DB_MAX_OVERFLOW,
+        )
+        _session_factory = sessionmaker(
+            _engine, expire_on_commit=False, class_=AsyncSession
+        )
+        access_log_writer.session_factory = _session_factory
+    return _session_factory
 
-# Replace "asyncpg" with "psycopg2" for sync connection
-sqlalchemy_url = str(settings.SQLALCHEMY_DATABASE_URL).replace("asyncpg", "psycopg2")
-engine = create_engine(sqlalchemy_url, pool_recycle=3600, pool_size=10)
 
-class DatabaseTask(Task):
-    """Abstract Celery Task that manages the database session lifecycle."""
+@worker_process_init.connect
+def _reset_worker_state(**kwargs):
+    # Never reuse a loop or connections inherited from the parent process.
+    global _loop, _engine, _session_factory
+    _loop, _engine, _session_factory = None, None, None
+
+
+@worker_process_shutdown.connect
+def _close_worker_state(**kwargs):
+    global _loop, _engine
+    if _loop is None or _loop.is_closed():
+        return
+    try:
+        _loop.run_until_complete(access_log_writer.flush())
+        if _engine is not None:
+            _loop.run_until_complete(_engine.dispose())
+    except Exception as e:
+        logger.error(f"Failed to shut down the worker database layer: {e}")
+    finally:
+        _loop.close()
+        _engine = None
+
+
+class AsyncDatabaseTask(Task):
+    """Abstract Celery Task for coroutine tasks that use the database.
+
+    The task body is an ``async def`` run to completion on the worker's
+    event loop, so it can call ``app.crud`` directly. Use ``self.session()``
+    for a unit of work: it commits (running ``run_after_commit`` callbacks)
+    when the block succeeds and rolls back otherwise. Access logs queued by
+    the task are flushed before it returns.
+    """
+
     abstract = True
 
-    def __init__(self):
-        self._session = None
-        self._fns_after_return = []
-
-    @property
-    def get_session(self):
-        if self._session is None:
-            self._session = scoped_session(
-                sessionmaker(autocommit=False, autoflush=False, bind=engine)
-            )
-        return self._session
-
-    def after_return(self, status, retval, task_id, args, kwargs, einfo):
-        if self._session is not None:
-            self._session.commit()
-            self._session.remove()
-        super().after_return(status, retval, task_id, args, kwargs, einfo)
-
-        for _fn, _args in self._fns_after_return:
-            _ = _fn(*_args) if _args else _fn()
-        self._fns_after_return = []
-
-    def add_fn_after_return(self, fn, *args):
-        self._fns_after_return.append((fn, args))
+    def __call__(self, *args, **kwargs):
+        result = super().__call__(*args, **kwargs)
+        if inspect.isawaitable(result):
+            return worker_loop().run_until_complete(self._complete(result))
+        return result
+
+    async def _complete(self, coroutine):
+        try:
+            return await coroutine
+        finally:
+            try:
+                await access_log_writer.flush()
+            except SQLAlchemyError as e:
+                # The records stay buffered and go out with the next task.
+                logger.error(f"Failed to flush access logs: {e}")
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        async with worker_session_factory()() as session:
+            try:
+                yield session
+                await commit(session)
+            except Exception:
+                await session.rollback()
+                raise
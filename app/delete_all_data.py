@@ -1,5 +1,5 @@
 from app.core.database import AsyncSession
-from app.models import User, Property, Booking, Payment, AccessCode, AccessLog
+from app.models import User, Property, Booking, Payment, AccessCode, AccessLog, PricingRule, PriceCalendar
 from app.core.database import engine
 from sqlalchemy import text
 
@@ -13,6 +13,8 @@ async def delete_all_data():
             await session.execute(Payment.__table__.delete())
             await session.execute(AccessCode.__table__.delete())
             await session.execute(AccessLog.__table__.delete())
+            await session.execute(PricingRule.__table__.delete())
+            await session.execute(PriceCalendar.__table__.delete())
             await session.execute(text("SET session_replication_role = 'origin'"))
             await session.execute(text("ALTER SEQUENCE users_id_seq RESTART WITH 1"))
             await session.execute(text("ALTER SEQUENCE properties_id_seq RESTART WITH 1"))
@@ -20,6 +22,7 @@ async def delete_all_data():
             await session.execute(text("ALTER SEQUENCE payments_id_seq RESTART WITH 1"))
             await session.execute(text("ALTER SEQUENCE access_codes_id_seq RESTART WITH 1"))
             await session.execute(text("ALTER SEQUENCE access_logs_id_seq RESTART WITH 1"))
+            await session.execute(text("ALTER SEQUENCE pricing_rules_id_seq RESTART WITH 1"))
             await session.commit()
     finally:
         await session.close()
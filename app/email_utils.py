@@ -44,7 +44,7 @@ def send_email(email_to: str, subject: str, body: str, attachment_path: str = No
             server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
             server.sendmail(settings.MAIL_USERNAME, email_to, msg.as_string())
     except Exception as e:
-        print(f"Failed to send email: {e}")
+        logger.error(f"Failed to send email to {email_to}: {e}")
 
 
 @celery_app.task(name="send_email_task")
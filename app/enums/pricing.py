@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class PricingRuleKind(str, Enum):
+    # Dates from start_date up to end_date: a nightly price or a multiplier.
+    SEASON = "season"
+    # Nights on the given weekdays (0 is Monday): a multiplier.
+    WEEKDAY = "weekday"
+    # Whole stays of at least min_nights: a multiplier of the stay's total.
+    LENGTH_OF_STAY = "length_of_stay"
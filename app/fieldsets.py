@@ -0,0 +1,43 @@
+from typing import Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Query
+
+
+def parse_fieldset(
+    value: Optional[str],
+    allowed: Sequence[str],
+    required: Sequence[str] = (),
+    name: str = "fields",
+) -> Tuple[str, ...]:
+    """Parse a comma separated ``?fields=`` or ``?expand=`` value.
+
+    ``None`` selects everything in ``allowed``. Names in ``required`` are
+    always included. The result keeps the order of ``allowed``.
+    """
+    if value is None:
+        return tuple(allowed)
+    requested = {part.strip() for part in value.split(",") if part.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {name}: {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(allowed)}.",
+        )
+    requested.update(required)
+    return tuple(field for field in allowed if field in requested)
+
+
+def fieldset(allowed: Sequence[str], required: Sequence[str] = (), name: str = "fields"):
+    """Dependency parsing the ``name`` query parameter with ``parse_fieldset``."""
+
+    def dependency(
+        value: Optional[str] = Query(
+            None,
+            alias=name,
+            description=f"Comma separated subset of: {', '.join(allowed)}. Defaults to all.",
+        ),
+    ) -> Tuple[str, ...]:
+        return parse_fieldset(value, allowed, required, name)
+
+    return dependency
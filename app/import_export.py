@@ -2,20 +2,24 @@ import csv
 from sqlalchemy.orm import Session
 from sqlalchemy import select, text
 from app.models import User, Property, Booking, Payment, AccessCode
+from app.models import ArchivedAccessCode, ArchivedBooking, ArchivedPayment
 from app.schemas import (
     UserFull as UserSchema,
-    Property as PropertySchema,
+    PropertyFull as PropertySchema,
     Booking as BookingSchema,
     Payment as PaymentSchema,
     # AccessLog as AccessLogSchema,
     AccessCode as AccessCodeSchema,
 )
 from io import BytesIO
-import pandas as pd
 import os
 from enum import Enum
 from datetime import datetime
+from fastapi import HTTPException
+from app.core.config import settings
+from app.core.imports import import_off_loop
 from app.email_utils import send_email_task
+from app.response_cache import AVAILABILITY, CATALOG, property_tag, response_cache
 
 def get_data():
     """Get models and schemas for data import/export."""
@@ -24,6 +28,13 @@ def get_data():
     return models, schemas
 
 
+def get_archived_data():
+    """Get archive models and schemas for data export."""
+    models = [ArchivedBooking, ArchivedPayment, ArchivedAccessCode]
+    schemas = [BookingSchema, PaymentSchema, AccessCodeSchema]
+    return models, schemas
+
+
 async def reset_sequence(db: Session, table_name: str):
     """Reset the sequence for a table."""
     query = text(f"""
@@ -34,13 +45,40 @@ async def reset_sequence(db: Session, table_name: str):
     await db.commit()
 
 
+def validate_booking_lengths(df):
+    """Reject imported bookings longer than ``MAX_BOOKING_NIGHTS``.
+
+    Availability checks would not see them (see ``overlapping_stays``), and
+    the database refuses them, so the whole file is rejected up front.
+    """
+    import pandas as pd  # already loaded by import_data
+
+    nights = (pd.to_datetime(df["end_date"]) - pd.to_datetime(df["start_date"])).dt.days
+    too_long = df.loc[nights > settings.MAX_BOOKING_NIGHTS, "id"].tolist()
+    if too_long:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Bookings can be at most {settings.MAX_BOOKING_NIGHTS} nights long; "
+                f"longer bookings in the file: {too_long[:20]}"
+            ),
+        )
+
+
 async def import_data(file, db: Session):
     """Import data from an Excel file."""
     # Read the contents of the uploaded file
     contents = await file.read()
+    # Heavy, only needed here and in export_data; imported off the event loop.
+    await import_off_loop("pandas", "openpyxl")
+    import pandas as pd
+
     # Load the Excel file into a dictionary of DataFrames
     sheets = pd.read_excel(BytesIO(contents), sheet_name=None)
     
+    if "Booking" in sheets:
+        validate_booking_lengths(sheets["Booking"])
+
     # Get the models and schemas for data import
     models, schemas = get_data()
 
@@ -53,7 +91,9 @@ async def import_data(file, db: Session):
             for _, row in df.iterrows():
                 data = row.to_dict()
                 record_id = data.get("id")
-                existing_record = await db.get(model, record_id)
+                # Not db.get(): bookings are keyed by (id, start_date).
+                result = await db.execute(select(model).where(model.id == record_id))
+                existing_record = result.scalar_one_or_none()
                 if existing_record:
                     # Update the existing record
                     updated_record = schema(**data)
@@ -69,13 +109,26 @@ async def import_data(file, db: Session):
     for model in models:
         await reset_sequence(db, model.__tablename__)
 
+    # Imported rows bypass app.crud, so drop the cached catalog here
+    tags = [CATALOG, AVAILABILITY]
+    if "Property" in sheets:
+        tags += [property_tag(id) for id in sheets["Property"]["id"].dropna().astype(int)]
+    await response_cache.invalidate(*tags)
+
 async def export_data(db: Session, user_email: str):
     """Export data to an Excel file and send via email."""
+    # Heavy, only needed here and in import_data; imported off the event loop.
+    await import_off_loop("pandas", "xlsxwriter")
+    import pandas as pd
+
     # Create a BytesIO object to hold the Excel file
+
     output = BytesIO()
     writer = pd.ExcelWriter(output, engine="xlsxwriter")
-    # Get the models and schemas for data export
+    # Get the models and schemas for data export, archived history included
     models, schemas = get_data()
+    archived_models, archived_schemas = get_archived_data()
+    models, schemas = models + archived_models, schemas + archived_schemas
     # Iterate over each model and schema
     for model, schema in zip(models, schemas):
         records = await db.execute(select(model))
@@ -28,6 +28,7 @@ async def init_db(session: AsyncSession):
                 role=Role.ADMIN,
             )
             await user_crud.create_user(session, user_data)
+            await session.commit()
     except Exception as e:
         logger.error(f"Error during database initialization: {e}")
         raise
@@ -1,51 +1,286 @@
 import asyncio
 import json
-from cryptography.fernet import Fernet
-from azure.iot.device import Message
-from azure.iot.hub import IoTHubRegistryManager
-from azure.iot.hub.models import CloudToDeviceMethod, CloudToDeviceMethodResult
+from abc import ABC, abstractmethod
+import math
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from app.core.config import settings
+from app.circuit_breaker import circuit_breakers
+from app.core.metrics import timed
 import uuid
 
 
-class SmartLock:
-    _registry_manager = None
+class LockTransportError(Exception):
+    """Raised when a command could not be delivered to a smart lock."""
 
-    def __init__(self, device_id, encryption_key):
-        self.device_id = device_id
-        self.encryption_key = encryption_key
-        self.cipher = Fernet(encryption_key)
+
+class DeviceUnavailableError(LockTransportError):
+    """Raised when the hub is reachable but the lock is offline or timed out."""
+
+
+@dataclass
+class LockResponse:
+    status: int
+    payload: dict = field(default_factory=dict)
+
+
+class LockTransport(ABC):
+    """Delivers a device method call to a smart lock and returns its response.
+
+    The returned object exposes ``status`` and ``payload`` like the IoT Hub
+    ``CloudToDeviceMethodResult``. ``timeout`` is the latency budget in
+    seconds; a lock that does not answer in time raises
+    ``DeviceUnavailableError``.
+    """
+
+    @abstractmethod
+    def invoke(self, device_id: str, method_name: str, payload: dict, timeout: float):
+        ...
+
+
+class AzureIoTHubTransport(LockTransport):
+    """Invokes device methods through the Azure IoT Hub registry manager.
+
+    The Azure SDKs are imported on first use, so workers running with the
+    simulated transport never load them.
+    """
+
+    _registry_manager = None
 
     def get_registry_url(self):
         return f"HostName={settings.IOTHUB_HOST};SharedAccessKeyName={settings.REGISTRY_SHARED_ACCESS_KEY_NAME};SharedAccessKey={settings.REGISTRY_SHARED_ACCESS_KEY}"
 
     def registry_manager(self):
         if self._registry_manager is None:
+            from azure.iot.hub import IoTHubRegistryManager
+
             self._registry_manager = IoTHubRegistryManager.from_connection_string(
                 self.get_registry_url()
             )
         return self._registry_manager
 
-    def send_command(self, command):
-        registry_manager = self.registry_manager()
-        encrypted_command = self.cipher.encrypt(command.encode())
-        msg = Message(json.dumps({"command": encrypted_command.decode()}))
+    def invoke(self, device_id: str, method_name: str, payload: dict, timeout: float):
+        from azure.iot.device import Message
+        from azure.iot.hub.models import CloudToDeviceMethod
+
+        msg = Message(json.dumps(payload))
         msg.message_id = uuid.uuid4()
         msg.content_encoding = "utf-8"
         msg.content_type = "application/json"
-        device_method = CloudToDeviceMethod(method_name=command, payload=msg)
-        response = registry_manager.invoke_device_method(self.device_id, device_method)
+        device_method = CloudToDeviceMethod(
+            method_name=method_name,
+            payload=msg,
+            response_timeout_in_seconds=max(5, int(timeout)),
+            connect_timeout_in_seconds=max(5, int(timeout)),
+        )
+        try:
+            return self.registry_manager().invoke_device_method(device_id, device_method)
+        except Exception as e:
+            # The hub answers 404 for offline devices and 504 for device timeouts.
+            status_code = getattr(getattr(e, "response", None), "status_code", None)
+            if status_code in (404, 504):
+                raise DeviceUnavailableError(str(e)) from e
+            raise LockTransportError(str(e)) from e
+
+
+class SimulatedLockTransport(LockTransport):
+    """In-process stand-in for the IoT Hub and the locks behind it.
+
+    Every call sleeps for a normally distributed latency and fails with
+    ``failure_rate`` probability. Each simulated lock keeps its lock state and
+    a temperature series (a slow sine wave with noise and occasional spikes),
+    so ``get_temperature_stats`` reports anomalies the way real locks do.
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 20.0,
+        jitter_ms: float = 5.0,
+        failure_rate: float = 0.0,
+        base_temperature: float = 21.0,
+        temperature_amplitude: float = 2.0,
+        anomaly_rate: float = 0.02,
+        history_size: int = 50,
+        seed: int = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self.base_temperature = base_temperature
+        self.temperature_amplitude = temperature_amplitude
+        self.anomaly_rate = anomaly_rate
+        self.history_size = history_size
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._locked = {}
+        self._temperatures = {}
+        self.calls = 0
+
+    def _next_temperature(self, device_id: str) -> float:
+        history = self._temperatures.setdefault(
+            device_id, deque(maxlen=self.history_size)
+        )
+        step = len(history) + self.calls
+        value = self.base_temperature + self.temperature_amplitude * math.sin(
+            2 * math.pi * step / 288
+        )
+        value += self._random.gauss(0, 0.3)
+        if self._random.random() < self.anomaly_rate:
+            value += self._random.choice([-1, 1]) * self._random.uniform(8, 15)
+        history.append(value)
+        return value
+
+    def _handle(self, device_id: str, method_name: str) -> LockResponse:
+        if method_name == "open_lock":
+            self._locked[device_id] = False
+            return LockResponse(200, {"locked": False})
+        if method_name == "close_lock":
+            self._locked[device_id] = True
+            return LockResponse(200, {"locked": True})
+        if method_name == "get_temperature":
+            return LockResponse(200, {"temperature": self._next_temperature(device_id)})
+        if method_name == "get_temperature_stats":
+            history = list(self._temperatures.get(device_id) or [self._next_temperature(device_id)])
+            mean = sum(history) / len(history)
+            anomalies = [t for t in history if abs(t - mean) > 5]
+            return LockResponse(
+                200,
+                {
+                    "mean": mean,
+                    "min": min(history),
+                    "max": max(history),
+                    "anomalies": anomalies,
+                },
+            )
+        return LockResponse(404, {"error": f"Unknown method {method_name}"})
+
+    def invoke(self, device_id: str, method_name: str, payload: dict, timeout: float):
+        with self._lock:
+            self.calls += 1
+            latency = max(0.0, self._random.gauss(self.latency_ms, self.jitter_ms))
+            failed = self._random.random() < self.failure_rate
+        if latency / 1000 > timeout:
+            time.sleep(timeout)
+            raise DeviceUnavailableError(f"Simulated device {device_id} timed out")
+        time.sleep(latency / 1000)
+        if failed:
+            raise LockTransportError(f"Simulated hub failure for device {device_id}")
+        with self._lock:
+            return self._handle(device_id, method_name)
+
+
+_transport = None
+_executor = None
+
+
+def lock_executor() -> ThreadPoolExecutor:
+    """Return the thread pool running blocking hub calls for this process.
+
+    Hub calls get ``IOT_EXECUTOR_THREADS`` threads of their own rather than
+    the loop's default executor, which is sized by CPU count and shared with
+    everything else run through ``asyncio.to_thread``.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IOT_EXECUTOR_THREADS, thread_name_prefix="lock-command"
+        )
+    return _executor
+
+
+def get_transport() -> LockTransport:
+    """Return the lock transport selected by ``settings.LOCK_TRANSPORT``."""
+    global _transport
+    if _transport is None:
+        if settings.LOCK_TRANSPORT == "simulator":
+            _transport = SimulatedLockTransport(
+                latency_ms=settings.LOCK_SIMULATOR_LATENCY_MS,
+                failure_rate=settings.LOCK_SIMULATOR_FAILURE_RATE,
+            )
+        else:
+            _transport = AzureIoTHubTransport()
+    return _transport
+
+
+class SmartLock:
+    def __init__(self, device_id, encryption_key, transport: LockTransport = None):
+        self.device_id = device_id
+        self.encryption_key = encryption_key
+        from cryptography.fernet import Fernet
+
+        self.cipher = Fernet(encryption_key)
+        self.transport = transport or get_transport()
+
+    @classmethod
+    def from_lock_id(cls, lock_id: str, transport: LockTransport = None):
+        """Build a lock from a ``<device_id>:<encryption_key>`` lock ID."""
+        device_id, encryption_key = lock_id.split(":", 1)
+        return cls(device_id, encryption_key.encode(), transport)
+
+    def send_command(self, command):
+        """Send a command through the hub and device circuit breakers.
+
+        Raises ``CircuitOpenError`` without contacting the hub while either
+        breaker is open.
+        """
+        # Before the breakers are reserved, so a bad key cannot leave a
+        # half-open breaker waiting for its probe forever.
+        encrypted_command = self.cipher.encrypt(command.encode())
+        hub_breaker = circuit_breakers.get("hub")
+        device_breaker = circuit_breakers.get(f"device:{self.device_id}")
+        device_breaker.before_call()
+        try:
+            hub_breaker.before_call()
+        except Exception:
+            device_breaker.release()
+            raise
+
+        start = time.perf_counter()
+        try:
+            with timed("iot_hub_invoke"):
+                response = self.transport.invoke(
+                    self.device_id,
+                    command,
+                    {"command": encrypted_command.decode()},
+                    settings.IOT_COMMAND_TIMEOUT_SECONDS,
+                )
+        except DeviceUnavailableError:
+            duration = time.perf_counter() - start
+            # The hub did its job; only the device is degraded.
+            hub_breaker.record(True, duration)
+            device_breaker.record(False, duration)
+            raise
+        except Exception:
+            duration = time.perf_counter() - start
+            hub_breaker.record(False, duration)
+            device_breaker.record(False, duration)
+            raise
+        duration = time.perf_counter() - start
+        hub_breaker.record(True, duration)
+        device_breaker.record(response.status < 500, duration)
         return response
 
+    async def asend_command(self, command):
+        """Send a command on ``lock_executor`` without blocking the event loop.
+
+        Returns only once the hub call has finished, so a caller holding the
+        device's ``lock_command_queue`` slot keeps it until then. The hub call
+        itself is bounded by ``IOT_COMMAND_TIMEOUT_SECONDS``; callers that must
+        answer sooner wait on the queue with a timeout instead.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(lock_executor(), self.send_command, command)
+
 
 if __name__ == "__main__":
     # Використання класу
     lock_id = "5bb6e258:KPH2GIA1nFNTXAsr37/moDk604dm1jJQHr4nC59B4Bk="
 
-    device_id = lock_id.split(":")[0]
-    encryption_key = lock_id.split(":")[1].encode()
-
-    smart_lock = SmartLock(device_id, encryption_key)
+    smart_lock = SmartLock.from_lock_id(lock_id)
     smart_lock.send_command("open_lock")  # Відкрити замок
     smart_lock.send_command("close_lock")  # Закрити замок
     smart_lock.send_command("get_temperature")  # Отримати температуру
@@ -21,9 +21,14 @@ async def load_json_data(file_path: str):
 async def seed_users(db: AsyncSession, users_data):
     """Seed the User table with data from JSON."""
     try:
+        # bcrypt is slow on purpose; test users mostly share a password.
+        hashes = {}
         users = []
         for user in users_data:
-            user["password"] = get_password_hash(user["password"])
+            password = user["password"]
+            if password not in hashes:
+                hashes[password] = get_password_hash(password)
+            user["password"] = hashes[password]
             users.append(User(**user))
         db.add_all(users)
         await db.commit()
@@ -0,0 +1,141 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.config import settings
+
+
+class _QueuedCommand:
+    def __init__(self, command: str, task: asyncio.Task, started: asyncio.Future):
+        self.command = command
+        self.task = task
+        # Resolves to the monotonic time the command left the queue.
+        self.started = started
+        self.finished_at: Optional[float] = None
+        task.add_done_callback(self._finished)
+
+    def _finished(self, task: asyncio.Task):
+        self.finished_at = time.monotonic()
+        if not self.started.done():
+            # Cancelled while still queued.
+            self.started.set_result(self.finished_at)
+        if not task.cancelled():
+            # Mark the exception as retrieved; callers re-raise it themselves.
+            task.exception()
+
+    def can_share(self, command: str, window: float) -> bool:
+        if command != self.command:
+            return False
+        if not self.task.done():
+            return True
+        if self.task.cancelled() or self.task.exception() is not None:
+            return False
+        return time.monotonic() - self.finished_at <= window
+
+
+def _report(task: asyncio.Task, on_result: Callable[[Any], None]):
+    if not task.cancelled() and task.exception() is None:
+        on_result(task.result())
+
+
+class _DeviceQueue:
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.latest: Optional[_QueuedCommand] = None
+        self.pending = 0
+
+
+class LockCommandQueue:
+    """Serialize smart lock commands per device and coalesce repeats.
+
+    Commands for one device run one at a time in the order they were
+    submitted. A command identical to the most recent one for the same
+    device, while that one is still queued, in flight, or finished less than
+    ``coalesce_window`` seconds ago, is not sent again; the caller gets the
+    shared result instead. Only the latest command is considered, so
+    ``open, close, open`` still sends three commands.
+
+    A caller's ``timeout`` only counts from when the command leaves the
+    queue, and a caller that gives up does not stop it: a command that was
+    queued is sent, and ``on_result`` still runs with its response.
+
+    State is kept per event loop, since the Celery worker runs tasks on a
+    loop of its own, and dropped with the loop once it is closed. A device's
+    state is dropped once its queue has drained and the coalesce window has
+    passed.
+    """
+
+    def __init__(self, coalesce_window: float = settings.LOCK_COMMAND_COALESCE_SECONDS):
+        self.coalesce_window = coalesce_window
+        self._devices: Dict[asyncio.AbstractEventLoop, Dict[str, _DeviceQueue]] = {}
+
+    async def _run(
+        self, queue: _DeviceQueue, started: asyncio.Future, send: Callable[[], Awaitable]
+    ):
+        async with queue.lock:
+            started.set_result(time.monotonic())
+            return await send()
+
+    def _finished(self, devices: Dict[str, _DeviceQueue], device_id: str, queue: _DeviceQueue):
+        queue.pending -= 1
+        if not queue.pending:
+            asyncio.get_running_loop().call_later(
+                self.coalesce_window, self._prune, devices, device_id, queue
+            )
+
+    def _prune(self, devices: Dict[str, _DeviceQueue], device_id: str, queue: _DeviceQueue):
+        if devices.get(device_id) is not queue or queue.pending:
+            # Replaced, or busy again; the next command to finish prunes it.
+            return
+        finished_at = queue.latest.finished_at if queue.latest else None
+        remaining = (
+            self.coalesce_window
+            if finished_at is None
+            else finished_at + self.coalesce_window - time.monotonic()
+        )
+        if remaining > 0:
+            asyncio.get_running_loop().call_later(
+                remaining, self._prune, devices, device_id, queue
+            )
+            return
+        del devices[device_id]
+
+    async def submit(
+        self,
+        device_id: str,
+        command: str,
+        send: Callable[[], Awaitable],
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[Any], None]] = None,
+    ):
+        """Queue ``send`` for ``device_id`` unless ``command`` can share a result.
+
+        Raises ``asyncio.TimeoutError`` when the command has been sending for
+        ``timeout`` seconds without finishing. ``on_result`` is called with
+        the result once the command succeeds, even if the caller stopped
+        waiting for it.
+        """
+        for loop in [loop for loop in self._devices if loop.is_closed()]:
+            del self._devices[loop]
+        devices = self._devices.setdefault(asyncio.get_running_loop(), {})
+        queue = devices.setdefault(device_id, _DeviceQueue())
+        latest = queue.latest
+        if latest is None or not latest.can_share(command, self.coalesce_window):
+            # The command runs in its own task so a disconnecting client does
+            # not cancel it for the other callers sharing its result.
+            started = asyncio.get_running_loop().create_future()
+            task = asyncio.ensure_future(self._run(queue, started, send))
+            queue.pending += 1
+            task.add_done_callback(lambda _: self._finished(devices, device_id, queue))
+            latest = _QueuedCommand(command, task, started)
+            queue.latest = latest
+        if on_result is not None:
+            latest.task.add_done_callback(lambda task: _report(task, on_result))
+        if timeout is None:
+            return await asyncio.shield(latest.task)
+        started_at = await asyncio.shield(latest.started)
+        remaining = started_at + timeout - time.monotonic()
+        return await asyncio.wait_for(asyncio.shield(latest.task), max(remaining, 0))
+
+
+lock_command_queue = LockCommandQueue()
@@ -1,10 +1,43 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from loguru import logger
+from redis.exceptions import RedisError
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from app.routers import user, login, property, booking, payment, exchange, access_code
+from app.routers import user, login, property, pricing, booking, payment, exchange, access_code, health
 from app.email_utils import send_email_task
+from app.access_log_writer import access_log_writer
+from app.access_code_cache import access_code_cache
+from app.core.database import engine, replica_engine, warm_up_pool
+from app.core.metrics import RequestMetricsMiddleware, metrics_response
+from app.core.redis import redis_client
+from app.profiling import ProfilingMiddleware
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs in every worker process, after the fork when the app is preloaded.
+    await warm_up_pool(engine)
+    if replica_engine is not None:
+        await warm_up_pool(replica_engine)
+    try:
+        await redis_client.ping()
+    except RedisError as e:
+        logger.warning(f"Redis warm-up failed: {e}")
+    access_log_writer.start()
+    access_code_cache.start()
+    yield
+    health.readiness.draining = True
+    await access_code_cache.stop()
+    await access_log_writer.stop()
+    await redis_client.aclose()
+    await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -14,14 +47,20 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so it is outermost and times the whole request.
+app.add_middleware(RequestMetricsMiddleware)
+# Outermost, so its admin check is not counted as a query of the request.
+app.add_middleware(ProfilingMiddleware)
 
 app.include_router(user.router)
 app.include_router(login.router)
 app.include_router(property.router)
+app.include_router(pricing.router)
 app.include_router(booking.router)
 app.include_router(payment.router)
 app.include_router(exchange.router)
 app.include_router(access_code.router)
+app.include_router(health.router)
 
 
 @app.get("/")
@@ -29,5 +68,10 @@ def read_root():
     return {"message": "Welcome to Smart Booking API"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
+
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
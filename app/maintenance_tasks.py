@@ -0,0 +1,85 @@
+from datetime import date
+from loguru import logger
+from .celery_app import celery_app
+from .database_task import AsyncDatabaseTask
+from app.core.config import settings
+from app.crud import archive as archive_crud
+from app.crud import pricing as pricing_crud
+from app.partitions import (
+    add_months,
+    delete_expired_default_rows,
+    drop_expired_partitions,
+    ensure_monthly_partitions,
+)
+
+
+@celery_app.task(name="maintain_access_log_partitions_task", bind=True, base=AsyncDatabaseTask)
+async def maintain_access_log_partitions_task(self):
+    """Create upcoming access log partitions and drop the expired ones.
+
+    Expired rows in the default partition are deleted as well.
+    """
+    today = date.today()
+
+    async with self.session() as db:
+        cutoff = add_months(today, -settings.ACCESS_LOG_RETENTION_MONTHS)
+        # Expired rows go first so they are not moved into partitions just to be dropped.
+        deleted = await delete_expired_default_rows(db, "access_logs", "accessed_at", cutoff)
+        await ensure_monthly_partitions(
+            db, "access_logs", "accessed_at", today, settings.ACCESS_LOG_PARTITIONS_AHEAD
+        )
+        dropped = await drop_expired_partitions(db, "access_logs", cutoff)
+
+    logger.info(
+        f"Dropped expired access log partitions: {dropped}, "
+        f"deleted {deleted} expired rows from access_logs_default"
+    )
+    return dropped
+
+
+@celery_app.task(name="maintain_booking_partitions_task", bind=True, base=AsyncDatabaseTask)
+async def maintain_booking_partitions_task(self):
+    """Create the booking partitions for the upcoming months.
+
+    Old partitions are never dropped; bookings leave them through the archive.
+    """
+    async with self.session() as db:
+        await ensure_monthly_partitions(
+            db, "bookings", "start_date", date.today(), settings.BOOKING_PARTITIONS_AHEAD
+        )
+
+
+@celery_app.task(name="archive_bookings_task", bind=True, base=AsyncDatabaseTask)
+async def archive_bookings_task(self):
+    """Move bookings ended ``ARCHIVE_AFTER_MONTHS`` ago to the archive tables.
+
+    Each batch is its own transaction, so locks stay short and an
+    interrupted run keeps the batches already moved.
+    """
+    cutoff = add_months(date.today(), -settings.ARCHIVE_AFTER_MONTHS)
+    totals = [0, 0, 0]
+    while True:
+        async with self.session() as db:
+            moved = await archive_crud.archive_bookings(
+                db, cutoff, settings.ARCHIVE_BATCH_SIZE
+            )
+        totals = [total + count for total, count in zip(totals, moved)]
+        if moved[0] == 0:
+            break
+
+    bookings, payments, access_codes = totals
+    logger.info(
+        f"Archived {bookings} bookings, {payments} payments and "
+        f"{access_codes} access codes ended before {cutoff}"
+    )
+    return {"bookings": bookings, "payments": payments, "access_codes": access_codes}
+
+
+@celery_app.task(name="refresh_price_calendars_task", bind=True, base=AsyncDatabaseTask)
+async def refresh_price_calendars_task(self):
+    """Roll the price calendars forward so they start today."""
+    async with self.session() as db:
+        refreshed = await pricing_crud.refresh_price_calendars(db, date.today())
+
+    logger.info(f"Refreshed {refreshed} price calendars")
+    return refreshed
@@ -4,6 +4,8 @@ from app.models.booking import Booking
 from app.models.access_code import AccessCode
 from app.models.access_log import AccessLog
 from app.models.payment import Payment
+from app.models.archive import ArchivedAccessCode, ArchivedBooking, ArchivedPayment
+from app.models.pricing import PriceCalendar, PricingRule
 
 __all__ = [
     "User",
@@ -12,4 +14,9 @@ __all__ = [
     "AccessCode",
     "AccessLog",
     "Payment",
+    "ArchivedBooking",
+    "ArchivedPayment",
+    "ArchivedAccessCode",
+    "PricingRule",
+    "PriceCalendar",
 ]
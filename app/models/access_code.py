@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime
 from app.core.database import Base
 from sqlalchemy.orm import relationship
 
@@ -7,9 +7,9 @@ class AccessCode(Base):
     __tablename__ = "access_codes"
 
     id = Column(Integer, primary_key=True, index=True)
-    booking_id = Column(
-        Integer, ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False
-    )
+    # References bookings.id, deleted with the booking; enforced by a
+    # trigger since bookings is partitioned.
+    booking_id = Column(Integer, nullable=False, index=True)
     code = Column(String, nullable=False, unique=True)
     valid_from = Column(DateTime, nullable=False)
     valid_until = Column(DateTime, nullable=False)
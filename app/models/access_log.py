@@ -1,17 +1,28 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, Index, Integer, String
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 
 class AccessLog(Base):
     __tablename__ = "access_logs"
+    __table_args__ = (
+        Index(
+            "ix_access_logs_access_code_id_accessed_at",
+            "access_code_id",
+            "accessed_at",
+        ),
+        {"postgresql_partition_by": "RANGE (accessed_at)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    access_code_id = Column(Integer, ForeignKey("access_codes.id", ondelete="CASCADE"), nullable=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    # No foreign key: logs outlive their access code once it is deleted or
+    # moved to archived_access_codes.
+    access_code_id = Column(Integer, nullable=True)
     command = Column(String, nullable=False)
     response_status = Column(String, nullable=False)
     response_message = Column(String, nullable=True)
-    accessed_at = Column(DateTime, default=datetime.utcnow)
+    # Part of the primary key because the table is range partitioned on it.
+    accessed_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
 
     # access_code = relationship("AccessCode", back_populates="logs")
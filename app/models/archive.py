@@ -0,0 +1,58 @@
+from datetime import datetime
+from sqlalchemy import Column, Date, DateTime, Enum, Float, ForeignKey, Integer, String, func
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+from app.enums.booking_status import BookingStatus
+from app.enums.payment import PaymentStatus
+
+
+class ArchivedBooking(Base):
+    """A booking that ended long ago, moved out of ``bookings`` with its ID."""
+
+    __tablename__ = "archived_bookings"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    property_id = Column(Integer, ForeignKey("properties.id"), nullable=False, index=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    status = Column(Enum(BookingStatus), default=BookingStatus.PENDING)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    booking_price = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    property = relationship("Property", lazy="selectin")
+    user = relationship("User", lazy="selectin")
+    payment = relationship("ArchivedPayment", back_populates="booking", uselist=False)
+
+
+class ArchivedPayment(Base):
+    __tablename__ = "archived_payments"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    booking_id = Column(
+        Integer, ForeignKey("archived_bookings.id"), nullable=False, index=True
+    )
+    amount = Column(Float, nullable=False)
+    status = Column(Enum(PaymentStatus), nullable=False, default=PaymentStatus.PENDING)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
+
+    booking = relationship("ArchivedBooking", back_populates="payment")
+
+
+class ArchivedAccessCode(Base):
+    __tablename__ = "archived_access_codes"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    booking_id = Column(
+        Integer,
+        ForeignKey("archived_bookings.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    code = Column(String, nullable=False)
+    valid_from = Column(DateTime, nullable=False)
+    valid_until = Column(DateTime, nullable=False)
+    archived_at = Column(DateTime, nullable=False, server_default=func.now())
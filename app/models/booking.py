@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Enum, Float, String, Text
+from sqlalchemy import CheckConstraint, Column, Date, DateTime, ForeignKey, Index, Integer, Enum, Float, String, Text, text
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.enums.booking_status import BookingStatus
@@ -7,16 +7,41 @@ from app.enums.booking_status import BookingStatus
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Availability checks filter on the property and the date range.
+        Index("ix_bookings_property_id_start_date", "property_id", "start_date"),
+        Index("ix_bookings_updated_at", "updated_at"),
+        # Overlap checks only look MAX_BOOKING_NIGHTS back, see
+        # app.crud.booking_pipeline.overlapping_stays.
+        CheckConstraint("end_date - start_date <= 90", name="ck_bookings_max_nights"),
+        # Monthly partitions by stay date, see app.partitions.
+        {"postgresql_partition_by": "RANGE (start_date)"},
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    # Only the sequence keeps ids unique: a partitioned table's unique keys
+    # must include the partition column.
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     property_id = Column(Integer, ForeignKey("properties.id"), nullable=False)
-    start_date = Column(Date, nullable=False)
+    start_date = Column(Date, primary_key=True)
     end_date = Column(Date, nullable=False)
     status = Column(Enum(BookingStatus), default=BookingStatus.PENDING)
     created_at = Column(DateTime, default=datetime.utcnow)
     booking_price = Column(Float, nullable=False)
+    # Last write time, for conditional GETs (see app.core.conditional).
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=text("(now() at time zone 'utc')"),
+    )
 
     property = relationship("Property", back_populates="bookings", lazy="selectin")
     user = relationship("User", back_populates="bookings", lazy="selectin")
-    payment = relationship("Payment", back_populates="booking", uselist=False)
+    payment = relationship(
+        "Payment",
+        primaryjoin="Booking.id == foreign(Payment.booking_id)",
+        back_populates="booking",
+        uselist=False,
+    )
@@ -0,0 +1,43 @@
+from sqlalchemy import ARRAY, Column, Date, DateTime, Enum, Float, ForeignKey, Integer
+from app.core.database import Base
+from app.enums.pricing import PricingRuleKind
+from datetime import datetime
+
+
+class PricingRule(Base):
+    """An adjustment of a property's nightly ``price``, see ``app.pricing``."""
+
+    __tablename__ = "pricing_rules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    property_id = Column(
+        Integer, ForeignKey("properties.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    kind = Column(Enum(PricingRuleKind), nullable=False)
+    # Rules apply in ascending priority; later ones override or compound.
+    priority = Column(Integer, nullable=False, default=0)
+    start_date = Column(Date)
+    end_date = Column(Date)
+    weekdays = Column(ARRAY(Integer))
+    min_nights = Column(Integer)
+    multiplier = Column(Float)
+    nightly_price = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class PriceCalendar(Base):
+    """A property's nightly prices from ``start_date``, materialized from its rules.
+
+    ``prices[i]`` is the price of the night starting ``start_date + i`` days.
+    Only properties with day-level rules have one; other nights cost the
+    property's ``price``.
+    """
+
+    __tablename__ = "price_calendars"
+
+    property_id = Column(
+        Integer, ForeignKey("properties.id", ondelete="CASCADE"), primary_key=True
+    )
+    start_date = Column(Date, nullable=False)
+    prices = Column(ARRAY(Float), nullable=False)
+    computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,14 +1,32 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, Text, DateTime
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, Text, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from app.core.database import Base
 from datetime import datetime
 
 
 class Property(Base):
     __tablename__ = "properties"
+    __table_args__ = (
+        # Full-text and typo tolerant search, see app.crud.property.search_properties.
+        Index("ix_properties_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_properties_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_properties_location_trgm",
+            "location",
+            postgresql_using="gin",
+            postgresql_ops={"location": "gin_trgm_ops"},
+        ),
+        Index("ix_properties_updated_at", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     description = Column(Text)
     rooms = Column(Integer, nullable=False)
@@ -16,6 +34,16 @@ class Property(Base):
     location = Column(String, nullable=False)
     lock_id = Column(String, unique=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Last write time, for conditional GETs (see app.core.conditional).
+    updated_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        server_default=text("(now() at time zone 'utc')"),
+    )
+    # Weighted name, location and description lexemes, maintained by a trigger.
+    search_vector = deferred(Column(TSVECTOR))
 
     owner = relationship("User", back_populates="properties", lazy="selectin")
     bookings = relationship("Booking", back_populates="property", lazy="selectin")
@@ -0,0 +1,146 @@
+import re
+from datetime import date
+from typing import Iterable, List
+
+from loguru import logger
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def month_start(day: date) -> date:
+    """Return the first day of the month containing ``day``."""
+    return date(day.year, day.month, 1)
+
+
+def add_months(day: date, months: int) -> date:
+    """Return the first day of the month ``months`` away from ``day``."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def create_partition_sql(table: str, month: date):
+    """Build the DDL for the monthly partition of ``table`` starting at ``month``."""
+    month = month_start(month)
+    return text(
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def list_partitions_sql(table: str):
+    """Build a query returning the names of all partitions of ``table``."""
+    return text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON pg_inherits.inhparent = parent.oid "
+        "JOIN pg_class child ON pg_inherits.inhrelid = child.oid "
+        "WHERE parent.relname = :table"
+    ).bindparams(table=table)
+
+
+def expired_partitions(table: str, names: Iterable[str], cutoff: date) -> List[str]:
+    """Return the monthly partitions of ``table`` that end on or before ``cutoff``.
+
+    The default partition and anything not following the monthly naming
+    scheme is never returned.
+    """
+    pattern = re.compile(rf"^{re.escape(table)}_y(\d{{4}})m(\d{{2}})$")
+    expired = []
+    for name in names:
+        match = pattern.match(name)
+        if not match:
+            continue
+        month = date(int(match.group(1)), int(match.group(2)), 1)
+        if add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return sorted(expired)
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+async def _move_out_of_default(session: AsyncSession, table: str, column: str, month: date):
+    """Create the partition of ``month`` and move its rows out of the default partition.
+
+    A partition cannot be created while the default partition holds rows of
+    its range, so the default partition is detached, the partition created,
+    the rows moved through the parent table and the default attached again.
+    The rows are inserted before they are deleted, so the ``bookings`` delete
+    trigger finds them and leaves their references alone.
+    """
+    default = default_partition_name(table)
+    await session.execute(text(f"ALTER TABLE {table} DETACH PARTITION {default}"))
+    await session.execute(create_partition_sql(table, month))
+    moved = await session.execute(
+        text(
+            f"WITH moved AS ("
+            f"DELETE FROM {default} WHERE {column} >= :start AND {column} < :end RETURNING *"
+            f") INSERT INTO {table} SELECT * FROM moved"
+        ).bindparams(start=month, end=add_months(month, 1))
+    )
+    await session.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT"))
+    logger.warning(
+        f"Moved {moved.rowcount} rows of {month:%Y-%m} out of {default} into "
+        f"{partition_name(table, month)}"
+    )
+
+
+async def ensure_monthly_partitions(
+    session: AsyncSession, table: str, column: str, today: date, months_ahead: int
+):
+    """Create the partitions of ``table`` for this month and ``months_ahead`` more.
+
+    Rows that landed in the default partition, for example because the task
+    did not run in time, are moved into their monthly partition.
+    """
+    names = set((await session.execute(list_partitions_sql(table))).scalars().all())
+    default = default_partition_name(table)
+    stranded = set()
+    if default in names:
+        stranded = set(
+            (
+                await session.execute(
+                    text(f"SELECT DISTINCT date_trunc('month', {column})::date FROM {default}")
+                )
+            ).scalars()
+        )
+    months = {add_months(today, offset) for offset in range(months_ahead + 1)}
+    for month in sorted(months | stranded):
+        if partition_name(table, month) in names:
+            continue
+        if month in stranded:
+            await _move_out_of_default(session, table, column, month)
+        else:
+            await session.execute(create_partition_sql(table, month))
+
+
+async def drop_expired_partitions(
+    session: AsyncSession, table: str, cutoff: date
+) -> List[str]:
+    """Drop the partitions of ``table`` holding only rows older than ``cutoff``."""
+    names = (await session.execute(list_partitions_sql(table))).scalars().all()
+    expired = expired_partitions(table, names, cutoff)
+    for name in expired:
+        await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    return expired
+
+
+async def delete_expired_default_rows(
+    session: AsyncSession, table: str, column: str, cutoff: date
+) -> int:
+    """Delete the rows older than ``cutoff`` from the default partition of ``table``.
+
+    ``drop_expired_partitions`` never drops the default partition, so rows
+    that landed there are expired here.
+    """
+    result = await session.execute(
+        text(f"DELETE FROM {default_partition_name(table)} WHERE {column} < :cutoff").bindparams(
+            cutoff=cutoff
+        )
+    )
+    return result.rowcount
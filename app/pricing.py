@@ -0,0 +1,83 @@
+"""Nightly prices from a property's base ``price`` and its pricing rules.
+
+Day-level rules (seasons and weekdays) are materialized into a price per
+night for the next ``PRICE_CALENDAR_MONTHS`` (see ``PriceCalendar``), so a
+stay is priced by summing a slice of that array. Length of stay rules then
+scale the stay's total. The same formula runs in SQL as the ``stay_price``
+function when a booking is created.
+
+NumPy is imported inside the functions: it is only needed by the pricing
+endpoints and the nightly refresh, not at startup.
+"""
+from datetime import date
+from typing import Iterable, Optional, Sequence
+
+from app.enums.pricing import PricingRuleKind
+
+DAY_LEVEL_KINDS = (PricingRuleKind.SEASON, PricingRuleKind.WEEKDAY)
+
+
+def materialize_prices(base_price: float, rules: Iterable, start: date, days: int):
+    """Return the price of each of the ``days`` nights from ``start``.
+
+    Rules apply in ascending ``priority``: a season either sets its
+    ``nightly_price`` or multiplies the price so far, and a weekday rule
+    multiplies it. Prices are rounded to cents.
+    """
+    import numpy as np
+
+    nights = np.arange(np.datetime64(start, "D"), np.datetime64(start, "D") + days)
+    # Day 0 of datetime64 (1970-01-01) was a Thursday.
+    weekdays = (nights.astype("int64") + 3) % 7
+    prices = np.full(days, base_price, dtype=np.float64)
+
+    for rule in sorted(rules, key=lambda rule: rule.priority):
+        if rule.kind == PricingRuleKind.SEASON:
+            mask = (nights >= np.datetime64(rule.start_date, "D")) & (
+                nights < np.datetime64(rule.end_date, "D")
+            )
+        elif rule.kind == PricingRuleKind.WEEKDAY:
+            mask = np.isin(weekdays, rule.weekdays)
+        else:
+            continue
+        if rule.nightly_price is not None:
+            prices[mask] = rule.nightly_price
+        else:
+            prices[mask] *= rule.multiplier
+
+    return np.round(prices, 2)
+
+
+def length_of_stay_multiplier(rules: Iterable, nights: int) -> float:
+    """The multiplier of the longest length of stay rule ``nights`` qualifies for.
+
+    Of rules with the same ``min_nights`` the first wins; pass them ordered by id.
+    """
+    best = None
+    for rule in rules:
+        if rule.kind != PricingRuleKind.LENGTH_OF_STAY or rule.min_nights > nights:
+            continue
+        if best is None or rule.min_nights > best.min_nights:
+            best = rule
+    return best.multiplier if best else 1.0
+
+
+def stay_prices(
+    base_price: float,
+    calendar_start: Optional[date],
+    calendar_prices: Optional[Sequence[float]],
+    start: date,
+    end: date,
+):
+    """Nightly prices of a stay: the calendar's slice, ``base_price`` outside of it."""
+    import numpy as np
+
+    nights = (end - start).days
+    prices = np.full(nights, base_price, dtype=np.float64)
+    if calendar_prices is not None:
+        calendar = np.asarray(calendar_prices, dtype=np.float64)
+        offset = (start - calendar_start).days
+        first, last = max(0, -offset), min(nights, len(calendar) - offset)
+        if last > first:
+            prices[first:last] = calendar[offset + first:offset + last]
+    return prices
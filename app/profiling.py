@@ -0,0 +1,117 @@
+"""Profile single requests on demand.
+
+Add ``?profile=html`` (or the ``X-Profile: html`` header) to a request to run
+it under pyinstrument's sampling profiler. The response is then the profile
+instead of the endpoint's output: an interactive call tree for ``html``, or a
+flame graph to open in https://www.speedscope.app for ``speedscope``. The
+endpoint's status and its database round trips are reported in ``X-Profiled-*``
+headers, and statements repeated ``N_PLUS_ONE_THRESHOLD`` times or more are
+listed in ``X-Profiled-Repeated-Queries``.
+
+``settings.PROFILING`` decides who may profile: admins (``admin``, the
+default), anyone (``all``, for local development) or nobody (``off``).
+Requests that may not profile are served normally.
+"""
+from typing import Optional
+from urllib.parse import parse_qs
+
+from fastapi import HTTPException
+from loguru import logger
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.database import async_session
+from app.core.query_stats import track_queries
+from app.core.security import decode_access_token
+from app.enums.user_role import Role
+from app.models.user import User
+
+FORMATS = {"html": "text/html; charset=utf-8", "speedscope": "application/json"}
+
+
+def requested_format(scope) -> Optional[str]:
+    """The profile format asked for by the request, if any."""
+    for name, value in scope["headers"]:
+        if name == b"x-profile":
+            return value.decode("latin-1").strip()
+    values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile")
+    return values[0] if values else None
+
+
+async def may_profile(scope) -> bool:
+    if settings.PROFILING == "all":
+        return True
+    if settings.PROFILING != "admin":
+        return False
+    authorization = dict(scope["headers"]).get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user_id = int(decode_access_token(token).get("sub"))
+    except (HTTPException, TypeError, ValueError):
+        return False
+    async with async_session() as db:
+        role = await db.scalar(select(User.role).where(User.id == user_id))
+    return role == Role.ADMIN
+
+
+class ProfilingMiddleware:
+    """Serve the profile of a request when it asks for one and may, see the module docs."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        output = requested_format(scope)
+        if output not in FORMATS or not await may_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Imported here so workers that never profile do not load it.
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        status = 500
+
+        async def discard_response(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode="enabled")
+        with track_queries() as stats:
+            profiler.start()
+            try:
+                await self.app(scope, receive, discard_response)
+            finally:
+                profiler.stop()
+
+        if output == "html":
+            body = profiler.output_html().encode()
+        else:
+            body = profiler.output(renderer=SpeedscopeRenderer()).encode()
+        repeated = stats.repeated(settings.N_PLUS_ONE_THRESHOLD)
+        logger.info(
+            f"Profiled {scope['method']} {scope['path']}: status {status}, "
+            f"{stats.queries} queries in {stats.seconds * 1000:.1f}ms, "
+            f"{len(repeated)} repeated statements"
+        )
+        headers = [
+            (b"content-type", FORMATS[output].encode()),
+            (b"content-length", str(len(body)).encode()),
+            (b"x-profiled-status", str(status).encode()),
+            (b"x-profiled-queries", str(stats.queries).encode()),
+            (b"x-profiled-query-ms", f"{stats.seconds * 1000:.1f}".encode()),
+            (b"x-profiled-commits", str(stats.commits).encode()),
+            (
+                b"x-profiled-repeated-queries",
+                "; ".join(f"{count}x {statement[:120]}" for statement, count in repeated)
+                .encode("latin-1", "replace"),
+            ),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
@@ -1,13 +1,27 @@
+import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.booking import get_owner_bookings, get_bookings
 from app.schemas.user import User
 from datetime import datetime
 import os
 from jinja2 import Environment, FileSystemLoader
-from weasyprint import HTML
 from fastapi import HTTPException
+from app.core.metrics import timed
 from decimal import Decimal
 
+def write_pdf(html_content: str, pdf_file_path: str):
+    """Render ``html_content`` to a PDF file.
+
+    WeasyPrint and the Pango/Cairo libraries it loads are imported on the
+    first report instead of when the app starts. Both that import and the
+    rendering block, so async callers run this in a thread.
+    """
+    from weasyprint import HTML
+
+    with timed("pdf_render"):
+        HTML(string=html_content).write_pdf(pdf_file_path)
+
+
 async def generate_owner_report(db: AsyncSession, owner: User) -> str:
     # Fetch bookings for the owner
     bookings = await get_owner_bookings(db, owner.id)
@@ -57,7 +71,7 @@ async def generate_owner_report(db: AsyncSession, owner: User) -> str:
     if not os.path.exists("reports"):
         os.makedirs("reports")
     pdf_file_path = f"reports/owner_report_{owner.id}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.pdf"
-    HTML(string=html_content).write_pdf(pdf_file_path)
+    await asyncio.to_thread(write_pdf, html_content, pdf_file_path)
 
     return pdf_file_path
 
@@ -99,7 +113,7 @@ async def generate_booking_report(db: AsyncSession, message: str, booking) -> st
     if not os.path.exists("reports"):
         os.makedirs("reports")
     pdf_file_path = f"reports/booking_report_{booking.id}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.pdf"
-    HTML(string=html_content).write_pdf(pdf_file_path)
+    await asyncio.to_thread(write_pdf, html_content, pdf_file_path)
 
     return pdf_file_path
 
@@ -150,6 +164,6 @@ async def generate_user_activity_report(db: AsyncSession, user: User) -> str:
     if not os.path.exists("reports"):
         os.makedirs("reports")
     pdf_file_path = f"reports/user_activity_report_{user.id}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.pdf"
-    HTML(string=html_content).write_pdf(pdf_file_path)
+    await asyncio.to_thread(write_pdf, html_content, pdf_file_path)
 
     return pdf_file_path
\ No newline at end of file
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import secrets
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.conditional import VersionStamp, not_modified, with_version
+from app.core.config import settings
+from app.core.database import primary_read_session
+from app.core.metrics import RESPONSE_CACHE_REQUESTS
+from app.core.redis import redis_client
+
+# Tags a cached response depends on; writes invalidate them after commit.
+CATALOG = "properties"
+AVAILABILITY = "availability"
+
+
+# Part of every entry key; bump it when cached bodies change shape so
+# entries in the old shape are never read again.
+ENTRY_FORMAT = "v2"
+
+
+def property_tag(property_id: int) -> str:
+    return f"property:{property_id}"
+
+
+# Deletes the fill lock only if this process still holds it.
+RELEASE_LOCK = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: str
+    stamp: VersionStamp
+
+    def dumps(self) -> str:
+        last_modified = self.stamp.last_modified
+        return json.dumps(
+            {
+                "body": self.body,
+                "etag": self.stamp.etag,
+                "last_modified": last_modified.isoformat() if last_modified else None,
+            }
+        )
+
+    @classmethod
+    def loads(cls, raw: str) -> "CachedResponse":
+        data = json.loads(raw)
+        last_modified = data["last_modified"]
+        return cls(
+            body=data["body"],
+            stamp=VersionStamp(
+                etag=data["etag"],
+                last_modified=datetime.fromisoformat(last_modified) if last_modified else None,
+            ),
+        )
+
+
+class _KeyLock:
+    """A per-key lock with the number of requests holding or waiting for it."""
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.users = 0
+
+
+class ResponseCache:
+    """Redis cache of JSON responses, invalidated by tag.
+
+    Every tag has a version counter in Redis, and an entry's key includes
+    the versions of its tags, so ``invalidate`` only bumps counters and stale
+    entries are never read again; they simply expire. Each entry keeps the
+    body with its ETag and Last-Modified, so conditional requests are
+    answered from Redis too.
+
+    A miss is rebuilt once: requests in this process wait on a local lock,
+    other processes wait for the holder of a Redis lock to store the entry.
+    Entries are built from the primary, never the read replica: a replica
+    still behind an invalidated write would be cached under the new tag
+    versions and served until the entry expires. Redis errors are logged and
+    the response is built without the cache.
+    """
+
+    def __init__(
+        self,
+        redis=redis_client,
+        ttl: int = settings.RESPONSE_CACHE_TTL,
+        lock_seconds: float = settings.RESPONSE_CACHE_LOCK_SECONDS,
+        wait_seconds: float = settings.RESPONSE_CACHE_WAIT_SECONDS,
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.lock_seconds = lock_seconds
+        self.wait_seconds = wait_seconds
+        self._release_lock = redis.register_script(RELEASE_LOCK)
+        self._locks: Dict[str, _KeyLock] = {}
+
+    @staticmethod
+    def _tag_key(tag: str) -> str:
+        return f"response_cache:tag:{tag}"
+
+    async def _entry_key(self, route: str, tags: Iterable[str], variant: str) -> str:
+        versions = await self.redis.mget([self._tag_key(tag) for tag in tags])
+        return f"response_cache:{ENTRY_FORMAT}:{route}:{variant}:" + ".".join(
+            v or "0" for v in versions
+        )
+
+    async def _read(self, key: str) -> Optional[CachedResponse]:
+        raw = await self.redis.get(key)
+        return CachedResponse.loads(raw) if raw is not None else None
+
+    async def _write(self, key: str, entry: CachedResponse):
+        try:
+            await self.redis.set(key, entry.dumps(), ex=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Response cache write failed: {e}")
+
+    async def _fill(self, key: str, build) -> Tuple[CachedResponse, str]:
+        """Build and store the entry for ``key`` unless another process already is."""
+        lock_key = f"{key}:lock"
+        token = secrets.token_hex(8)
+        if await self.redis.set(lock_key, token, nx=True, px=int(self.lock_seconds * 1000)):
+            try:
+                entry = await build()
+                await self._write(key, entry)
+                return entry, "miss"
+            finally:
+                try:
+                    await self._release_lock(keys=[lock_key], args=[token])
+                except RedisError as e:
+                    logger.warning(f"Response cache lock release failed: {e}")
+
+        deadline = time.monotonic() + self.wait_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            entry = await self._read(key)
+            if entry is not None:
+                return entry, "wait"
+        # The holder is slow or gone; answer this request without caching.
+        return await build(), "miss"
+
+    async def _lookup(self, route: str, key: str, build) -> CachedResponse:
+        entry = await self._read(key)
+        if entry is not None:
+            RESPONSE_CACHE_REQUESTS.labels(route, "hit").inc()
+            return entry
+
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = _KeyLock()
+        lock.users += 1
+        try:
+            async with lock.lock:
+                # Filled by the request that held the lock before us.
+                entry = await self._read(key)
+                result = "wait"
+                if entry is None:
+                    entry, result = await self._fill(key, build)
+        finally:
+            # Only the last user drops the lock; later requests for the key
+            # must queue on the same one.
+            lock.users -= 1
+            if not lock.users:
+                del self._locks[key]
+        RESPONSE_CACHE_REQUESTS.labels(route, result).inc()
+        return entry
+
+    async def serve(
+        self,
+        request: Request,
+        route: str,
+        tags: Iterable[str],
+        version: Callable[[AsyncSession], Awaitable[VersionStamp]],
+        content: Callable[[AsyncSession], Awaitable],
+        variant: str = "",
+    ) -> Response:
+        """Serve a JSON response from the cache, building it on a miss.
+
+        ``version(db)`` returns the stamp of the current data and must be
+        cheap; ``content(db)`` returns the body as orjson-serializable data.
+        Both get a read-only session on the primary, opened only on a miss.
+        ``variant`` tells apart responses of one route, e.g. by path parameters.
+        """
+
+        async def build() -> CachedResponse:
+            async with primary_read_session() as db:
+                stamp = await version(db)
+                return CachedResponse(orjson.dumps(await content(db)).decode(), stamp)
+
+        try:
+            key = await self._entry_key(route, tags, variant)
+            entry = await self._lookup(route, key, build)
+        except RedisError as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            RESPONSE_CACHE_REQUESTS.labels(route, "error").inc()
+            entry = await build()
+
+        if cached := not_modified(request, entry.stamp):
+            return cached
+        return with_version(
+            Response(entry.body, media_type="application/json"), entry.stamp
+        )
+
+    async def invalidate(self, *tags: str):
+        """Make every cached response depending on any of ``tags`` stale."""
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for tag in tags:
+                    pipe.incr(self._tag_key(tag))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Response cache invalidation failed: {e}")
+
+
+response_cache = ResponseCache()
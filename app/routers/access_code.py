@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Booking
 from app.crud import access_code as access_code_crud, booking as booking_crud, access_logs as access_logs_crud
 from app.core.database import get_db
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
+from app.core.config import settings
+from app.schemas.access_log import AccessLogPage
 from app.dependencies import role_required, get_current_user
 from app.iot_utils import check_temperature_task
 from app.enums.user_role import Role
 from app.iot import SmartLock
+from app.circuit_breaker import circuit_breakers
 import json
 
 router = APIRouter(
@@ -16,6 +20,12 @@ router = APIRouter(
 )
 
 
+@router.get("/breakers")
+async def get_breakers(current_user=Depends(role_required([Role.ADMIN]))):
+    """Get the state of the IoT hub and smart lock circuit breakers."""
+    return {"breakers": circuit_breakers.snapshot()}
+
+
 @router.post("/{booking_id}/generate_access_code")
 async def generate_access_code(
     booking_id: int,
@@ -53,7 +63,7 @@ async def delete_access_code(
     if not booking:
         raise HTTPException(status_code=404, detail="Booking not found")
 
-    await access_code_crud.delete_access_code(booking_id, db)
+    await access_code_crud.delete_access_code(db, booking_id)
     return {"message": "Access code deleted"}
 
 
@@ -75,6 +85,46 @@ async def get_access_code(
     return {"access_code": access_code.code}
 
 
+@router.get("/{booking_id}/logs", response_model=AccessLogPage)
+async def get_access_logs(
+    booking_id: int,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user=Depends(role_required([Role.OWNER, Role.ADMIN])),
+):
+    """Get a page of lock access logs for a booking within a time window."""
+    booking = await booking_crud.get_booking(db, booking_id, current_user)
+    if not booking:
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    access_code = await access_code_crud.get_access_code(db, booking_id)
+    if not access_code:
+        raise HTTPException(status_code=404, detail="Access code not found")
+
+    until = until or datetime.utcnow()
+    since = since or until - timedelta(days=30)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until.")
+    if until - since > timedelta(days=settings.ACCESS_LOG_MAX_QUERY_DAYS):
+        raise HTTPException(
+            status_code=400,
+            detail=f"The time window cannot exceed {settings.ACCESS_LOG_MAX_QUERY_DAYS} days.",
+        )
+
+    logs = await access_logs_crud.get_access_logs(
+        db, access_code.id, since, until, limit, before, before_id
+    )
+    page = AccessLogPage(items=logs)
+    if len(logs) == limit:
+        page.next_before = logs[-1].accessed_at
+        page.next_before_id = logs[-1].id
+    return page
+
+
 @router.post("/{booking_id}/validate_access_code")
 async def validate_access_code(
     booking_id: int,
@@ -108,7 +158,7 @@ async def open_door(
     if not is_valid:
         raise HTTPException(status_code=403, detail="Access code is not valid")
 
-    response = await access_code_crud.send_smart_lock_command(db, booking, "open_lock")
+    response = await access_code_crud.send_smart_lock_command(db, booking.id, "open_lock")
     return {"message": "Door opened"}
 
 
@@ -129,7 +179,7 @@ async def close_door(
     if not is_valid:
         raise HTTPException(status_code=403, detail="Access code is not valid")
 
-    response = await access_code_crud.send_smart_lock_command(db, booking, "close_lock")
+    response = await access_code_crud.send_smart_lock_command(db, booking.id, "close_lock")
     return {"message": "Door closed"}
 
 
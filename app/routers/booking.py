@@ -1,11 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.schemas.booking import BookingCreate, Booking, BookingUpdate, PersonalizedOffer
+from app.schemas.booking import (
+    BookingCreate,
+    Booking,
+    BookingListItem,
+    BookingUpdate,
+    PersonalizedOffer,
+)
 from app.crud import booking as booking_crud
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.dependencies import get_current_user, role_required, check_not_blocked
 from app.enums.user_role import Role
-from typing import List
+from typing import List, Tuple
+from app.fieldsets import fieldset
 from app.email_utils import send_email_task
 from app.reports import generate_owner_report, generate_booking_report
 from app.models.user import User
@@ -18,7 +26,7 @@ router = APIRouter(
 
 @router.get("/personalized-offers", response_model=List[PersonalizedOffer])
 async def get_personalized_offers(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user=Depends(role_required([Role.USER])),
     _: User = Depends(check_not_blocked),
 ):
@@ -50,19 +58,36 @@ async def create_new_booking(
     return new_booking
 
 
-@router.get("/", response_model=List[Booking])
+booking_fields = fieldset(booking_crud.BOOKING_LIST_FIELDS, required=["id"])
+booking_expand = fieldset(booking_crud.BOOKING_LIST_EXPANSIONS, name="expand")
+
+
+# List routes return rows already projected to BookingListItem, so they are
+# encoded directly instead of being validated against the response model.
+@router.get("/", response_model=List[BookingListItem])
 async def read_bookings(
-    db: AsyncSession = Depends(get_db), current_user=Depends(get_current_user)
+    fields: Tuple[str, ...] = Depends(booking_fields),
+    expand: Tuple[str, ...] = Depends(booking_expand),
+    db: AsyncSession = Depends(get_read_db),
+    current_user=Depends(get_current_user),
 ):
     # Fetch all bookings for the current user
-    return await booking_crud.get_bookings(db, current_user)
+    bookings = await booking_crud.get_booking_list(
+        db, user_id=current_user.id, fields=fields, expand=expand
+    )
+    return ORJSONResponse(bookings)
 
-@router.get("/owner", response_model=List[Booking])
+@router.get("/owner", response_model=List[BookingListItem])
 async def get_bookings_for_owner(
-    db: AsyncSession = Depends(get_db),
+    fields: Tuple[str, ...] = Depends(booking_fields),
+    expand: Tuple[str, ...] = Depends(booking_expand),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(role_required([Role.OWNER])),
 ):
-    return await booking_crud.get_owner_bookings(db, current_user.id)
+    bookings = await booking_crud.get_booking_list(
+        db, owner_id=current_user.id, fields=fields, expand=expand
+    )
+    return ORJSONResponse(bookings)
 
 @router.get("/{booking_id}", response_model=Booking)
 async def read_booking(
@@ -71,7 +96,9 @@ async def read_booking(
     current_user=Depends(get_current_user),
 ):
     # Fetch a booking by ID for the current user
-    return await booking_crud.get_booking(db, booking_id, current_user)
+    return await booking_crud.get_booking(
+        db, booking_id, current_user, include_archived=True
+    )
 
 
 @router.put("/{booking_id}", response_model=Booking)
@@ -0,0 +1,70 @@
+import asyncio
+
+from fastapi import APIRouter, status
+from fastapi.responses import ORJSONResponse
+from loguru import logger
+from redis.exceptions import RedisError
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.redis import redis_client
+
+router = APIRouter(tags=["health"])
+
+
+class Readiness:
+    """Whether this worker should receive new traffic.
+
+    ``draining`` is set when the worker is asked to stop (see app.worker)
+    and on lifespan shutdown.
+    """
+
+    def __init__(self):
+        self.draining = False
+
+
+readiness = Readiness()
+
+
+async def _check_database():
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def _check_redis():
+    await redis_client.ping()
+
+
+CHECKS = {"database": _check_database, "redis": _check_redis}
+
+
+@router.get("/healthz", include_in_schema=False)
+async def healthz():
+    """Liveness: the worker's event loop is responsive."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz", include_in_schema=False)
+async def readyz():
+    """Readiness: not draining, and the database and Redis answer in time."""
+    if readiness.draining:
+        return ORJSONResponse(
+            {"status": "draining"}, status_code=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+
+    async def run(name, check):
+        try:
+            await asyncio.wait_for(check(), settings.READINESS_TIMEOUT)
+            return name, "ok"
+        except (asyncio.TimeoutError, SQLAlchemyError, RedisError, OSError) as e:
+            logger.warning(f"Readiness check {name} failed: {e!r}")
+            return name, "failed"
+
+    checks = dict(await asyncio.gather(*(run(name, check) for name, check in CHECKS.items())))
+    ready = all(result == "ok" for result in checks.values())
+    return ORJSONResponse(
+        {"status": "ok" if ready else "unavailable", "checks": checks},
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
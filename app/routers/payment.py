@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from app.schemas.payment import PaymentCreate, Payment, PaymentUpdate
 from app.crud import payment as payment_crud
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.dependencies import get_current_user, role_required
 from app.enums.user_role import Role
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -43,7 +43,7 @@ async def delete_payment(
 
 @router.get("/", response_model=List[Payment])
 async def get_user_payments(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user),
 ):
     return await payment_crud.get_user_payments(db, current_user)
\ No newline at end of file
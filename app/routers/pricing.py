@@ -0,0 +1,77 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
+from app.crud import pricing as pricing_crud
+from app.crud.booking import validate_stay
+from app.dependencies import check_not_blocked, role_required
+from app.enums.user_role import Role
+from app.models.user import User
+from app.schemas.pricing import CalendarDay, PricingRule, PricingRuleCreate, StayQuote
+
+router = APIRouter(
+    prefix="/properties",
+    tags=["pricing"],
+)
+
+
+@router.get("/{property_id}/quote", response_model=StayQuote)
+async def quote_stay(
+    property_id: int,
+    start_date: date,
+    end_date: date,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Price a stay with the property's pricing rules, as booking it would."""
+    validate_stay(start_date, end_date)
+    return await pricing_crud.get_quote(db, property_id, start_date, end_date)
+
+
+@router.get("/{property_id}/calendar", response_model=List[CalendarDay])
+async def read_price_calendar(
+    property_id: int,
+    start_date: Optional[date] = None,
+    days: int = Query(30, ge=1, le=settings.PRICE_CALENDAR_MAX_DAYS),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Price and availability of each night, from today by default."""
+    return await pricing_crud.get_price_calendar(
+        db, property_id, start_date or date.today(), days
+    )
+
+
+@router.get("/{property_id}/pricing-rules", response_model=List[PricingRule])
+async def read_pricing_rules(
+    property_id: int,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Get the pricing rules of a property in the order they apply."""
+    return await pricing_crud.get_pricing_rules(db, property_id)
+
+
+@router.post("/{property_id}/pricing-rules", response_model=PricingRule)
+async def create_pricing_rule(
+    property_id: int,
+    rule_data: PricingRuleCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(role_required([Role.OWNER])),
+    _: User = Depends(check_not_blocked),
+):
+    """Add a pricing rule to one of the owner's properties."""
+    return await pricing_crud.create_pricing_rule(db, property_id, rule_data, current_user)
+
+
+@router.delete("/{property_id}/pricing-rules/{rule_id}", response_model=PricingRule)
+async def delete_pricing_rule(
+    property_id: int,
+    rule_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(role_required([Role.OWNER])),
+    _: User = Depends(check_not_blocked),
+):
+    """Remove a pricing rule from one of the owner's properties."""
+    return await pricing_crud.delete_pricing_rule(db, property_id, rule_id, current_user)
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import date, datetime, time
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse
 from app.crud import property as property_crud
 from app.schemas.property import (
     PropertyCreate,
@@ -6,13 +8,21 @@ from app.schemas.property import (
     PropertyUpdate,
     PropertyWithAvailabilityPeriods,
     AvailabilityPeriod,
+    PropertySearchPage,
+    PropertySearchResult,
+    PropertyListItem,
+    PropertyFull,
+    OwnerPropertyListItem,
 )
-from app.core.database import get_db
+from app.core.conditional import version_stamp
+from app.core.database import get_db, get_read_db
 from app.dependencies import role_required, check_not_blocked
+from app.fieldsets import fieldset
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Tuple
 from app.enums.user_role import Role
 from app.models.user import User
+from app.response_cache import AVAILABILITY, CATALOG, property_tag, response_cache
 from sqlalchemy import select
 
 router = APIRouter(
@@ -21,38 +31,123 @@ router = APIRouter(
 )
 
 
-@router.get("/", response_model=List[Property])
-async def read_properties(db: AsyncSession = Depends(get_db)):
-    """Read all properties."""
-    # Fetch all properties from the database
-    return await property_crud.get_properties(db)
+# Catalog reads are polled and anonymous, so they are served from the
+# response cache (see app.response_cache). Writes in app.crud invalidate the
+# tags after commit; on a miss a cheap version stamp is read before the
+# full query so the cached entry carries its ETag and Last-Modified. Misses
+# are built from the primary, so these routes take no session of their own.
+property_fields = fieldset(property_crud.PROPERTY_LIST_FIELDS, required=["id"])
+owner_property_fields = fieldset(property_crud.OWNER_PROPERTY_LIST_FIELDS, required=["id"])
+
+
+@router.get("/", response_model=List[PropertyListItem])
+async def read_properties(
+    request: Request,
+    fields: Tuple[str, ...] = Depends(property_fields),
+):
+    """Read all properties, optionally only some of their ``fields``."""
+
+    async def version(db):
+        updated_at, count = await property_crud.get_properties_version(db)
+        return version_stamp(updated_at, count, last_modified=updated_at)
+
+    # Rows are projected to the response shape in SQL; encode them directly
+    return await response_cache.serve(
+        request,
+        "properties",
+        [CATALOG],
+        version,
+        lambda db: property_crud.get_property_list(db, fields=fields),
+        variant=",".join(fields),
+    )
 
 
 @router.get("/available", response_model=List[PropertyWithAvailabilityPeriods])
-async def get_available_properties(db: AsyncSession = Depends(get_db)):
+async def get_available_properties(request: Request):
     """Get all available properties and their booking windows."""
-    # Fetch available properties and their availability periods
-    return await property_crud.get_available_properties(db)
+    today = date.today()
+
+    async def version(db):
+        version = await property_crud.get_availability_version(db, today)
+        # Availability windows start today, so the response also changes at midnight.
+        last_modified = max(
+            value for value in (version[0], version[2], datetime.combine(today, time.min))
+            if value is not None
+        )
+        return version_stamp(today, *version, last_modified=last_modified)
+
+    async def content(db):
+        # Fetch available properties and their availability periods
+        properties = await property_crud.get_available_properties(db)
+        return [property.model_dump() for property in properties]
+
+    return await response_cache.serve(
+        request,
+        "properties_available",
+        [CATALOG, AVAILABILITY],
+        version,
+        content,
+        variant=today.isoformat(),
+    )
 
 
-@router.get("/my-properties", response_model=List[Property])
+@router.get("/search", response_model=PropertySearchPage)
+async def search_properties(
+    q: str = Query(..., min_length=2, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Search properties by name, location and description, best matches first."""
+    rows = await property_crud.search_properties(db, q, limit, offset)
+    page = PropertySearchPage(
+        items=[
+            PropertySearchResult(**Property.model_validate(property).model_dump(), rank=rank)
+            for property, rank in rows
+        ]
+    )
+    if len(rows) == limit:
+        page.next_offset = offset + limit
+    return page
+
+
+@router.get("/my-properties", response_model=List[OwnerPropertyListItem])
 async def read_owner_properties(
-    db: AsyncSession = Depends(get_db),
+    fields: Tuple[str, ...] = Depends(owner_property_fields),
+    db: AsyncSession = Depends(get_read_db),
     current_user: dict = Depends(role_required([Role.OWNER])),
     _: User = Depends(check_not_blocked),
 ):
     """Get all properties owned by the current user."""
-    return await property_crud.get_properties_by_owner(db, current_user.id)
+    return ORJSONResponse(
+        await property_crud.get_property_list(db, owner_id=current_user.id, fields=fields)
+    )
 
 
 @router.get("/{property_id}", response_model=Property)
-async def read_property(property_id: int, db: AsyncSession = Depends(get_db)):
+async def read_property(property_id: int, request: Request):
     """Read a property by ID."""
-    # Fetch property by ID from the database
-    return await property_crud.get_property(db, property_id)
+
+    async def version(db):
+        updated_at = await property_crud.get_property_version(db, property_id)
+        return version_stamp(property_id, updated_at, last_modified=updated_at)
+
+    async def content(db):
+        # Fetch property by ID from the database
+        property = await property_crud.get_property(db, property_id)
+        return Property.model_validate(property).model_dump()
+
+    return await response_cache.serve(
+        request,
+        "property",
+        [property_tag(property_id)],
+        version,
+        content,
+        variant=str(property_id),
+    )
 
 
-@router.post("/", response_model=Property)
+@router.post("/", response_model=PropertyFull)
 async def create_property(
     property_data: PropertyCreate,
     db: AsyncSession = Depends(get_db),
@@ -64,7 +159,7 @@ async def create_property(
     return await property_crud.create_property(db, property_data, current_user)
 
 
-@router.put("/{property_id}", response_model=Property)
+@router.put("/{property_id}", response_model=PropertyFull)
 async def update_property(
     property_id: int,
     property_data: PropertyUpdate,
@@ -79,7 +174,7 @@ async def update_property(
     )
 
 
-@router.delete("/{property_id}", response_model=Property)
+@router.delete("/{property_id}", response_model=PropertyFull)
 async def delete_property(
     property_id: int,
     db: AsyncSession = Depends(get_db),
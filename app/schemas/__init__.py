@@ -6,19 +6,32 @@ from app.schemas.property import (
     PropertyBase,
     AvailabilityPeriod,
     PropertyWithAvailabilityPeriods,
+    PropertySummary,
+    PropertyListItem,
+    PropertyFull,
+    OwnerPropertyListItem,
+)
+from app.schemas.booking import (
+    Booking,
+    BookingCreate,
+    BookingUpdate,
+    BookingListItem,
+    PersonalizedOffer,
 )
-from app.schemas.booking import Booking, BookingCreate, BookingUpdate, PersonalizedOffer
 from app.schemas.access_code import (
     AccessCode,
     AccessCodeCreate
 )
+from app.schemas.access_log import AccessLog, AccessLogPage
 from app.schemas.payment import (
     Payment,
     PaymentCreate,
     PaymentUpdate,
     PaymentBase,
     PaymentStatus,
+    PaymentSummary,
 )
+from app.schemas.pricing import PricingRule, PricingRuleCreate, StayQuote, CalendarDay
 
 
 __all__ = [
@@ -33,17 +46,29 @@ __all__ = [
     "PropertyBase",
     "AvailabilityPeriod",
     "PropertyWithAvailabilityPeriods",
+    "PropertySummary",
+    "PropertyListItem",
+    "PropertyFull",
+    "OwnerPropertyListItem",
     "Booking",
     "BookingCreate",
     "BookingUpdate",
+    "BookingListItem",
     "PersonalizedOffer",
     "AccessCode",
     "AccessCodeCreate",
     "AccessCodeUpdate",
     "AccessCodeBase",
+    "AccessLog",
+    "AccessLogPage",
     "Payment",
     "PaymentCreate",
     "PaymentUpdate",
     "PaymentBase",
     "PaymentStatus",
+    "PaymentSummary",
+    "PricingRule",
+    "PricingRuleCreate",
+    "StayQuote",
+    "CalendarDay",
 ]
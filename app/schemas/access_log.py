@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class AccessLog(BaseModel):
+    id: int
+    access_code_id: Optional[int] = None
+    command: str
+    response_status: str
+    response_message: Optional[str] = None
+    accessed_at: datetime
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
+
+
+class AccessLogPage(BaseModel):
+    items: List[AccessLog]
+    next_before: Optional[datetime] = None
+    next_before_id: Optional[int] = None
@@ -3,8 +3,8 @@ from typing import Optional
 from pydantic.networks import EmailStr
 from app.enums.booking_status import BookingStatus
 from datetime import datetime, date
-from app.schemas.property import Property
-from app.schemas.payment import Payment
+from app.schemas.property import Property, PropertySummary
+from app.schemas.payment import Payment, PaymentSummary
 
 
 class BookingBase(BaseModel):
@@ -37,6 +37,25 @@ class Booking(BookingBase):
         from_attributes = True
 
 
+class BookingListItem(BaseModel):
+    """A booking in a list response, projected straight from SQL.
+
+    Lists skip the nested ORM validation of ``Booking``. Fields left out of
+    ``?fields=`` and relationships left out of ``?expand=`` are omitted.
+    """
+
+    id: int
+    property_id: Optional[int] = None
+    user_id: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    status: Optional[BookingStatus] = None
+    booking_price: Optional[float] = None
+    created_at: Optional[datetime] = None
+    property: Optional[PropertySummary] = None
+    payment: Optional[PaymentSummary] = None
+
+
 class PersonalizedOffer(BaseModel):
     property: Property
     discount: float
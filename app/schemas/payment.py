@@ -26,3 +26,9 @@ class Payment(PaymentBase):
     class Config:
         orm_mode = True
         from_attributes = True
+
+
+class PaymentSummary(BaseModel):
+    id: int
+    amount: float
+    status: PaymentStatus
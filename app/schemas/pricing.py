@@ -0,0 +1,59 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List
+from datetime import date
+from app.enums.pricing import PricingRuleKind
+
+
+class PricingRuleCreate(BaseModel):
+    kind: PricingRuleKind
+    priority: int = 0
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    weekdays: Optional[List[int]] = None
+    min_nights: Optional[int] = Field(None, ge=1)
+    multiplier: Optional[float] = Field(None, gt=0)
+    nightly_price: Optional[float] = Field(None, ge=0)
+
+    @model_validator(mode="after")
+    def check_kind_fields(self):
+        if self.kind == PricingRuleKind.SEASON:
+            if not self.start_date or not self.end_date or self.start_date >= self.end_date:
+                raise ValueError("A season needs a start_date before its end_date.")
+            if (self.multiplier is None) == (self.nightly_price is None):
+                raise ValueError("A season sets either a multiplier or a nightly_price.")
+        elif self.kind == PricingRuleKind.WEEKDAY:
+            if not self.weekdays or any(day not in range(7) for day in self.weekdays):
+                raise ValueError("Weekdays are numbers from 0 (Monday) to 6 (Sunday).")
+            if self.multiplier is None or self.nightly_price is not None:
+                raise ValueError("A weekday rule sets a multiplier.")
+        else:
+            if self.min_nights is None:
+                raise ValueError("A length of stay rule needs min_nights.")
+            if self.multiplier is None or self.nightly_price is not None:
+                raise ValueError("A length of stay rule sets a multiplier.")
+        return self
+
+
+class PricingRule(PricingRuleCreate):
+    id: int
+    property_id: int
+
+    class Config:
+        from_attributes = True
+
+
+class StayQuote(BaseModel):
+    property_id: int
+    start_date: date
+    end_date: date
+    nights: int
+    nightly_prices: List[float]
+    subtotal: float
+    length_of_stay_multiplier: float
+    total: float
+
+
+class CalendarDay(BaseModel):
+    date: date
+    price: float
+    available: bool
@@ -9,11 +9,10 @@ class PropertyBase(BaseModel):
     rooms: int
     price: float
     location: Optional[str] = None
-    lock_id: Optional[str] = None
 
 
 class PropertyCreate(PropertyBase):
-    pass
+    lock_id: Optional[str] = None
 
 
 class PropertyUpdate(PropertyBase):
@@ -22,9 +21,16 @@ class PropertyUpdate(PropertyBase):
     rooms: Optional[int] = None
     price: Optional[float] = None
     location: Optional[str] = None
+    lock_id: Optional[str] = None
 
 
 class Property(PropertyBase):
+    """A property as anyone may see it.
+
+    ``lock_id`` carries the lock's encryption key, so only ``PropertyFull``,
+    returned to the owner, includes it.
+    """
+
     id: int
     owner_id: int
 
@@ -33,10 +39,50 @@ class Property(PropertyBase):
         from_attributes = True
 
 
+class PropertyFull(Property):
+    lock_id: Optional[str] = None
+
+
+class PropertyListItem(BaseModel):
+    """A property in a list response; fields left out of ``?fields=`` are omitted."""
+
+    id: int
+    owner_id: Optional[int] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    rooms: Optional[int] = None
+    price: Optional[float] = None
+    location: Optional[str] = None
+
+
+class OwnerPropertyListItem(PropertyListItem):
+    """A property in the owner's own list, which may include ``lock_id``."""
+
+    lock_id: Optional[str] = None
+
+
+class PropertySummary(BaseModel):
+    """The property fields shown alongside list items such as bookings."""
+
+    id: int
+    name: str
+    location: Optional[str] = None
+    description: Optional[str] = None
+    price: float
+
+
 class AvailabilityPeriod(BaseModel):
     start_date: date
     end_date: date
 
 
 class PropertyWithAvailabilityPeriods(Property):
-    availability_periods: List[AvailabilityPeriod]
\ No newline at end of file
+    availability_periods: List[AvailabilityPeriod]
+
+class PropertySearchResult(Property):
+    rank: float
+
+
+class PropertySearchPage(BaseModel):
+    items: List[PropertySearchResult]
+    next_offset: Optional[int] = None
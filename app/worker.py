@@ -0,0 +1,50 @@
+"""Gunicorn worker for serving the app in production, see ``gunicorn.conf.py``."""
+import signal
+import sys
+import time
+from typing import Optional
+
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+from app.routers.health import readiness
+
+
+class DrainingServer(Server):
+    """Uvicorn server that drains before shutting down on SIGTERM.
+
+    The first SIGTERM only marks the worker as draining: ``/readyz`` starts
+    failing while requests are still served for ``DRAIN_SECONDS``. Then the
+    normal graceful shutdown runs: stop accepting connections, finish
+    in-flight requests, run the lifespan shutdown. Any further signal skips
+    the rest of the drain period.
+    """
+
+    def __init__(self, *args, drain_seconds: float = settings.DRAIN_SECONDS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.drain_seconds = drain_seconds
+        self.drain_deadline: Optional[float] = None
+
+    def handle_exit(self, sig, frame):
+        if sig == signal.SIGTERM and self.drain_deadline is None and self.drain_seconds > 0:
+            readiness.draining = True
+            self.drain_deadline = time.monotonic() + self.drain_seconds
+            return
+        super().handle_exit(sig, frame)
+
+    async def on_tick(self, counter: int) -> bool:
+        if self.drain_deadline is not None and time.monotonic() >= self.drain_deadline:
+            self.should_exit = True
+        return await super().on_tick(counter)
+
+
+class DrainingUvicornWorker(UvicornWorker):
+    async def _serve(self):
+        self.config.app = self.wsgi
+        server = DrainingServer(config=self.config)
+        self._install_sigquit_handler()
+        await server.serve(sockets=self.sockets)
+        if not server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
@@ -0,0 +1,68 @@
+"""Compare two benchmark result files and fail on regressions.
+
+Matches scenarios by name between a baseline and a candidate run written
+with ``--output`` by any benchmark, prints the change of p50, p99 and
+throughput, and exits with status 1 when a scenario's p99 grew or its
+throughput dropped by more than ``--max-regression`` percent, or it has
+more errors than before::
+
+    python -m benchmarks.compare baseline.json candidate.json --max-regression 10
+"""
+import argparse
+import sys
+
+from benchmarks.stats import read_results
+
+
+def change(before: float, after: float) -> float:
+    """Relative change from ``before`` to ``after`` in percent."""
+    if not before:
+        return 0.0 if not after else float("inf")
+    return (after - before) / before * 100
+
+
+def compare(baseline: dict, candidate: dict, max_regression: float) -> bool:
+    before = {r["scenario"]: r for r in baseline["results"]}
+    after = {r["scenario"]: r for r in candidate["results"]}
+    print(f"baseline {baseline.get('commit', '?')}, candidate {candidate.get('commit', '?')}")
+    header = f"{'scenario':<28}{'p50 ms':>18}{'p99 ms':>18}{'ops/s':>18}{'errors':>10}"
+    print(header)
+    print("-" * len(header))
+    ok = True
+    for name in [name for name in before if name in after]:
+        b, a = before[name], after[name]
+        p99 = change(b["p99_ms"], a["p99_ms"])
+        throughput = change(b["throughput_per_s"], a["throughput_per_s"])
+        failures = []
+        if p99 > max_regression:
+            failures.append(f"p99 {p99:+.1f}%")
+        if -throughput > max_regression:
+            failures.append(f"throughput {throughput:+.1f}%")
+        if a["errors"] > b["errors"]:
+            failures.append(f"errors {b['errors']} -> {a['errors']}")
+        ok = ok and not failures
+        print(
+            f"{name:<28}"
+            f"{a['p50_ms']:>10} {change(b['p50_ms'], a['p50_ms']):>+6.1f}%"
+            f"{a['p99_ms']:>10} {p99:>+6.1f}%"
+            f"{a['throughput_per_s']:>10} {throughput:>+6.1f}%"
+            f"{a['errors']:>10}"
+            f"{'  FAIL ' + ', '.join(failures) if failures else ''}"
+        )
+    for name in sorted(before.keys() - after.keys()):
+        print(f"{name:<28} missing from the candidate run")
+    for name in sorted(after.keys() - before.keys()):
+        print(f"{name:<28} new, no baseline")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--max-regression", type=float, default=10.0, help="Allowed slowdown in percent"
+    )
+    args = parser.parse_args()
+    ok = compare(read_results(args.baseline), read_results(args.candidate), args.max_regression)
+    sys.exit(0 if ok else 1)
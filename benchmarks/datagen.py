@@ -0,0 +1,224 @@
+"""Generate a realistic synthetic dataset and bulk load it with COPY.
+
+Creates owners, guests, properties spread over cities, and years of
+non-overlapping stays per property with payments for confirmed ones. Rows
+are generated in Python from a seeded RNG and streamed with ``COPY`` into
+the tables, so a million bookings load in well under a minute. Every user
+shares one password, hashed once. Users are ``owner-<n>@bench.example.com``
+and ``guest-<n>@bench.example.com``, which ``benchmarks.loadtest`` logs in
+as. Load into a migrated database that has no benchmark users yet::
+
+    python -m benchmarks.datagen --owners 200 --guests 5000 --properties 2000 --years 3
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.security import get_password_hash
+from app.partitions import add_months, create_partition_sql, month_start
+
+EMAIL_DOMAIN = "bench.example.com"
+
+CITIES = [
+    "Kyiv", "Lviv", "Odesa", "Kharkiv", "Dnipro", "Uzhhorod", "Chernivtsi",
+    "Ivano-Frankivsk", "Vinnytsia", "Poltava", "Zaporizhzhia", "Ternopil",
+]
+ADJECTIVES = [
+    "Cozy", "Sunny", "Quiet", "Spacious", "Modern", "Rustic", "Charming",
+    "Bright", "Elegant", "Historic", "Stylish", "Peaceful",
+]
+KINDS = ["Apartment", "Loft", "Studio", "Cottage", "House", "Villa", "Cabin", "Flat"]
+FEATURES = [
+    "a view of the river", "a balcony", "a garden", "free parking", "a fireplace",
+    "fast wifi", "a sauna", "a workspace", "a mountain view", "a terrace",
+    "a fully equipped kitchen", "a washing machine",
+]
+
+# Search terms for benchmarks.loadtest, including a misspelling.
+SEARCH_TERMS = [
+    "cozy loft", "river view", "Lviv", "quiet studio", "villa sauna",
+    "cottage fireplace", "apartmnet Kyiv", "modern flat balcony",
+]
+
+# Generated stays end at most this many days from today.
+DAYS_AHEAD = 180
+
+
+def owner_email(n: int) -> str:
+    return f"owner-{n}@{EMAIL_DOMAIN}"
+
+
+def guest_email(n: int) -> str:
+    return f"guest-{n}@{EMAIL_DOMAIN}"
+
+
+def generate_users(args, first_id: int, password_hash: str, now: datetime):
+    users = []
+    for n in range(1, args.owners + 1):
+        users.append(
+            (first_id + len(users), "Owner", str(n), owner_email(n), password_hash, "OWNER", now, False)
+        )
+    for n in range(1, args.guests + 1):
+        users.append(
+            (first_id + len(users), "Guest", str(n), guest_email(n), password_hash, "USER", now, False)
+        )
+    return users
+
+
+def generate_properties(args, rng: random.Random, first_id: int, owner_ids, now: datetime):
+    properties = []
+    for n in range(args.properties):
+        city = rng.choice(CITIES)
+        kind = rng.choice(KINDS)
+        features = rng.sample(FEATURES, 3)
+        properties.append(
+            (
+                first_id + n,
+                owner_ids[n % len(owner_ids)],
+                f"{rng.choice(ADJECTIVES)} {kind} in {city}",
+                f"{kind} with {features[0]}, {features[1]} and {features[2]}.",
+                rng.randint(1, 6),
+                float(rng.randrange(30, 400, 5)),
+                city,
+                now,
+            )
+        )
+    return properties
+
+
+def generate_bookings(args, rng, first_booking_id, first_payment_id, properties, guest_ids, today):
+    """Back-to-back stays with random gaps per property, from ``years`` ago to ``DAYS_AHEAD`` ahead."""
+    bookings, payments = [], []
+    start = today - timedelta(days=365 * args.years)
+    end = today + timedelta(days=DAYS_AHEAD)
+    for property_id, price in ((p[0], p[5]) for p in properties):
+        day = start + timedelta(days=rng.randint(0, 14))
+        while True:
+            nights = rng.randint(1, 14)
+            if day + timedelta(days=nights) > end:
+                break
+            booking_id = first_booking_id + len(bookings)
+            if day >= today:
+                status = "CONFIRMED" if rng.random() < 0.7 else "PENDING"
+            else:
+                status = "CONFIRMED" if rng.random() < 0.9 else "CANCELLED"
+            created_at = datetime.combine(day - timedelta(days=rng.randint(1, 60)), datetime.min.time())
+            bookings.append(
+                (
+                    booking_id,
+                    rng.choice(guest_ids),
+                    property_id,
+                    day,
+                    day + timedelta(days=nights),
+                    status,
+                    created_at,
+                    price * nights,
+                )
+            )
+            if status == "CONFIRMED":
+                payments.append(
+                    (first_payment_id + len(payments), booking_id, price * nights, "SUCCESS", created_at)
+                )
+            day += timedelta(days=nights + rng.randint(0, args.max_gap_days))
+    return bookings, payments
+
+
+TABLES = {
+    "users": ["id", "first_name", "last_name", "email", "password", "role", "created_at", "is_blocked"],
+    "properties": ["id", "owner_id", "name", "description", "rooms", "price", "location", "created_at"],
+    "bookings": [
+        "id", "user_id", "property_id", "start_date", "end_date", "status", "created_at",
+        "booking_price",
+    ],
+    "payments": ["id", "booking_id", "amount", "status", "created_at"],
+}
+SEQUENCES = {
+    "users": "users_id_seq",
+    "properties": "properties_id_seq",
+    "bookings": "bookings_id_seq",
+    "payments": "payments_id_seq",
+}
+
+
+async def next_ids(connection) -> dict:
+    ids = {}
+    for table in TABLES:
+        query = text(f"SELECT coalesce(max(id), 0) + 1 FROM {table}")
+        ids[table] = (await connection.execute(query)).scalar()
+    return ids
+
+
+async def copy_rows(connection, table: str, rows) -> float:
+    raw = await connection.get_raw_connection()
+    start = time.perf_counter()
+    await raw.driver_connection.copy_records_to_table(table, records=rows, columns=TABLES[table])
+    return time.perf_counter() - start
+
+
+async def main(args):
+    rng = random.Random(args.seed)
+    today = date.today()
+    now = datetime.utcnow()
+
+    start = time.perf_counter()
+    password_hash = get_password_hash(args.password)
+    async with engine.begin() as connection:
+        taken = (
+            await connection.execute(
+                text("SELECT count(*) FROM users WHERE email LIKE :pattern"),
+                {"pattern": f"%@{EMAIL_DOMAIN}"},
+            )
+        ).scalar()
+        if taken:
+            raise SystemExit(
+                f"The database already has {taken} benchmark users; load into a fresh one."
+            )
+
+        ids = await next_ids(connection)
+        users = generate_users(args, ids["users"], password_hash, now)
+        owner_ids = [u[0] for u in users[: args.owners]]
+        guest_ids = [u[0] for u in users[args.owners:]]
+        properties = generate_properties(args, rng, ids["properties"], owner_ids, now)
+        bookings, payments = generate_bookings(
+            args, rng, ids["bookings"], ids["payments"], properties, guest_ids, today
+        )
+        print(f"Generated the rows in {time.perf_counter() - start:.1f}s")
+
+        # Monthly partitions for the whole range, so rows stay out of the default partition.
+        month = month_start(min(b[3] for b in bookings)) if bookings else month_start(today)
+        while month <= add_months(today, settings.BOOKING_PARTITIONS_AHEAD):
+            await connection.execute(create_partition_sql("bookings", month))
+            month = add_months(month, 1)
+
+        for table, rows in [
+            ("users", users),
+            ("properties", properties),
+            ("bookings", bookings),
+            ("payments", payments),
+        ]:
+            seconds = await copy_rows(connection, table, rows)
+            print(f"{table:<12}{len(rows):>10} rows in {seconds:6.2f}s ({len(rows) / max(seconds, 1e-9):,.0f} rows/s)")
+            await connection.execute(
+                text(f"SELECT setval('{SEQUENCES[table]}', (SELECT max(id) FROM {table}))")
+            )
+            await connection.execute(text(f"ANALYZE {table}"))
+    await engine.dispose()
+    print(f"Loaded in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--owners", type=int, default=200)
+    parser.add_argument("--guests", type=int, default=5000)
+    parser.add_argument("--properties", type=int, default=2000)
+    parser.add_argument("--years", type=int, default=3, help="Years of booking history")
+    parser.add_argument("--max-gap-days", type=int, default=10, help="Longest gap between stays")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,209 @@
+"""Scenario load tests against a running API.
+
+Drives the hot user journeys with concurrent clients and reports p50/p99
+latency, throughput and errors per scenario:
+
+- ``search``: anonymous full text searches.
+- ``booking``: rounds of guests racing to book the same property and dates;
+  a round with more than one winner counts as an error. The winning bookings
+  are canceled once the scenario is timed.
+- ``owner_listings``: owners listing their properties and bookings.
+- ``offers``: guests fetching personalized offers.
+- ``reports``: owners requesting their PDF report.
+
+Needs a database loaded by ``benchmarks.datagen``. Write the results with
+``--output`` and compare two runs with ``benchmarks.compare``::
+
+    python -m benchmarks.loadtest --base-url http://localhost:8000 --output results.json
+"""
+import argparse
+import asyncio
+import random
+import time
+from datetime import date, timedelta
+
+import httpx
+
+from app.core.config import settings
+from app.partitions import add_months, month_start
+from benchmarks.datagen import DAYS_AHEAD, SEARCH_TERMS, guest_email, owner_email
+from benchmarks.stats import print_results, summarize, write_results
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/token", data={"username": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def run(name: str, requests: int, concurrency: int, call):
+    """Issue ``requests`` calls of ``call(i)`` from ``concurrency`` workers.
+
+    ``call`` returns whether the response was as expected.
+    """
+    latencies, errors = [], 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                ok = await call(i)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(name, latencies, time.perf_counter() - start, errors)
+
+
+async def search(client, args, users):
+    async def call(i):
+        term = SEARCH_TERMS[i % len(SEARCH_TERMS)]
+        response = await client.get("/properties/search", params={"q": term})
+        return response.status_code == 200
+
+    return await run("search", args.requests, args.concurrency, call)
+
+
+async def booking(client, args, users):
+    """Each round, ``contenders`` guests book the same stay at once; one may win.
+
+    Stays start after the generated ones and before the last booking
+    partition, so none of them land in ``bookings_default``.
+    """
+    rng = random.Random(args.seed)
+    response = await client.get("/properties/", params={"fields": "id"})
+    response.raise_for_status()
+    property_ids = [p["id"] for p in response.json()]
+    today = date.today()
+    earliest = today + timedelta(days=DAYS_AHEAD + 1)
+    latest = add_months(month_start(today), settings.BOOKING_PARTITIONS_AHEAD) - timedelta(days=1)
+    latencies, errors, unwon = [], 0, 0
+    booked = []
+
+    async def attempt(headers, stay):
+        start = time.perf_counter()
+        try:
+            response = await client.post("/bookings/", json=stay, headers=headers)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = None
+        latencies.append(time.perf_counter() - start)
+        if status == 200:
+            booked.append((response.json()["id"], headers))
+        return status
+
+    start = time.perf_counter()
+    try:
+        for _ in range(args.requests // args.contenders):
+            first_night = earliest + timedelta(days=rng.randint(0, (latest - earliest).days))
+            stay = {
+                "property_id": rng.choice(property_ids),
+                "start_date": first_night.isoformat(),
+                "end_date": (first_night + timedelta(days=rng.randint(1, 7))).isoformat(),
+            }
+            contenders = rng.sample(users["guests"], min(args.contenders, len(users["guests"])))
+            statuses = await asyncio.gather(*(attempt(headers, stay) for headers in contenders))
+            winners = statuses.count(200)
+            errors += sum(1 for s in statuses if s is None or s >= 500)
+            errors += max(0, winners - 1)
+            unwon += winners == 0
+        result = summarize("booking", latencies, time.perf_counter() - start, errors)
+        result["rounds_without_winner"] = unwon
+    finally:
+        # Cancel the winners so the next run finds the same dates free.
+        for booking_id, headers in booked:
+            try:
+                response = await client.delete(f"/bookings/{booking_id}", headers=headers)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = e
+            if status != 200:
+                print(f"Could not cancel booking {booking_id}: {status}")
+    return result
+
+
+async def owner_listings(client, args, users):
+    async def call(i):
+        headers = users["owners"][i % len(users["owners"])]
+        path = "/properties/my-properties" if i % 2 else "/bookings/owner"
+        return (await client.get(path, headers=headers)).status_code == 200
+
+    return await run("owner_listings", args.requests, args.concurrency, call)
+
+
+async def offers(client, args, users):
+    async def call(i):
+        headers = users["guests"][i % len(users["guests"])]
+        response = await client.get("/bookings/personalized-offers", headers=headers)
+        return response.status_code == 200
+
+    return await run("offers", args.requests, args.concurrency, call)
+
+
+async def reports(client, args, users):
+    async def call(i):
+        headers = users["owners"][i % len(users["owners"])]
+        response = await client.post("/bookings/send-owner-report", headers=headers)
+        return response.status_code == 200
+
+    return await run("reports", args.report_requests, args.concurrency, call)
+
+
+SCENARIOS = {
+    "search": search,
+    "booking": booking,
+    "owner_listings": owner_listings,
+    "offers": offers,
+    "reports": reports,
+}
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.contenders))
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        # Logging in hashes passwords, so it happens before anything is timed.
+        owners = await asyncio.gather(
+            *(login(client, owner_email(n), args.password) for n in range(1, args.users + 1))
+        )
+        guests = await asyncio.gather(
+            *(login(client, guest_email(n), args.password) for n in range(1, args.users + 1))
+        )
+        users = {"owners": list(owners), "guests": list(guests)}
+
+        results = []
+        for name in args.scenarios:
+            results.append(await SCENARIOS[name](client, args, users))
+    print(f"{args.base_url}, {args.concurrency} concurrent clients")
+    print_results(results)
+    if args.output:
+        write_results(args.output, results, benchmark="loadtest", args=vars(args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument(
+        "--scenarios",
+        type=lambda value: value.split(","),
+        default=list(SCENARIOS),
+        help=f"Comma separated subset of: {', '.join(SCENARIOS)}",
+    )
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--report-requests", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--contenders", type=int, default=10, help="Guests per booking round")
+    parser.add_argument("--users", type=int, default=50, help="Owners and guests to log in as")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    asyncio.run(main(args))
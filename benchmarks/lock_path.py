@@ -0,0 +1,89 @@
+"""Load benchmark for the smart lock path using the simulated IoT hub.
+
+Drives open/close commands and temperature sweeps for N locks concurrently
+through ``SmartLock`` and reports p50/p99 latency and throughput::
+
+    python -m benchmarks.lock_path --locks 200 --rounds 5 --latency-ms 30
+"""
+import argparse
+import asyncio
+import time
+
+from cryptography.fernet import Fernet
+
+from app.iot import SimulatedLockTransport, SmartLock
+from benchmarks.stats import print_results, summarize, write_results
+
+
+async def _timed(smart_lock: SmartLock, command: str, latencies: list, errors: list):
+    start = time.perf_counter()
+    try:
+        return await smart_lock.asend_command(command)
+    except Exception:
+        errors.append(command)
+    finally:
+        latencies.append(time.perf_counter() - start)
+
+
+async def door_scenario(locks, rounds: int):
+    """Every lock opens and closes ``rounds`` times, all locks at once."""
+    latencies, errors = [], []
+
+    async def guest(smart_lock):
+        for _ in range(rounds):
+            await _timed(smart_lock, "open_lock", latencies, errors)
+            await _timed(smart_lock, "close_lock", latencies, errors)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(guest(lock) for lock in locks))
+    return summarize("open_close", latencies, time.perf_counter() - start, len(errors))
+
+
+async def sweep_scenario(locks, concurrency: int):
+    """Temperature sweep over the fleet like ``check_temperature_task``."""
+    latencies, errors = [], []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def check(smart_lock):
+        async with semaphore:
+            await _timed(smart_lock, "get_temperature", latencies, errors)
+            await _timed(smart_lock, "get_temperature_stats", latencies, errors)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(check(lock) for lock in locks))
+    name = "sweep_sequential" if concurrency == 1 else f"sweep_concurrency_{concurrency}"
+    return summarize(name, latencies, time.perf_counter() - start, len(errors))
+
+
+async def main(args):
+    transport = SimulatedLockTransport(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        failure_rate=args.failure_rate,
+        seed=args.seed,
+    )
+    locks = [
+        SmartLock(f"sim-{i:05d}", Fernet.generate_key(), transport)
+        for i in range(args.locks)
+    ]
+
+    results = [await door_scenario(locks, args.rounds)]
+    for concurrency in (1, args.concurrency):
+        results.append(await sweep_scenario(locks, concurrency))
+
+    print_results(results)
+    if args.output:
+        write_results(args.output, results, benchmark="lock_path", args=vars(args))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locks", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,330 @@
+"""Query plan regression check for the CRUD layer.
+
+Seeds a realistic volume of users, properties, bookings, payments, access
+codes and access logs, runs each CRUD function, and ``EXPLAIN (FORMAT JSON)``s
+every statement it issued. A hot path fails when its plan contains a
+sequential scan or its estimated cost exceeds the budget, and any scenario
+fails when it issues no statements or raises an HTTPException it does not
+expect. Everything runs in one transaction that is rolled back, so a
+migrated development database can be used as is. Exits with status 1 on
+any violation::
+
+    python -m benchmarks.query_plans --users 5000 --bookings 200000
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, List, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import engine
+from app.crud import access_code as access_code_crud
+from app.crud import access_logs as access_logs_crud
+from app.crud import booking as booking_crud
+from app.crud import payment as payment_crud
+from app.crud import pricing as pricing_crud
+from app.crud import property as property_crud
+from app.crud import user as user_crud
+from app.core.security import get_password_hash
+from app.models import AccessCode, Booking, User
+from app.schemas.booking import BookingCreate
+
+SEED_STATEMENTS = [
+    """
+    INSERT INTO users (first_name, last_name, email, password, role, created_at, is_blocked)
+    SELECT 'Plan', 'User ' || g, 'plan-' || g || '@example.com', :password_hash,
+           (CASE WHEN g % 10 = 0 THEN 'OWNER' ELSE 'USER' END)::role, now(), false
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO properties (owner_id, name, description, rooms, price, location, created_at)
+    SELECT o.ids[1 + g % array_length(o.ids, 1)], 'Plan property ' || g, 'Seeded',
+           1 + g % 5, 50 + g % 200, 'City ' || g % 50, now()
+    FROM generate_series(1, :properties) AS g,
+         (SELECT array_agg(id) AS ids FROM users
+          WHERE email LIKE 'plan-%' AND role = 'OWNER') AS o
+    """,
+    """
+    INSERT INTO bookings (user_id, property_id, start_date, end_date, status, created_at, booking_price)
+    SELECT u.ids[1 + g % array_length(u.ids, 1)],
+           p.ids[1 + (g * 7) % array_length(p.ids, 1)],
+           current_date - 365 + g % 730,
+           current_date - 365 + g % 730 + 1 + g % 7,
+           'CONFIRMED'::bookingstatus, now(), 100
+    FROM generate_series(1, :bookings) AS g,
+         (SELECT array_agg(id) AS ids FROM users WHERE email LIKE 'plan-%') AS u,
+         (SELECT array_agg(id) AS ids FROM properties WHERE name LIKE 'Plan property %') AS p
+    """,
+    """
+    INSERT INTO payments (booking_id, amount, status, created_at)
+    SELECT b.id, b.booking_price, 'SUCCESS'::paymentstatus, now()
+    FROM bookings AS b JOIN properties AS p ON p.id = b.property_id
+    WHERE p.name LIKE 'Plan property %' AND b.id % 2 = 0
+    """,
+    """
+    INSERT INTO access_codes (booking_id, code, valid_from, valid_until)
+    SELECT b.id, md5(b.id::text || random()::text), b.start_date, b.end_date
+    FROM bookings AS b JOIN properties AS p ON p.id = b.property_id
+    WHERE p.name LIKE 'Plan property %'
+    """,
+    """
+    INSERT INTO access_logs (access_code_id, command, response_status, accessed_at)
+    SELECT c.id, 'open_lock', '200', now() - (g * interval '1 hour')
+    FROM access_codes AS c, generate_series(1, :logs_per_code) AS g
+    """,
+]
+
+TABLES = ["users", "properties", "bookings", "payments", "access_codes", "access_logs"]
+
+
+@dataclass
+class Scenario:
+    name: str
+    run: Callable[[AsyncSession, "Fixtures"], Awaitable]
+    # Full listings scan by design; they are only held to the cost budget.
+    hot: bool = True
+    max_cost: float = 1000.0
+    # Whether the call ends in an HTTPException after its queries, e.g. a wrong password.
+    raises: bool = False
+
+
+@dataclass
+class Fixtures:
+    user: User
+    owner: User
+    property_id: int
+    booking_id: int
+    access_code_id: int
+
+
+SCENARIOS = [
+    Scenario("user.get_user", lambda db, f: user_crud.get_user(db, f.user.id), max_cost=50),
+    Scenario(
+        "user.authenticate_user (email lookup)",
+        lambda db, f: user_crud.authenticate_user(db, f.user.email, "wrong"),
+        max_cost=50,
+        raises=True,
+    ),
+    Scenario(
+        "property.get_property",
+        lambda db, f: property_crud.get_property(db, f.property_id),
+        max_cost=100,
+    ),
+    Scenario(
+        "property.get_properties_by_owner",
+        lambda db, f: property_crud.get_properties_by_owner(db, f.owner.id),
+        max_cost=2000,
+    ),
+    Scenario(
+        "property.get_property_list",
+        lambda db, f: property_crud.get_property_list(db),
+        hot=False,
+        max_cost=50000,
+    ),
+    Scenario(
+        "property.search_properties",
+        lambda db, f: property_crud.search_properties(db, "plan propety 42"),
+        max_cost=500,
+    ),
+    Scenario(
+        "booking.check_availability",
+        lambda db, f: booking_crud.check_availability(
+            db, f.property_id, date.today(), date.today() + timedelta(days=3)
+        ),
+        max_cost=100,
+    ),
+    Scenario(
+        "booking.get_booking",
+        lambda db, f: booking_crud.get_booking(db, f.booking_id, f.user),
+        max_cost=200,
+    ),
+    Scenario(
+        "booking.get_booking_list (user)",
+        lambda db, f: booking_crud.get_booking_list(db, user_id=f.user.id),
+        max_cost=2000,
+    ),
+    Scenario(
+        "booking.get_booking_list (owner)",
+        lambda db, f: booking_crud.get_booking_list(db, owner_id=f.owner.id),
+        max_cost=20000,
+    ),
+    Scenario(
+        "booking.create_booking",
+        lambda db, f: booking_crud.create_booking(
+            db,
+            BookingCreate(
+                property_id=f.property_id,
+                # After the seeded stays, which end within a year and a week,
+                # and inside BOOKING_PARTITIONS_AHEAD.
+                start_date=date.today() + timedelta(days=400),
+                end_date=date.today() + timedelta(days=402),
+            ),
+            f.user,
+        ),
+        max_cost=200,
+    ),
+    Scenario(
+        "pricing.get_quote",
+        lambda db, f: pricing_crud.get_quote(
+            db, f.property_id, date.today(), date.today() + timedelta(days=7)
+        ),
+        max_cost=100,
+    ),
+    Scenario(
+        "pricing.get_price_calendar",
+        lambda db, f: pricing_crud.get_price_calendar(db, f.property_id, date.today(), 90),
+        max_cost=500,
+    ),
+    Scenario(
+        "payment.get_user_payments",
+        lambda db, f: payment_crud.get_user_payments(db, f.user),
+        max_cost=2000,
+    ),
+    Scenario(
+        "access_code.get_access_code",
+        lambda db, f: access_code_crud.get_access_code(db, f.booking_id),
+        max_cost=50,
+    ),
+    Scenario(
+        "access_logs.get_access_logs",
+        lambda db, f: access_logs_crud.get_access_logs(
+            db, f.access_code_id, datetime.utcnow() - timedelta(days=30), datetime.utcnow()
+        ),
+        max_cost=500,
+    ),
+]
+
+
+async def seed(connection, args) -> None:
+    params = {
+        "users": args.users,
+        "properties": args.properties,
+        "bookings": args.bookings,
+        "logs_per_code": args.logs_per_code,
+        "password_hash": get_password_hash("password"),
+    }
+    for statement in SEED_STATEMENTS:
+        await connection.execute(text(statement), params)
+    for table in TABLES:
+        await connection.execute(text(f"ANALYZE {table}"))
+
+
+async def load_fixtures(db: AsyncSession) -> Fixtures:
+    user = (
+        await db.execute(select(User).where(User.email == "plan-1@example.com"))
+    ).scalar_one()
+    owner = (
+        await db.execute(select(User).where(User.email == "plan-10@example.com"))
+    ).scalar_one()
+    booking = (
+        await db.execute(select(Booking).where(Booking.user_id == user.id).limit(1))
+    ).scalar_one()
+    access_code_id = (
+        await db.execute(select(AccessCode.id).where(AccessCode.booking_id == booking.id))
+    ).scalar_one()
+    return Fixtures(user, owner, booking.property_id, booking.id, access_code_id)
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def check_plan(plan, hot: bool, max_cost: float) -> List[str]:
+    """Return the budget violations of one ``EXPLAIN (FORMAT JSON)`` plan."""
+    root = plan[0]["Plan"]
+    problems = []
+    if root["Total Cost"] > max_cost:
+        problems.append(f"cost {root['Total Cost']:.0f} > {max_cost:.0f}")
+    if hot:
+        for node in plan_nodes(root):
+            if node["Node Type"] == "Seq Scan":
+                problems.append(f"seq scan on {node.get('Relation Name')}")
+    return problems
+
+
+async def explain(connection, statement: str, parameters) -> list:
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {statement}", parameters
+    )
+    plan = result.scalar()
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+async def main(args):
+    captured: List[Tuple[str, tuple]] = []
+    capturing = False
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if capturing:
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", capture)
+    failures = 0
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            await seed(connection, args)
+            db = AsyncSession(bind=connection, join_transaction_mode="create_savepoint")
+            fixtures = await load_fixtures(db)
+
+            for scenario in SCENARIOS:
+                captured.clear()
+                capturing = True
+                error = None
+                try:
+                    await scenario.run(db, fixtures)
+                except HTTPException as e:
+                    if not scenario.raises:
+                        error = f"raised HTTP {e.status_code}: {e.detail}"
+                finally:
+                    capturing = False
+                if error is None and not captured:
+                    error = "issued no statements"
+                if error:
+                    failures += 1
+                    print(f"FAIL {scenario.name:<40} {error}")
+
+                max_cost = scenario.max_cost * args.cost_scale
+                for statement, parameters in captured:
+                    problems = check_plan(
+                        await explain(connection, statement, parameters),
+                        scenario.hot,
+                        max_cost,
+                    )
+                    failures += bool(problems)
+                    print(
+                        f"{'FAIL' if problems else 'ok  '} {scenario.name:<40} "
+                        f"{' '.join(statement.split())[:90]}"
+                    )
+                    for problem in problems:
+                        print(f"       {problem}")
+                # Drop identities loaded by this scenario so the next one hits the database.
+                db.expunge_all()
+                fixtures = await load_fixtures(db)
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--properties", type=int, default=2000)
+    parser.add_argument("--bookings", type=int, default=100000)
+    parser.add_argument("--logs-per-code", type=int, default=3)
+    parser.add_argument(
+        "--cost-scale",
+        type=float,
+        default=1.0,
+        help="Multiply every cost budget, e.g. when seeding a larger volume",
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,149 @@
+"""Check the database round trips made by each API request.
+
+Runs a set of requests in-process against the app and counts the queries and
+commits each one issues. Read requests must not commit, write requests must
+commit exactly once, and no request may exceed its query budget. Exits with
+status 1 on any violation, so it can gate CI.
+
+Runs against any migrated database without further setup: it creates its own
+owner, guest and property, and deletes them again when it is done::
+
+    python -m benchmarks.round_trips
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import delete
+
+from app.core.database import async_session, engine
+from app.core.query_stats import track_queries
+from app.core.security import get_password_hash
+from app.enums.user_role import Role
+from app.main import app
+from app.models import Booking, Property, User
+
+FIXTURE_PASSWORD = "round-trips"
+
+# (method, path, max queries, expected commits)
+READ_BUDGETS = [
+    ("GET", "/properties/", 4, 0),
+    ("GET", "/properties/available", 6, 0),
+    ("GET", "/bookings/", 6, 0),
+    ("GET", "/payments/", 3, 0),
+    ("GET", "/users/me", 1, 0),
+]
+
+
+async def create_fixtures() -> dict:
+    """Create the guest and the property the requests run against."""
+    tag = uuid.uuid4().hex[:12]
+    password = get_password_hash(FIXTURE_PASSWORD)
+    async with async_session() as db:
+        owner, guest = (
+            User(
+                first_name="Round",
+                last_name="Trips",
+                email=f"round-trips-{role.value.lower()}-{tag}@example.com",
+                password=password,
+                role=role,
+            )
+            for role in (Role.OWNER, Role.USER)
+        )
+        db.add_all([owner, guest])
+        await db.flush()
+        property = Property(
+            owner_id=owner.id, name=f"Round trips {tag}", rooms=1, price=100, location="Round trips"
+        )
+        db.add(property)
+        await db.commit()
+        return {
+            "user_ids": [owner.id, guest.id],
+            "email": guest.email,
+            "property_id": property.id,
+        }
+
+
+async def delete_fixtures(fixtures: dict):
+    async with async_session() as db:
+        await db.execute(delete(Booking).where(Booking.property_id == fixtures["property_id"]))
+        await db.execute(delete(Property).where(Property.id == fixtures["property_id"]))
+        await db.execute(delete(User).where(User.id.in_(fixtures["user_ids"])))
+        await db.commit()
+
+
+async def measure(client, method, path, **kwargs):
+    with track_queries() as stats:
+        response = await client.request(method, path, **kwargs)
+    return response, stats
+
+
+def check(results, label, response, stats, max_queries, commits):
+    ok = (
+        response.status_code < 400
+        and stats.queries <= max_queries
+        and stats.commits == commits
+    )
+    results.append(ok)
+    print(
+        f"{'ok ' if ok else 'FAIL'} {label:<32} status={response.status_code} "
+        f"queries={stats.queries}/{max_queries} commits={stats.commits}/{commits}"
+    )
+    if not ok:
+        for statement in stats.statements:
+            print(f"       {' '.join(statement.split())[:160]}")
+
+
+async def run_checks(client, fixtures: dict, args) -> list:
+    results = []
+    token = (
+        await client.post(
+            "/token", data={"username": fixtures["email"], "password": FIXTURE_PASSWORD}
+        )
+    ).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+
+    for method, path, max_queries, commits in READ_BUDGETS:
+        response, stats = await measure(client, method, path)
+        check(results, f"{method} {path}", response, stats, max_queries, commits)
+
+    # The property is new, so any stay within the booking partitions is free.
+    start = date.today() + timedelta(days=30)
+    response, stats = await measure(
+        client,
+        "POST",
+        "/bookings/",
+        json={
+            "property_id": fixtures["property_id"],
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=2)).isoformat(),
+        },
+    )
+    check(results, "POST /bookings/", response, stats, args.max_write_queries, 1)
+
+    if response.status_code < 400:
+        booking_id = response.json()["id"]
+        response, stats = await measure(client, "DELETE", f"/bookings/{booking_id}")
+        check(results, "DELETE /bookings/{id}", response, stats, args.max_write_queries, 1)
+    return results
+
+
+async def main(args):
+    fixtures = await create_fixtures()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            results = await run_checks(client, fixtures, args)
+    finally:
+        await delete_fixtures(fixtures)
+        await engine.dispose()
+    sys.exit(0 if all(results) else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-write-queries", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,144 @@
+"""Microbenchmark of the booking list response encoding.
+
+Encodes the same bookings the way list routes used to (ORM objects
+validated through the nested ``Booking`` schema, then the stdlib JSON
+encoder) and the way they do now (SQL rows projected to dicts by
+``app.crud.booking``, then orjson), and reports the time per batch::
+
+    python -m benchmarks.serialization --bookings 10000 --repeat 20
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+
+import app.models  # noqa: F401  (configures the ORM mappers)
+from app.crud.booking import (
+    BOOKING_LIST_FIELDS,
+    PAYMENT_SUMMARY_FIELDS,
+    PROPERTY_SUMMARY_FIELDS,
+    _booking_list_item,
+    _booking_list_select,
+)
+from app.enums.booking_status import BookingStatus
+from app.enums.payment import PaymentStatus
+from app.models import Booking, Payment, Property
+from app.schemas.booking import Booking as BookingSchema
+from benchmarks.stats import print_results, summarize, write_results
+
+BOOKING_LIST = TypeAdapter(List[BookingSchema])
+
+
+def orm_bookings(count: int) -> List[Booking]:
+    properties = [
+        Property(
+            id=i,
+            owner_id=1,
+            name=f"Property {i}",
+            description="A quiet flat with a view of the river.",
+            rooms=2,
+            price=80.0,
+            location="Kyiv",
+        )
+        for i in range(100)
+    ]
+    now = datetime.utcnow()
+    bookings = []
+    for i in range(count):
+        start = date.today() + timedelta(days=i % 365)
+        booking = Booking(
+            id=i,
+            user_id=1,
+            property_id=i % 100,
+            start_date=start,
+            end_date=start + timedelta(days=3),
+            status=BookingStatus.CONFIRMED,
+            created_at=now,
+            booking_price=240.0,
+        )
+        booking.property = properties[i % 100]
+        if i % 2:
+            booking.payment = Payment(
+                id=i, booking_id=i, amount=240.0, status=PaymentStatus.SUCCESS, created_at=now
+            )
+        bookings.append(booking)
+    return bookings
+
+
+class Row:
+    """Stands in for a SQLAlchemy result row."""
+
+    def __init__(self, mapping: dict):
+        self._mapping = mapping
+
+
+def projected_rows(bookings: List[Booking]) -> list:
+    """The rows ``get_booking_list`` receives from the database for ``bookings``."""
+    keys = _booking_list_select(Booking, Payment).selected_columns.keys()
+    rows = []
+    for b in bookings:
+        values = {field: getattr(b, field) for field in BOOKING_LIST_FIELDS}
+        values.update(
+            {f"property__{f}": getattr(b.property, f) for f in PROPERTY_SUMMARY_FIELDS}
+        )
+        values.update(
+            {f"payment__{f}": getattr(b.payment, f, None) for f in PAYMENT_SUMMARY_FIELDS}
+        )
+        rows.append(Row({key: values[key] for key in keys}))
+    return rows
+
+
+def encode_validated(bookings, dumps):
+    # What FastAPI does for a response_model: validate, dump to JSON types, encode.
+    validated = BOOKING_LIST.validate_python(bookings, from_attributes=True)
+    return dumps(BOOKING_LIST.dump_python(validated, mode="json"))
+
+
+def encode_projected(rows, fields=BOOKING_LIST_FIELDS, expand=("property", "payment")):
+    return orjson.dumps([_booking_list_item(row, fields, expand) for row in rows])
+
+
+def run(name, func, repeat: int):
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        call = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - call)
+    return summarize(name, latencies, time.perf_counter() - start)
+
+
+def main(args):
+    bookings = orm_bookings(args.bookings)
+    rows = projected_rows(bookings)
+    results = [
+        run(
+            "validated+json",
+            lambda: encode_validated(bookings, lambda data: json.dumps(data).encode()),
+            args.repeat,
+        ),
+        run("validated+orjson", lambda: encode_validated(bookings, orjson.dumps), args.repeat),
+        run("projected+orjson", lambda: encode_projected(rows), args.repeat),
+        # ?fields=id,start_date,end_date&expand=
+        run(
+            "projected+orjson, sparse",
+            lambda: encode_projected(rows, ("id", "start_date", "end_date"), ()),
+            args.repeat,
+        ),
+    ]
+    print(f"Encoding {args.bookings} bookings, {args.repeat} runs each")
+    print_results(results)
+    if args.output:
+        write_results(args.output, results, bookings=args.bookings, repeat=args.repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bookings", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    main(parser.parse_args())
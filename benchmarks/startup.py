@@ -0,0 +1,103 @@
+"""Check the cold start cost of the API and Celery worker processes.
+
+Imports each entry point in a fresh interpreter and reports the import time
+and peak RSS, and which heavy libraries got loaded along the way. scikit-learn,
+pandas, WeasyPrint and the Azure IoT SDKs are only needed by a few endpoints
+and tasks, and must be imported where they are used rather than at startup.
+Exits with status 1 when a heavy library is imported eagerly or a budget is
+exceeded, so it can gate CI::
+
+    python -m benchmarks.startup --runs 5 --max-seconds 3 --max-rss-mb 150
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = ["app.main", "app.celery_app"]
+
+HEAVY_MODULES = ["sklearn", "scipy", "numpy", "pandas", "xlsxwriter", "weasyprint", "azure"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps({{
+    "seconds": seconds,
+    "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy": heavy,
+}}))
+"""
+
+
+def probe(module: str) -> dict:
+    """Import ``module`` in a new interpreter and return its measurements."""
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY_MODULES)],
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def slowest_imports(module: str, top: int) -> list:
+    """Return the ``top`` packages by cumulative import time, from ``-X importtime``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    totals = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        # Top level packages only: their cumulative time includes submodules.
+        if cumulative.strip().isdigit() and "." not in name:
+            totals[name] = max(totals.get(name, 0), int(cumulative))
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:top]
+
+
+def main(args):
+    ok = True
+    for module in args.modules:
+        runs = [probe(module) for _ in range(args.runs)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        rss_mb = max(run["rss_mb"] for run in runs)
+        heavy = runs[0]["heavy"]
+        failures = []
+        if heavy:
+            failures.append(f"imports {', '.join(heavy)} at startup")
+        if seconds > args.max_seconds:
+            failures.append(f"import takes {seconds:.2f}s > {args.max_seconds}s")
+        if rss_mb > args.max_rss_mb:
+            failures.append(f"RSS {rss_mb:.0f} MB > {args.max_rss_mb} MB")
+        ok = ok and not failures
+        print(
+            f"{'ok ' if not failures else 'FAIL'} {module:<20} "
+            f"import={seconds * 1000:.0f}ms rss={rss_mb:.0f}MB"
+        )
+        for failure in failures:
+            print(f"       {failure}")
+        if args.top:
+            for name, microseconds in slowest_imports(module, args.top):
+                print(f"       {microseconds / 1000:>8.1f}ms  {name}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--runs", type=int, default=3, help="Median import time of this many runs")
+    parser.add_argument("--max-seconds", type=float, default=3.0)
+    parser.add_argument("--max-rss-mb", type=float, default=150.0)
+    parser.add_argument(
+        "--top", type=int, default=0, help="Also list the N slowest top level imports"
+    )
+    main(parser.parse_args())
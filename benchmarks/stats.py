@@ -0,0 +1,71 @@
+import json
+import math
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile of ``values`` using nearest-rank."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(name: str, latencies: List[float], wall_time: float, errors: int = 0) -> Dict:
+    """Summarize per-call latencies (seconds) of one benchmark scenario."""
+    return {
+        "scenario": name,
+        "calls": len(latencies),
+        "errors": errors,
+        "wall_time_s": round(wall_time, 4),
+        "throughput_per_s": round(len(latencies) / wall_time, 2) if wall_time else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(max(latencies) * 1000, 3) if latencies else 0.0,
+    }
+
+
+def print_results(results: List[Dict]):
+    """Print scenario summaries as an aligned table."""
+    header = f"{'scenario':<28}{'calls':>8}{'errors':>8}{'p50 ms':>10}{'p99 ms':>10}{'ops/s':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<28}{r['calls']:>8}{r['errors']:>8}"
+            f"{r['p50_ms']:>10}{r['p99_ms']:>10}{r['throughput_per_s']:>10}"
+        )
+
+
+def current_commit() -> str:
+    """The checked out git commit, marked ``-dirty`` with uncommitted changes."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def write_results(path: str, results: List[Dict], **meta):
+    """Write scenario summaries and run metadata to a JSON file.
+
+    The commit and time of the run are recorded, so ``benchmarks.compare``
+    can tell runs apart.
+    """
+    meta = {
+        "commit": current_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        **meta,
+    }
+    with open(path, "w") as f:
+        json.dump({**meta, "results": results}, f, indent=2, default=str)
+
+
+def read_results(path: str) -> Dict:
+    """Read a file written by ``write_results``."""
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,50 @@
+"""Gunicorn settings for serving the API in production.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Every value can be overridden with the environment variables below.
+"""
+import os
+import shutil
+
+# Metrics of all workers are aggregated from files in this directory (see
+# app.core.metrics). It must be set, and emptied of a previous run's files,
+# before the app and prometheus_client are imported.
+os.environ.setdefault("PROMETHEUS_MULTIPROCESS_DIR", "/tmp/prometheus_multiproc")
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROCESS_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROCESS_DIR"], exist_ok=True)
+
+from app.core.config import settings  # noqa: E402
+
+# Each worker process runs its own event loop, database pools and Redis
+# connections, opened and warmed up by the app's lifespan. Containers get
+# one core, so two workers keep the core busy while one is in a blocking
+# call (PDF reports, clustering) without oversubscribing it.
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "app.worker.DrainingUvicornWorker"
+bind = os.environ.get("BIND", "0.0.0.0:8000")
+
+# Import the app once in the master so workers fork with the code already
+# loaded. Nothing opens connections at import time; pools fill in each
+# worker's lifespan.
+preload_app = True
+
+keepalive = int(os.environ.get("KEEPALIVE", 5))
+timeout = int(os.environ.get("TIMEOUT", 60))
+# SIGTERM gives a worker this long to drain, finish its requests and shut
+# down before it is killed.
+graceful_timeout = int(settings.DRAIN_SECONDS) + int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+
+# Recycle workers now and then to bound memory growth; jitter avoids
+# restarting them all at once.
+max_requests = int(os.environ.get("MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.environ.get("MAX_REQUESTS_JITTER", 1000))
+
+accesslog = "-"
+errorlog = "-"
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)